@@ -17,10 +17,23 @@ class AuditLogMiddleware:
         response = self.get_response(request)
 
         if self._should_commit_to_audit_log(request, response):
-            commit_to_audit_log(request, response)
+            if getattr(request, "_audit_log_after_streaming", False):
+                response.streaming_content = self._commit_after_streaming(
+                    request, response, response.streaming_content
+                )
+            else:
+                commit_to_audit_log(request, response)
 
         return response
 
+    @staticmethod
+    def _commit_after_streaming(request, response, streaming_content):
+        # Also the objects streamed before the client disconnected are logged
+        try:
+            yield from streaming_content
+        finally:
+            commit_to_audit_log(request, response)
+
     @staticmethod
     def _should_commit_to_audit_log(request, response):
         return (
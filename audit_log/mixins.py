@@ -1,9 +1,28 @@
+from django.conf import settings
 from django.db.models import QuerySet
 
 
 class AuditLogApiViewMixin:
+    # The personal data models whose ids are always logged
+    audit_log_all_object_ids_models = frozenset(
+        {
+            "registrations.SignUp",
+            "registrations.SignUpContactPerson",
+            "registrations.SignUpGroup",
+        }
+    )
+
+    def _get_audit_log_request(self):
+        return getattr(self.request, "_request", self.request)
+
+    def _should_audit_log_all_object_ids(self, model):
+        return (
+            model is not None
+            and model._meta.label in self.audit_log_all_object_ids_models
+        )
+
     def _add_audit_logged_object_ids(self, instances):
-        request = getattr(self.request, "_request", self.request)
+        request = self._get_audit_log_request()
         audit_logged_object_ids = set()
 
         def add_instance(instance):
@@ -12,7 +31,18 @@ class AuditLogApiViewMixin:
 
             audit_logged_object_ids.add(instance.pk)
 
-        if isinstance(instances, QuerySet) or isinstance(instances, list):
+        if isinstance(instances, QuerySet) and instances._result_cache is None:
+            # Fetch only the ids, and not even them for large querysets
+            object_ids = instances.values_list("pk", flat=True)
+            if not self._should_audit_log_all_object_ids(instances.model):
+                max_object_ids = settings.AUDIT_LOG_MAX_OBJECT_IDS
+                object_ids = list(object_ids[: max_object_ids + 1])
+                if len(object_ids) > max_object_ids:
+                    self._add_audit_logged_list(instances.model, instances.count())
+                    return
+
+            audit_logged_object_ids.update(object_ids)
+        elif isinstance(instances, QuerySet) or isinstance(instances, list):
             for instance in instances:
                 add_instance(instance)
         else:
@@ -23,6 +53,32 @@ class AuditLogApiViewMixin:
         else:
             request._audit_logged_object_ids = audit_logged_object_ids
 
+    def _add_audit_logged_list(self, model, count, **extra):
+        """
+        Log a list read as the model, the request's query string (i.e. the
+        filters and the page) and the number of objects instead of the ids.
+        """
+        request = self._get_audit_log_request()
+        audit_logged_list = {
+            "model": model._meta.label if model else None,
+            "query": request.GET.urlencode(),
+            "count": count,
+            **extra,
+        }
+
+        if hasattr(request, "_audit_logged_lists"):
+            request._audit_logged_lists.append(audit_logged_list)
+        else:
+            request._audit_logged_lists = [audit_logged_list]
+
+    def _commit_audit_log_after_streaming(self):
+        """
+        Write the audit log entry of a streaming response only after the
+        content has been streamed, so that the ids added while streaming are
+        logged, too.
+        """
+        self._get_audit_log_request()._audit_log_after_streaming = True
+
     def get_object(self, skip_log_ids=False):
         instance = super().get_object()
 
@@ -33,9 +89,23 @@ class AuditLogApiViewMixin:
 
     def paginate_queryset(self, queryset):
         page = super().paginate_queryset(queryset)
-
-        logged_objects = page if page is not None else queryset
-        self._add_audit_logged_object_ids(logged_objects)
+        # Search querysets don't have a single model
+        model = getattr(queryset, "model", None)
+
+        if page is None:
+            self._add_audit_logged_object_ids(queryset)
+        elif (
+            len(page) > settings.AUDIT_LOG_MAX_OBJECT_IDS
+            and not self._should_audit_log_all_object_ids(model)
+        ):
+            self._add_audit_logged_list(
+                model,
+                len(page),
+                first_id=page[0].pk,
+                last_id=page[-1].pk,
+            )
+        else:
+            self._add_audit_logged_object_ids(page)
 
         return page
 
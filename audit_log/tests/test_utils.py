@@ -1,20 +1,29 @@
 import logging
 from collections import Counter
 from datetime import UTC, datetime
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 from django.contrib.auth.models import AnonymousUser
+from django.core.signals import request_finished
+from django.http import QueryDict
 from freezegun import freeze_time
 from resilient_logger.models import ResilientLogEntry
 from resilient_logger.sources.resilient_log_source_entry import ResilientLogSourceEntry
 
 from audit_log.enums import Operation, Role, Status
 from audit_log.mixins import AuditLogApiViewMixin
-from audit_log.utils import _get_remote_address, _get_target, commit_to_audit_log
+from audit_log.utils import (
+    _get_remote_address,
+    _get_target,
+    audit_log_buffer,
+    commit_to_audit_log,
+)
 from events.tests.factories import ApiKeyUserFactory, OrganizationFactory
 from helevents.models import User
 from helevents.tests.factories import UserFactory
+from registrations.models import SignUp
+from registrations.tests.factories import SignUpFactory
 
 # === util methods ===
 
@@ -35,6 +44,7 @@ def _create_default_request_mock(user):
         user=user,
         path="/v1/endpoint",
         headers={"x-forwarded-for": "1.2.3.4:80"},
+        _audit_logged_lists=[],
     )
 
 
@@ -103,6 +113,7 @@ def test_commit_to_audit_log_crud_operations(http_method, audit_operation):
         path="/v1/endpoint",
         headers={"x-forwarded-for": "1.2.3.4:80"},
         _audit_logged_object_ids=set(),
+        _audit_logged_lists=[],
     )
 
     res_mock = Mock(status_code=200)
@@ -173,6 +184,98 @@ def test_commit_to_audit_log_actor_data(user_role, audit_role):
     _assert_basic_log_entry_data(log_entry)
 
 
+@pytest.mark.django_db
+def test_commit_to_audit_log_writes_entries_in_batches(settings):
+    settings.AUDIT_LOG_BATCH_SIZE = 3
+    settings.AUDIT_LOG_FLUSH_INTERVAL = 3600
+    user = UserFactory()
+
+    req_mock = _create_default_request_mock(user)
+    req_mock._audit_logged_object_ids = set()
+    res_mock = Mock(status_code=200)
+
+    try:
+        commit_to_audit_log(req_mock, res_mock)
+        commit_to_audit_log(req_mock, res_mock)
+
+        assert ResilientLogEntry.objects.count() == 0
+
+        commit_to_audit_log(req_mock, res_mock)
+
+        assert ResilientLogEntry.objects.count() == 3
+
+        commit_to_audit_log(req_mock, res_mock)
+        audit_log_buffer.flush()
+
+        assert ResilientLogEntry.objects.count() == 4
+    finally:
+        audit_log_buffer.flush()
+
+
+@pytest.mark.django_db
+def test_commit_to_audit_log_flushes_due_entries_when_request_finishes(settings):
+    settings.AUDIT_LOG_BATCH_SIZE = 10
+    settings.AUDIT_LOG_FLUSH_INTERVAL = 3600
+    req_mock = _create_default_request_mock(UserFactory())
+    req_mock._audit_logged_object_ids = set()
+
+    try:
+        with freeze_time("2023-10-17 13:30:00+02:00") as frozen_time:
+            commit_to_audit_log(req_mock, Mock(status_code=200))
+            request_finished.send(sender=None)
+
+            assert ResilientLogEntry.objects.count() == 0
+
+            frozen_time.tick(3600)
+            request_finished.send(sender=None)
+
+            assert ResilientLogEntry.objects.count() == 1
+    finally:
+        audit_log_buffer.flush()
+
+
+@pytest.mark.django_db
+def test_commit_to_audit_log_keeps_request_time(settings):
+    settings.AUDIT_LOG_BATCH_SIZE = 2
+    settings.AUDIT_LOG_FLUSH_INTERVAL = 3600
+    req_mock = _create_default_request_mock(UserFactory())
+    req_mock._audit_logged_object_ids = set()
+
+    try:
+        with freeze_time("2023-10-17 13:30:00+02:00"):
+            commit_to_audit_log(req_mock, Mock(status_code=200))
+        with freeze_time("2023-10-17 13:30:05+02:00"):
+            audit_log_buffer.flush()
+    finally:
+        audit_log_buffer.flush()
+
+    log_entry = ResilientLogEntry.objects.get()
+    assert log_entry.context["timestamp"] == "2023-10-17T11:30:00+00:00"
+
+
+@pytest.mark.django_db
+def test_commit_to_audit_log_failed_flush_doesnt_fail_request(settings):
+    settings.AUDIT_LOG_BATCH_SIZE = 1
+    settings.AUDIT_LOG_MAX_BUFFER_SIZE = 2
+    req_mock = _create_default_request_mock(UserFactory())
+    req_mock._audit_logged_object_ids = set()
+
+    try:
+        with patch(
+            "audit_log.utils.ResilientLogSource.bulk_create_structured",
+            side_effect=Exception("Database unavailable"),
+        ):
+            for _ in range(3):
+                commit_to_audit_log(req_mock, Mock(status_code=200))
+
+        assert ResilientLogEntry.objects.count() == 0
+    finally:
+        audit_log_buffer.flush()
+
+    # The oldest entry was dropped
+    assert ResilientLogEntry.objects.count() == 2
+
+
 @pytest.mark.parametrize(
     "remote_address,expected,x_forwarded_for",
     [
@@ -216,7 +319,9 @@ def test_get_target_queryset(queryset_type):
     user = UserFactory()
 
     req_mock = _create_default_request_mock(user)
-    req_mock._request = Mock(path="/v1/endpoint", _audit_logged_object_ids=set())
+    req_mock._request = Mock(
+        path="/v1/endpoint", _audit_logged_object_ids=set(), _audit_logged_lists=[]
+    )
 
     if queryset_type == "queryset":
         UserFactory()
@@ -250,7 +355,9 @@ def test_get_target_list(list_type):
     user = UserFactory()
 
     req_mock = _create_default_request_mock(user)
-    req_mock._request = Mock(path="/v1/endpoint", _audit_logged_object_ids=set())
+    req_mock._request = Mock(
+        path="/v1/endpoint", _audit_logged_object_ids=set(), _audit_logged_lists=[]
+    )
 
     list_type_mapping = {
         "list": [user, UserFactory()],
@@ -285,7 +392,9 @@ def test_get_target_object(object_type):
     user = UserFactory()
 
     req_mock = _create_default_request_mock(user)
-    req_mock._request = Mock(path="/v1/endpoint", _audit_logged_object_ids=set())
+    req_mock._request = Mock(
+        path="/v1/endpoint", _audit_logged_object_ids=set(), _audit_logged_lists=[]
+    )
 
     object_type_mapping = {
         "object": user,
@@ -303,3 +412,51 @@ def test_get_target_object(object_type):
     target_data = _get_target(req_mock._request)
 
     _assert_target_data(target_data, req_mock.path, object_ids)
+
+
+@pytest.mark.django_db
+def test_get_target_large_queryset(settings):
+    settings.AUDIT_LOG_MAX_OBJECT_IDS = 2
+    user = UserFactory()
+    UserFactory.create_batch(2)
+
+    req_mock = _create_default_request_mock(user)
+    req_mock._request = Mock(
+        path="/v1/endpoint",
+        GET=QueryDict("text=foo"),
+        _audit_logged_object_ids=set(),
+        _audit_logged_lists=[],
+    )
+
+    view = AuditLogApiViewMixin()
+    view.request = req_mock
+    view._add_audit_logged_object_ids(User.objects.all())
+
+    target_data = _get_target(req_mock._request)
+
+    assert target_data["object_ids"] == []
+    assert target_data["lists"] == [
+        {"model": "helevents.User", "query": "text=foo", "count": 3}
+    ]
+
+
+@pytest.mark.django_db
+def test_get_target_large_personal_data_queryset(settings):
+    settings.AUDIT_LOG_MAX_OBJECT_IDS = 2
+    signups = SignUpFactory.create_batch(3)
+
+    req_mock = _create_default_request_mock(UserFactory())
+    req_mock._request = Mock(
+        path="/v1/endpoint",
+        GET=QueryDict(""),
+        _audit_logged_object_ids=set(),
+        _audit_logged_lists=[],
+    )
+
+    view = AuditLogApiViewMixin()
+    view.request = req_mock
+    view._add_audit_logged_object_ids(SignUp.objects.all())
+
+    target_data = _get_target(req_mock._request)
+
+    _assert_target_data(target_data, "/v1/endpoint", [signup.pk for signup in signups])
@@ -1,11 +1,23 @@
+import atexit
 import logging
+import threading
+import time
 
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import connection
+from django.utils import timezone
 from resilient_logger.sources import ResilientLogSource
+from resilient_logger.sources.resilient_log_source import (
+    StructuredResilientLogEntryData,
+)
 
 from audit_log.enums import Operation, Role, Status
 from events.auth import ApiKeyUser
 from registrations.auth import WebStoreWebhookUser
 
+logger = logging.getLogger(__name__)
+
 _OPERATION_MAPPING = {
     "GET": Operation.READ.value,
     "HEAD": Operation.READ.value,
@@ -46,6 +58,22 @@ def _get_remote_address(request):
     return client_ip
 
 
+def _is_admin(user):
+    if user.is_superuser:
+        return True
+
+    if isinstance(user, ApiKeyUser) and user.data_source.owner_id:
+        # The API key's data source has been loaded by the authentication
+        return True
+
+    # Use the organizations already loaded for the request's permission checks
+    permission_resolver = user.permission_resolver
+    return bool(
+        permission_resolver.admin_intervals
+        or permission_resolver.registration_admin_intervals
+    )
+
+
 def _get_user_role(user):
     if user is None:
         return Role.SYSTEM.value
@@ -56,13 +84,7 @@ def _get_user_role(user):
     if isinstance(user, WebStoreWebhookUser):
         return Role.EXTERNAL.value
 
-    if (
-        user.is_superuser
-        or user.admin_organizations.exists()
-        or user.registration_admin_organizations.exists()
-        or isinstance(user, ApiKeyUser)
-        and user.apikey_registration_admin_organizations.exists()
-    ):
+    if _is_admin(user):
         return Role.ADMIN.value
 
     if user.is_external:
@@ -90,17 +112,126 @@ def _get_target(request):
     if hasattr(request, "_audit_logged_object_ids"):
         delattr(request, "_audit_logged_object_ids")
 
+    # The list reads that were too large for logging the ids
+    audit_logged_lists = getattr(request, "_audit_logged_lists", [])
+    if audit_logged_lists:
+        target["lists"] = list(audit_logged_lists)
+
+    if hasattr(request, "_audit_logged_lists"):
+        delattr(request, "_audit_logged_lists")
+
     return target
 
 
+class AuditLogBuffer:
+    """
+    Buffers the audit log entries of the process and writes them with one
+    query when AUDIT_LOG_BATCH_SIZE entries have been buffered or
+    AUDIT_LOG_FLUSH_INTERVAL seconds have passed since the first buffered
+    entry, and at exit. The interval is checked both by a timer and at the end
+    of each request, since the timer and the exit handler don't run when the
+    worker is killed. Entries that couldn't be written are kept for the next
+    flush, up to AUDIT_LOG_MAX_BUFFER_SIZE entries.
+    """
+
+    def __init__(self):
+        self._entries = []
+        self._lock = threading.Lock()
+        self._timer = None
+        self._first_added_time = None
+
+    def add(self, entry):
+        with self._lock:
+            if not self._entries:
+                self._first_added_time = time.monotonic()
+            self._entries.append(entry)
+            self._drop_overflow()
+            should_flush = len(self._entries) >= settings.AUDIT_LOG_BATCH_SIZE
+            if not should_flush and self._timer is None:
+                self._timer = threading.Timer(
+                    settings.AUDIT_LOG_FLUSH_INTERVAL, self._flush_in_background
+                )
+                self._timer.daemon = True
+                self._timer.start()
+
+        if should_flush:
+            # The flush happens in the request that filled the batch, which
+            # mustn't fail because of the earlier requests' entries
+            self._flush_and_log_errors()
+
+    def flush(self):
+        with self._lock:
+            entries, self._entries = self._entries, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not entries:
+            return
+
+        try:
+            ResilientLogSource.bulk_create_structured(entries)
+        except Exception:
+            # Keep the entries for the next flush
+            with self._lock:
+                self._entries[:0] = entries
+                self._first_added_time = time.monotonic()
+                self._drop_overflow()
+            raise
+
+    def flush_if_due(self, **kwargs):
+        """Flush if the oldest entry has been buffered for the flush interval."""
+        with self._lock:
+            is_due = (
+                self._entries
+                and time.monotonic() - self._first_added_time
+                >= settings.AUDIT_LOG_FLUSH_INTERVAL
+            )
+
+        if is_due:
+            self._flush_and_log_errors()
+
+    def _drop_overflow(self):
+        overflow = len(self._entries) - settings.AUDIT_LOG_MAX_BUFFER_SIZE
+        if overflow > 0:
+            del self._entries[:overflow]
+            logger.error(
+                "Dropped %s audit log entries that couldn't be written", overflow
+            )
+
+    def _flush_and_log_errors(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Failed to write the buffered audit log entries")
+
+    def _flush_in_background(self):
+        try:
+            self._flush_and_log_errors()
+        finally:
+            # The connection belongs to the timer's thread
+            connection.close()
+
+
+audit_log_buffer = AuditLogBuffer()
+atexit.register(audit_log_buffer._flush_in_background)
+request_finished.connect(
+    audit_log_buffer.flush_if_due, dispatch_uid="audit_log_buffer_flush_if_due"
+)
+
+
 def commit_to_audit_log(request, response):
     status = _get_response_status(response)
 
-    ResilientLogSource.create_structured(
-        level=logging.NOTSET,
-        message=status,
-        actor=_get_actor_data(request),
-        operation=_get_operation_name(request),
-        target=_get_target(request),
-        extra={"status": status},
+    audit_log_buffer.add(
+        StructuredResilientLogEntryData(
+            level=logging.NOTSET,
+            message=status,
+            actor=_get_actor_data(request),
+            operation=_get_operation_name(request),
+            target=_get_target(request),
+            # The entries are written later, so their creation time isn't the
+            # time of the request
+            extra={"status": status, "timestamp": timezone.now().isoformat()},
+        )
     )
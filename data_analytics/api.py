@@ -1,9 +1,19 @@
+import csv
+import io
+import json
+from itertools import batched
+
 import django_filters
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from django_orghierarchy.models import Organization
 from knox.auth import TokenAuthentication as KnoxTokenAuthentication
 from munigeo.models import AdministrativeDivision
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.utils.encoders import JSONEncoder
 
 from audit_log.mixins import AuditLogApiViewMixin
 from data_analytics.filters import (
@@ -28,20 +38,101 @@ from data_analytics.serializers import (
     DataAnalyticsSignUpSerializer,
 )
 from events.models import DataSource, Event, Keyword, Language, Offer, Place
-from registrations.models import Registration, SignUp
+from registrations.models import Registration, SignUp, SignUpGroup
 
 _ORDER_BY_ID = "-id"
 _ORDER_BY_CREATED_TIME = "-created_time"
 
+# Number of rows fetched from the server-side cursor and prefetched at a time
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _only_pk(model):
+    return model.objects.only("pk")
+
+
+def _iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=JSONEncoder) + "\n"
+
+
+def _iter_csv(rows):
+    buffer = io.StringIO()
+    writer = None
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(row))
+            writer.writeheader()
+        # Nested values, e.g. translations and relation id lists, are written
+        # as JSON
+        writer.writerow(
+            {
+                key: json.dumps(value, cls=JSONEncoder)
+                if isinstance(value, dict | list)
+                else value
+                for key, value in row.items()
+            }
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
 
 class DataAnalyticsBaseViewSet(AuditLogApiViewMixin, viewsets.ReadOnlyModelViewSet):
     authentication_classes = [KnoxTokenAuthentication]
     http_method_names = ["get", "options"]
     permission_classes = [IsAuthenticated]
 
+    @action(detail=False, url_path="export")
+    def export(self, request, *args, **kwargs):
+        """
+        Stream all the objects matching the filters as NDJSON or CSV, selected
+        with the export_format query param. The objects are read in primary
+        key order from a server-side cursor and their relations are prefetched
+        per chunk. The ids of exported personal data are audit logged, and of
+        other objects the filters and the number of objects.
+        """
+        export_format = request.query_params.get("export_format", "ndjson")
+        if export_format not in EXPORT_CONTENT_TYPES:
+            raise ParseError(
+                f"export_format must be one of: {', '.join(EXPORT_CONTENT_TYPES)}"
+            )
+
+        queryset = self.filter_queryset(self.get_queryset()).order_by("pk")
+        if self._should_audit_log_all_object_ids(queryset.model):
+            # The ids are logged per chunk while streaming
+            self._commit_audit_log_after_streaming()
+        else:
+            self._add_audit_logged_list(queryset.model, queryset.count())
+        iter_content = _iter_csv if export_format == "csv" else _iter_ndjson
+        response = StreamingHttpResponse(
+            iter_content(self._iter_export_rows(queryset)),
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+        )
+        filename = f"{self.basename}.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def _iter_export_rows(self, queryset):
+        log_object_ids = self._should_audit_log_all_object_ids(queryset.model)
+        objects = queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        for chunk in batched(objects, EXPORT_CHUNK_SIZE):
+            if log_object_ids:
+                self._add_audit_logged_object_ids(list(chunk))
+            yield from self.get_serializer(chunk, many=True).data
+
 
 class AdministrativeDivisionViewSet(DataAnalyticsBaseViewSet):
-    queryset = AdministrativeDivision.objects.order_by(_ORDER_BY_ID)
+    queryset = (
+        AdministrativeDivision.objects.select_related("type", "municipality")
+        .prefetch_related("translations", "municipality__translations")
+        .order_by(_ORDER_BY_ID)
+    )
     serializer_class = DataAnalyticsAdministrativeDivisionSerializer
     filter_backends = (django_filters.rest_framework.DjangoFilterBackend,)
     filterset_class = DataAnalyticsAdministrativeDivisionFilter
@@ -53,14 +144,21 @@ class DataSourceViewSet(DataAnalyticsBaseViewSet):
 
 
 class EventViewSet(DataAnalyticsBaseViewSet):
-    queryset = Event.objects.order_by(_ORDER_BY_CREATED_TIME)
+    queryset = Event.objects.prefetch_related(
+        Prefetch("in_language", _only_pk(Language)),
+        Prefetch("keywords", _only_pk(Keyword)),
+        Prefetch("audience", _only_pk(Keyword)),
+        Prefetch("offers", _only_pk(Offer)),
+    ).order_by(_ORDER_BY_CREATED_TIME)
     serializer_class = DataAnalyticsEventSerializer
     filter_backends = (django_filters.rest_framework.DjangoFilterBackend,)
     filterset_class = DataAnalyticsEventFilter
 
 
 class KeywordViewSet(DataAnalyticsBaseViewSet):
-    queryset = Keyword.objects.order_by(_ORDER_BY_CREATED_TIME)
+    queryset = Keyword.objects.prefetch_related("alt_labels").order_by(
+        _ORDER_BY_CREATED_TIME
+    )
     serializer_class = DataAnalyticsKeywordSerializer
     filter_backends = (django_filters.rest_framework.DjangoFilterBackend,)
     filterset_class = DataAnalyticsKeywordFilter
@@ -84,14 +182,19 @@ class OrganizationViewSet(DataAnalyticsBaseViewSet):
 
 
 class PlaceViewSet(DataAnalyticsBaseViewSet):
-    queryset = Place.objects.order_by(_ORDER_BY_CREATED_TIME)
+    queryset = Place.objects.prefetch_related(
+        Prefetch("divisions", _only_pk(AdministrativeDivision))
+    ).order_by(_ORDER_BY_CREATED_TIME)
     serializer_class = DataAnalyticsPlaceSerializer
     filter_backends = (django_filters.rest_framework.DjangoFilterBackend,)
     filterset_class = DataAnalyticsPlaceFilter
 
 
 class RegistrationViewSet(DataAnalyticsBaseViewSet):
-    queryset = Registration.objects.order_by(_ORDER_BY_CREATED_TIME)
+    queryset = Registration.objects.prefetch_related(
+        Prefetch("signup_groups", _only_pk(SignUpGroup)),
+        Prefetch("signups", _only_pk(SignUp)),
+    ).order_by(_ORDER_BY_CREATED_TIME)
     serializer_class = DataAnalyticsRegistrationSerializer
     filter_backends = (django_filters.rest_framework.DjangoFilterBackend,)
     filterset_class = DataAnalyticsRegistrationFilter
@@ -1,3 +1,6 @@
+import csv
+import io
+import json
 from datetime import timedelta
 
 import freezegun
@@ -29,6 +32,7 @@ from events.tests.utils import assert_fields_exist
 from helevents.tests.conftest import get_api_token_for_user_with_scopes
 
 _LIST_URL = reverse("data_analytics:event-list")
+_EXPORT_URL = reverse("data_analytics:event-export")
 
 
 def get_detail_url(event_pk: str):
@@ -48,6 +52,15 @@ def get_list(api_client: APIClient, query: str | None = None):
     return api_client.get(url, format="json")
 
 
+def get_export(api_client: APIClient, query: str | None = None):
+    url = _EXPORT_URL
+
+    if query:
+        url += f"?{query}"
+
+    return api_client.get(url)
+
+
 def assert_event_fields_exist(data):
     fields = (
         "id",
@@ -128,6 +141,59 @@ def test_get_event_list(user_api_client, event, event2):
     )
 
 
+@pytest.mark.django_db
+def test_export_events_as_ndjson(user_api_client, event, event2):
+    keyword = KeywordFactory()
+    event.keywords.add(keyword)
+
+    response = get_export(user_api_client)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/x-ndjson"
+    rows = [
+        json.loads(line) for line in b"".join(response.streaming_content).splitlines()
+    ]
+    assert {row["id"] for row in rows} == {event.pk, event2.pk}
+    assert_event_fields_exist(rows[0])
+    assert {row["id"]: row["keywords"] for row in rows}[event.pk] == [keyword.pk]
+
+
+@pytest.mark.django_db
+def test_export_events_as_csv(user_api_client, event, event2):
+    event.name_fi = "Tapahtuma, jossa on pilkku"
+    event.save(update_fields=["name_fi"])
+
+    response = get_export(user_api_client, query="export_format=csv")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "text/csv"
+    content = b"".join(response.streaming_content).decode()
+    rows = list(csv.DictReader(io.StringIO(content)))
+    assert {row["id"] for row in rows} == {event.pk, event2.pk}
+    names = {row["id"]: json.loads(row["name"]) for row in rows}
+    assert names[event.pk]["fi"] == "Tapahtuma, jossa on pilkku"
+    assert all(json.loads(row["keywords"]) == [] for row in rows)
+
+
+@pytest.mark.django_db
+def test_export_is_audit_logged_as_list(user_api_client, event, event2):
+    response = get_export(user_api_client, "export_format=csv")
+    b"".join(response.streaming_content)
+
+    audit_log_entry = ResilientLogEntry.objects.get()
+    assert audit_log_entry.context["target"]["object_ids"] == []
+    assert audit_log_entry.context["target"]["lists"] == [
+        {"model": "events.Event", "query": "export_format=csv", "count": 2}
+    ]
+
+
+@pytest.mark.django_db
+def test_export_events_with_invalid_format(user_api_client, event):
+    response = get_export(user_api_client, query="export_format=parquet")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.parametrize("url_type", ["detail", "list"])
 @pytest.mark.django_db
 def test_anonymous_user_cannot_get_events(api_client, event, url_type):
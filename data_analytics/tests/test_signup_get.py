@@ -24,6 +24,7 @@ from registrations.models import SignUp
 from registrations.tests.factories import SignUpFactory
 
 _LIST_URL = reverse("data_analytics:signup-list")
+_EXPORT_URL = reverse("data_analytics:signup-export")
 
 
 def get_detail_url(signup_pk: int):
@@ -175,6 +176,17 @@ def test_signup_id_is_audit_logged_on_get(user_api_client, signup, url_type):
     assert audit_log_entry.context["target"]["object_ids"] == [signup.pk]
 
 
+@pytest.mark.django_db
+def test_signup_ids_are_audit_logged_on_export(user_api_client, signup, signup2):
+    response = user_api_client.get(_EXPORT_URL)
+    b"".join(response.streaming_content)
+
+    audit_log_entry = ResilientLogEntry.objects.get()
+    assert sorted(audit_log_entry.context["target"]["object_ids"]) == sorted(
+        [signup.pk, signup2.pk]
+    )
+
+
 @freezegun.freeze_time("2024-05-17 12:00:00+03:00")
 @pytest.mark.parametrize(
     "last_modified_dt,expected_signups",
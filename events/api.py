@@ -1,10 +1,14 @@
 import logging
 import re
 import urllib.parse
+from collections.abc import Callable
 from datetime import time as datetime_time
+from datetime import timedelta
+from enum import IntEnum
 from functools import partial, reduce
 from operator import or_
-from typing import Literal
+from typing import Literal, NamedTuple
+from zoneinfo import ZoneInfo
 
 import django_filters
 import regex
@@ -13,10 +17,10 @@ from django.contrib.gis.gdal import GDALException
 from django.contrib.postgres.search import SearchQuery, TrigramSimilarity
 from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.models import Count, Exists, F, OuterRef, Prefetch, Q, QuerySet
-from django.db.models.functions import Greatest
-from django.http import Http404, HttpResponsePermanentRedirect
+from django.db.models.functions import Greatest, Now
+from django.http import FileResponse, Http404, HttpResponsePermanentRedirect
 from django.shortcuts import redirect
 from django.template.loader import render_to_string
 from django.utils import timezone, translation
@@ -60,11 +64,13 @@ from rest_framework_bulk import BulkModelViewSet
 
 from audit_log.mixins import AuditLogApiViewMixin
 from events import utils
-from events.api_pagination import LargeResultsSetPagination
+from events.api_pagination import LargeResultsSetPagination, SequencePagination
 from events.auth import ApiKeyUser
+from events.conditional_get import ConditionalGetMixin
 from events.custom_elasticsearch_search_backend import (
     CustomEsSearchQuerySet as SearchQuerySet,
 )
+from events.exports import EventProgrammeExportDOCX
 from events.extensions import apply_select_and_prefetch, get_extensions_from_request
 from events.filters import (
     EventFilter,
@@ -74,6 +80,9 @@ from events.filters import (
     filter_division,
 )
 from events.models import (
+    CHANGE_LOG_RESOURCE_TYPES,
+    UPCOMING_EVENT_RETENTION,
+    ChangeLogEntry,
     DataSource,
     Event,
     Image,
@@ -83,7 +92,9 @@ from events.models import (
     Offer,
     Place,
     PublicationStatus,
+    UpcomingEvent,
 )
+from events.organization_tree import get_organization_tree
 from events.permissions import (
     DataSourceResourceEditPermission,
     GuestPost,
@@ -99,6 +110,7 @@ from events.search_index.haystack import HaystackSearchIndexService
 from events.search_index.postgres import EventSearchIndexService
 from events.search_index.signals import suppress_search_index_updates
 from events.serializers import (
+    ChangeLogEntrySerializer,
     DataSourceSerializer,
     EventSerializer,
     EventSerializerV0_1,
@@ -114,7 +126,6 @@ from events.serializers import (
     SearchSerializer,
     SearchSerializerV0_1,
 )
-from events.translation import EventTranslationOptions, PlaceTranslationOptions
 from linkedevents.registry import register_view
 from linkedevents.schema_utils import (
     IncludeOpenApiParameter,
@@ -242,6 +253,40 @@ def _text_qset_by_translated_field(field, val):
     return qset
 
 
+def _text_qset_by_event_search_text(val):
+    # Free text search from all languages of the translated event and place fields.
+    # search_text contains the lowercased fields and has a trigram index.
+    val = val.lower()
+    return Q(search_text__contains=val) | Q(location__search_text__contains=val)
+
+
+KEYWORD_SIMILARITY_THRESHOLD = 0.2
+
+
+def _get_similar_keywords(val, limit=3):
+    # no need to search English if there are accented letters
+    langs = ["fi", "sv"] if re.search("[\u00c0-\u00ff]", val) else ["fi", "sv", "en"]
+    tri = [TrigramSimilarity(f"name_{i}", val) for i in langs]
+    # The % operator of trigram_similar can use the trigram indexes of the keyword
+    # names. With the threshold lowered to ours, it doesn't drop any keywords that
+    # the similarity filter would accept.
+    similar_q = Q()
+    for lang in langs:
+        similar_q |= Q(**{f"name_{lang}__trigram_similar": val})
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT set_config('pg_trgm.similarity_threshold', %s, true)",
+            [str(KEYWORD_SIMILARITY_THRESHOLD)],
+        )
+        return list(
+            Keyword.objects.filter(similar_q)
+            .annotate(simile=Greatest(*tri))
+            .filter(simile__gt=KEYWORD_SIMILARITY_THRESHOLD)
+            .order_by("-simile")[:limit]
+        )
+
+
 class JSONAPIViewMixin:
     def initial(self, request, *args, **kwargs):
         ret = super().initial(request, *args, **kwargs)
@@ -281,12 +326,14 @@ class KeywordViewSet(
     UserDataSourceAndOrganizationMixin,
     JSONAPIViewMixin,
     AuditLogApiViewMixin,
+    ConditionalGetMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
     mixins.DestroyModelMixin,
     viewsets.GenericViewSet,
 ):
     queryset = Keyword.objects.all()
+    conditional_get_fields = ("n_events", "has_upcoming_events")
     queryset = queryset.select_related("data_source", "publisher")
     serializer_class = KeywordSerializer
     permission_classes = [
@@ -393,6 +440,7 @@ class KeywordListViewSet(
     UserDataSourceAndOrganizationMixin,
     JSONAPIViewMixin,
     AuditLogApiViewMixin,
+    ConditionalGetMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet,
@@ -405,6 +453,7 @@ class KeywordListViewSet(
         .prefetch_related("publisher", "alt_labels")
     )
     serializer_class = KeywordSerializer
+    conditional_get_fields = ("n_events", "has_upcoming_events")
     filter_backends = (filters.OrderingFilter,)
     ordering_fields = ("n_events", "id", "name", "data_source")
     ordering = ("-data_source", "-n_events", "name")
@@ -716,6 +765,7 @@ class PlaceRetrieveViewSet(
     JSONAPIViewMixin,
     GeoModelAPIView,
     AuditLogApiViewMixin,
+    ConditionalGetMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
     mixins.DestroyModelMixin,
@@ -724,6 +774,7 @@ class PlaceRetrieveViewSet(
     queryset = Place.objects.all()
     queryset = queryset.select_related("data_source", "publisher")
     serializer_class = PlaceSerializer
+    conditional_get_fields = ("n_events", "has_upcoming_events")
     permission_classes = [
         DataSourceResourceEditPermission & OrganizationUserEditPermission
     ]
@@ -823,11 +874,13 @@ class PlaceListViewSet(
     GeoModelAPIView,
     JSONAPIViewMixin,
     AuditLogApiViewMixin,
+    ConditionalGetMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet,
 ):
     queryset = Place.objects.none()
+    conditional_get_fields = ("n_events", "has_upcoming_events")
     serializer_class = PlaceSerializer
     filter_backends = (
         django_filters.rest_framework.DjangoFilterBackend,
@@ -1171,17 +1224,15 @@ class OrganizationViewSet(
         )
         child_id = self.request.query_params.get("child", None)
         if child_id:
-            try:
-                queryset = queryset.get(id=child_id).get_ancestors()
-            except Organization.DoesNotExist:
-                queryset = queryset.none()
+            ancestor_ids = get_organization_tree().get_ancestor_ids(child_id)
+            queryset = queryset.filter(id__in=ancestor_ids).order_by("tree_id", "lft")
 
         parent_id = self.request.query_params.get("parent", None)
         if parent_id:
-            try:
-                queryset = queryset.get(id=parent_id).get_descendants()
-            except Organization.DoesNotExist:
-                queryset = queryset.none()
+            descendant_ids = get_organization_tree().get_descendant_ids(
+                parent_id, include_self=False
+            )
+            queryset = queryset.filter(id__in=descendant_ids).order_by("tree_id", "lft")
         return queryset
 
     @staticmethod
@@ -1346,6 +1397,7 @@ class ImageViewSet(
     UserDataSourceAndOrganizationMixin,
     JSONAPIViewMixin,
     AuditLogApiViewMixin,
+    ConditionalGetMixin,
     viewsets.ModelViewSet,
 ):
     queryset = Image.objects.all().select_related(
@@ -1627,41 +1679,58 @@ def _terms_to_regex(terms, operator: Literal["AND", "OR"]):
     return regex.compile(expr, regex.IGNORECASE)
 
 
-def _get_queryset_from_cache(params, param, cache_name, operator, queryset):
+def _get_ids_from_cache(params, param, cache_name, operator):
+    """
+    Get the ids of the cached events whose text matches the terms of the param.
+
+    :return: a set of ids, or None if the param is not given or the cache is missed
+    """
     val = params.get(param, None)
     if not val:
-        return queryset
+        return None
 
     cache_values = cache.get(cache_name)
     if not cache_values:
         logger.error(f"Missed cache {cache_name}")
-        return queryset
+        return None
 
     rc = _terms_to_regex(val, operator)
-    ids = {k for k, v in cache_values.items() if rc.search(v, concurrent=True)}
-    queryset = queryset.filter(id__in=ids)
-
-    return queryset
+    return {k for k, v in cache_values.items() if rc.search(v, concurrent=True)}
 
 
-def _get_queryset_from_cache_many(params, param, cache_name, operator, queryset):
+def _get_ids_from_cache_many(params, param, cache_name, operator):
+    """
+    Same as _get_ids_from_cache, but for several caches.
+    """
     val = params.get(param, None)
     if not val:
-        return queryset
+        return None
 
     cache_values = cache.get_many(cache_name)
     if not cache_values:
         logger.error(f"Missed cache {cache_name}")
-        return queryset
+        return None
 
     rc = _terms_to_regex(val, operator)
     cached_ids = {k: v for i in cache_values.values() for k, v in i.items()}
 
-    ids = {k for k, v in cached_ids.items() if rc.search(v, concurrent=True)}
+    return {k for k, v in cached_ids.items() if rc.search(v, concurrent=True)}
 
-    queryset = queryset.filter(id__in=ids)
 
-    return queryset
+def _get_queryset_from_cache(params, param, cache_name, operator, queryset):
+    ids = _get_ids_from_cache(params, param, cache_name, operator)
+    if ids is None:
+        return queryset
+
+    return queryset.filter(id__in=ids)
+
+
+def _get_queryset_from_cache_many(params, param, cache_name, operator, queryset):
+    ids = _get_ids_from_cache_many(params, param, cache_name, operator)
+    if ids is None:
+        return queryset
+
+    return queryset.filter(id__in=ids)
 
 
 def _find_keyword_replacements(keyword_ids: list[str]) -> tuple[list[Keyword], bool]:
@@ -1672,10 +1741,61 @@ def _find_keyword_replacements(keyword_ids: list[str]) -> tuple[list[Keyword], b
     :return: a pair containing a list of keywords and a boolean indicating
              whether all keywords were found
     """
-    keywords = Keyword.objects.filter(id__in=keyword_ids).select_related("replaced_by")
-    found_all_keywords = len(keyword_ids) == len(keywords)
-    replaced_keywords = [keyword.get_replacement() or keyword for keyword in keywords]
-    return list(set(replaced_keywords)), found_all_keywords
+    return _find_keyword_replacements_many([keyword_ids])[0]
+
+
+def _find_keyword_replacements_many(
+    keyword_id_lists: list[list[str]],
+) -> list[tuple[list[Keyword], bool]]:
+    """
+    Same as _find_keyword_replacements, but for several lists of keyword ids
+    with one query.
+    """
+    all_ids = {
+        keyword_id for keyword_ids in keyword_id_lists for keyword_id in keyword_ids
+    }
+    keywords_by_id = {}
+    if all_ids:
+        keywords_by_id = {
+            keyword.pk: keyword
+            for keyword in Keyword.objects.filter(id__in=all_ids).select_related(
+                "replaced_by"
+            )
+        }
+
+    results = []
+    for keyword_ids in keyword_id_lists:
+        keywords = {
+            keywords_by_id[keyword_id]
+            for keyword_id in keyword_ids
+            if keyword_id in keywords_by_id
+        }
+        found_all_keywords = len(keyword_ids) == len(keywords)
+        replaced_keywords = {
+            keyword.get_replacement() or keyword for keyword in keywords
+        }
+        results.append((list(replaced_keywords), found_all_keywords))
+    return results
+
+
+def _get_keyword_set_keyword_ids(keyword_set_ids) -> dict[str, set[str]]:
+    """
+    Get the keyword ids of the given keyword sets with one query.
+
+    :return: a dict of keyword id sets by keyword set id, containing only the
+             keyword sets that exist
+    """
+    keyword_ids_by_set = {}
+    if not keyword_set_ids:
+        return keyword_ids_by_set
+
+    for keyword_set_id, keyword_id in KeywordSet.objects.filter(
+        id__in=keyword_set_ids
+    ).values_list("id", "keywords"):
+        keyword_ids = keyword_ids_by_set.setdefault(keyword_set_id, set())
+        if keyword_id is not None:
+            keyword_ids.add(keyword_id)
+    return keyword_ids_by_set
 
 
 def _filter_events_keyword_or(queryset: QuerySet, keyword_ids: list[str]) -> QuerySet:
@@ -1683,67 +1803,257 @@ def _filter_events_keyword_or(queryset: QuerySet, keyword_ids: list[str]) -> Que
     Given an Event queryset, apply OR filter on keyword ids
     """
     keywords, __ = _find_keyword_replacements(keyword_ids)
-    keyword_ids = [keyword.pk for keyword in keywords]
+    return queryset.filter(_get_keyword_group_q([keyword.pk for keyword in keywords]))
 
-    kw_qs = Event.keywords.through.objects.filter(
-        event=OuterRef("pk"), keyword__in=keyword_ids
-    )
-    audience_qs = Event.audience.through.objects.filter(
-        event=OuterRef("pk"), keyword__in=keyword_ids
-    )
-    return queryset.filter(Exists(kw_qs) | Exists(audience_qs))
 
+def _get_keyword_group_q(keyword_ids) -> Q:
+    """
+    Build a filter for the events that have at least one of the keywords as a
+    keyword or audience. The filter uses the GIN indexes of the keyword id
+    arrays of events.
+    """
+    keyword_ids = sorted(keyword_ids)
+    if len(keyword_ids) == 1:
+        return Q(keyword_ids__contains=keyword_ids) | Q(
+            audience_ids__contains=keyword_ids
+        )
+    return Q(keyword_ids__overlap=keyword_ids) | Q(audience_ids__overlap=keyword_ids)
 
-def _filter_event_queryset(queryset, params, srs=None):  # noqa: C901
+
+class EventFilterCost(IntEnum):
     """
-    Filter events queryset by params
-    (e.g. self.request.query_params ingit EventViewSet)
+    Estimated cost of an event filter predicate. Cheaper, more selective
+    predicates are applied first.
+    """
+
+    IDS = 0  # explicit id lists
+    RELATION = 10  # keyword semi-joins, locations, publishers and places
+    TEXT = 20  # text and full-text searches
+    COLUMN = 30  # comparisons of event columns
+    BROAD = 40  # predicates that match most events
+    AGGREGATE = 50  # predicates with aggregate annotations
+
+
+class EventFilterPredicate(NamedTuple):
+    name: str
+    cost: EventFilterCost
+    apply: Callable[[QuerySet], QuerySet]
+    description: str
+
+
+class EventFilterPlan:
+    """
+    Intermediate representation of the event filters of a request.
+
+    The predicates are collected while parsing the params and applied to the
+    queryset ordered by their estimated cost. Id lists and keyword constraints
+    are merged into a single predicate each when the plan is compiled.
+
+    With upcoming_since, the events are first looked up from the upcoming event
+    table, which the keyword constraints and the upcoming filters are applied
+    to.
+    """
+
+    def __init__(self, upcoming_since=None):
+        self.predicates = {}
+        self.id_sets = []
+        self.keyword_groups = []
+        self.is_empty = False
+        self.upcoming_since = upcoming_since
+        self.upcoming_filters = {}
+
+    def add(self, name, cost, apply, description=""):
+        # The same predicate is added only once
+        self.predicates.setdefault(
+            name, EventFilterPredicate(name, cost, apply, description)
+        )
+
+    def filter(self, name, cost, *args, **kwargs):
+        self.add(
+            name,
+            cost,
+            lambda queryset: queryset.filter(*args, **kwargs),
+            _describe_filter("filter", args, kwargs),
+        )
+
+    def exclude(self, name, cost, *args, **kwargs):
+        self.add(
+            name,
+            cost,
+            lambda queryset: queryset.exclude(*args, **kwargs),
+            _describe_filter("exclude", args, kwargs),
+        )
+
+    def filter_ids(self, ids):
+        self.id_sets.append(set(ids))
+
+    def filter_keywords(self, keyword_ids):
+        """Require the event to have at least one of the keywords or audiences."""
+        self.keyword_groups.append(set(keyword_ids))
+
+    def filter_upcoming(self, name, *args, **kwargs):
+        """
+        Filter the rows of the upcoming event table. Ignored unless the plan
+        looks up the events from the upcoming event table.
+        """
+        if self.upcoming_since is not None:
+            self.upcoming_filters.setdefault(name, Q(*args, **kwargs))
+
+    def set_empty(self):
+        self.is_empty = True
+
+    def compile(self):
+        if self.id_sets:
+            ids = set.intersection(*self.id_sets)
+            self.filter("ids", EventFilterCost.IDS, id__in=sorted(ids))
+            self.id_sets = []
+
+        if self.keyword_groups:
+            if any(not keyword_ids for keyword_ids in self.keyword_groups):
+                self.set_empty()
+            elif self.upcoming_since is not None:
+                self._compile_upcoming_keywords()
+            else:
+                self.filter(
+                    "keywords",
+                    EventFilterCost.RELATION,
+                    *map(_get_keyword_group_q, self.keyword_groups),
+                )
+            self.keyword_groups = []
+
+        if self.upcoming_since is not None:
+            self._compile_upcoming()
+        return self
+
+    def _compile_upcoming_keywords(self):
+        # Single keyword groups are merged into one array containment
+        # filter, the others are array overlap filters. Both use the GIN index.
+        required_ids = sorted(
+            next(iter(keyword_ids))
+            for keyword_ids in self.keyword_groups
+            if len(keyword_ids) == 1
+        )
+        if required_ids:
+            self.filter_upcoming("keywords", keyword_ids__contains=required_ids)
+        for i, keyword_ids in enumerate(self.keyword_groups):
+            if len(keyword_ids) > 1:
+                self.filter_upcoming(
+                    f"keywords_{i}", keyword_ids__overlap=sorted(keyword_ids)
+                )
+
+    def _compile_upcoming(self):
+        since = self.upcoming_since
+        upcoming_event_ids = UpcomingEvent.objects.filter(
+            Q(end_time__gt=since)
+            | Q(start_time__gte=since)
+            | Q(event_status=Event.Status.POSTPONED),
+            *self.upcoming_filters.values(),
+        ).values("event_id")
+        description = ", ".join(
+            [f"since={since.isoformat()}", *map(str, self.upcoming_filters.values())]
+        )
+        self.add(
+            "upcoming",
+            EventFilterCost.IDS,
+            lambda queryset: queryset.filter(id__in=upcoming_event_ids),
+            f"upcoming events ({description})",
+        )
+
+    def get_ordered_predicates(self):
+        return sorted(self.predicates.values(), key=lambda predicate: predicate.cost)
+
+    def apply(self, queryset):
+        if self.is_empty:
+            return queryset.none()
+        for predicate in self.get_ordered_predicates():
+            queryset = predicate.apply(queryset)
+        return queryset
+
+    def explain(self):
+        """Return the compiled predicates in application order for debugging."""
+        if self.is_empty:
+            return [{"name": "none", "cost": 0, "description": "matches nothing"}]
+        return [
+            {
+                "name": predicate.name,
+                "cost": int(predicate.cost),
+                "description": predicate.description,
+            }
+            for predicate in self.get_ordered_predicates()
+        ]
+
+
+def _describe_filter(method, args, kwargs):
+    arguments = [str(arg) for arg in args]
+    arguments += [f"{key}={value!r}" for key, value in kwargs.items()]
+    return f"{method}({', '.join(arguments)})"
+
+
+def _compile_event_filters(  # noqa: C901
+    params, srs=None, upcoming_since=None
+) -> EventFilterPlan:
+    """
+    Parse the event filter params (e.g. self.request.query_params in
+    EventViewSet) into an EventFilterPlan. With upcoming_since, the events are
+    looked up from the upcoming event table, see _get_upcoming_events_since.
     """
     # Please keep in mind that .distinct() will absolutely kill
     # performance of event queries. To avoid duplicate rows in filters
     # consider using Exists instead.
-    # Filtering against the through table can also provide
-    # benefits (see _filter_events_keyword_or)
+    # Filtering against the keyword id arrays of events can also provide
+    # benefits (see _get_keyword_group_q)
+    plan = EventFilterPlan(upcoming_since=upcoming_since)
 
     val = params.get("registration", None)
     if val and parse_bool(val, "registration"):
-        queryset = queryset.exclude(registration=None)
+        plan.exclude("registration", EventFilterCost.COLUMN, registration=None)
     elif val:
-        queryset = queryset.filter(registration=None)
+        plan.filter("registration", EventFilterCost.COLUMN, registration=None)
 
     val = params.get("enrolment_open", None)
     if val:
-        queryset = (
-            queryset.filter(registration__enrolment_end_time__gte=localtime())
-            .annotate(
-                free=(
-                    F("registration__maximum_attendee_capacity")
-                    - Count("registration__signups")
-                ),
-            )
-            .filter(
-                Q(free__gte=1) | Q(registration__maximum_attendee_capacity__isnull=True)
-            )
+        plan.add(
+            "enrolment_open",
+            EventFilterCost.AGGREGATE,
+            lambda queryset: (
+                queryset.filter(registration__enrolment_end_time__gte=localtime())
+                .annotate(
+                    free=(
+                        F("registration__maximum_attendee_capacity")
+                        - Count("registration__signups")
+                    ),
+                )
+                .filter(
+                    Q(free__gte=1)
+                    | Q(registration__maximum_attendee_capacity__isnull=True)
+                )
+            ),
+            "enrolment open with free capacity",
         )
 
     val = params.get("enrolment_open_waitlist", None)
     if val:
-        queryset = (
-            queryset.filter(registration__enrolment_end_time__gte=localtime())
-            .annotate(
-                free=(
-                    (
-                        F("registration__maximum_attendee_capacity")
-                        + F("registration__waiting_list_capacity")
-                    )
-                    - Count("registration__signups")
-                ),
-            )
-            .filter(
-                Q(free__gte=1)
-                | Q(registration__maximum_attendee_capacity__isnull=True)
-                | Q(registration__waiting_list_capacity__isnull=True)
-            )
+        plan.add(
+            "enrolment_open_waitlist",
+            EventFilterCost.AGGREGATE,
+            lambda queryset: (
+                queryset.filter(registration__enrolment_end_time__gte=localtime())
+                .annotate(
+                    free=(
+                        (
+                            F("registration__maximum_attendee_capacity")
+                            + F("registration__waiting_list_capacity")
+                        )
+                        - Count("registration__signups")
+                    ),
+                )
+                .filter(
+                    Q(free__gte=1)
+                    | Q(registration__maximum_attendee_capacity__isnull=True)
+                    | Q(registration__waiting_list_capacity__isnull=True)
+                )
+            ),
+            "enrolment open with free capacity or waiting list",
         )
 
     val = params.get("local_ongoing_text", None)
@@ -1758,155 +2068,105 @@ def _filter_event_queryset(queryset, params, srs=None):  # noqa: C901
         val = val.replace(",", " ")
         query = SearchQuery(val, config=langs[language], search_type="plain")
         kwargs = {f"search_vector_{language}": query}
-        queryset = (
-            queryset.filter(**kwargs)
-            .filter(end_time__gte=timezone.now(), deleted=False)
-            .filter(Q(location__id__endswith="internet") | Q(local=True))
+        plan.filter("local_ongoing_text", EventFilterCost.TEXT, **kwargs)
+        plan.filter(
+            "local_ongoing_text_ongoing",
+            EventFilterCost.COLUMN,
+            Q(location__id__endswith="internet") | Q(local=True),
+            end_time__gte=timezone.now(),
+            deleted=False,
         )
 
-    queryset = _get_queryset_from_cache(
-        params, "local_ongoing_OR", "local_ids", "OR", queryset
-    )
-    queryset = _get_queryset_from_cache(
-        params, "local_ongoing_AND", "local_ids", "AND", queryset
-    )
-    queryset = _get_queryset_from_cache(
-        params, "internet_ongoing_AND", "internet_ids", "AND", queryset
-    )
-    queryset = _get_queryset_from_cache(
-        params, "internet_ongoing_OR", "internet_ids", "OR", queryset
-    )
-    queryset = _get_queryset_from_cache(
-        params, "local_ongoing_OR", "local_ids", "OR", queryset
-    )
+    for param, cache_name, operator in (
+        ("local_ongoing_OR", "local_ids", "OR"),
+        ("local_ongoing_AND", "local_ids", "AND"),
+        ("internet_ongoing_AND", "internet_ids", "AND"),
+        ("internet_ongoing_OR", "internet_ids", "OR"),
+    ):
+        ids = _get_ids_from_cache(params, param, cache_name, operator)
+        if ids is not None:
+            plan.filter_ids(ids)
 
     val = params.get("all_ongoing")
     if val and parse_bool(val, "all_ongoing"):
         cache_name = ["internet_ids", "local_ids"]
         cache_values = cache.get_many(cache_name)
         if cache_values:
-            ids = {k for i in cache_values.values() for k, v in i.items()}
-            queryset = queryset.filter(id__in=ids)
+            plan.filter_ids({k for i in cache_values.values() for k, v in i.items()})
         else:
             logger.error(f"Missed cache {cache_name}")
 
-    queryset = _get_queryset_from_cache_many(
-        params, "all_ongoing_AND", ["internet_ids", "local_ids"], "AND", queryset
-    )
-    queryset = _get_queryset_from_cache_many(
-        params, "all_ongoing_OR", ["internet_ids", "local_ids"], "OR", queryset
-    )
-
-    vals = params.get("keyword_set_AND", None)
-    if vals:
-        vals = vals.split(",")
-        kw_sets = KeywordSet.objects.filter(id__in=vals).prefetch_related(
-            Prefetch("keywords", Keyword.objects.all().only("id"))
+    for param, operator in (("all_ongoing_AND", "AND"), ("all_ongoing_OR", "OR")):
+        ids = _get_ids_from_cache_many(
+            params, param, ["internet_ids", "local_ids"], operator
         )
-        for kw_set in kw_sets:
-            kw_ids = [kw.id for kw in kw_set.keywords.all()]
-            subqs = Event.objects.filter(
-                Q(id=OuterRef("pk"), keywords__in=kw_ids)
-                | Q(id=OuterRef("pk"), audience__in=kw_ids)
+        if ids is not None:
+            plan.filter_ids(ids)
+
+    keyword_set_and_ids = []
+    if vals := params.get("keyword_set_AND", None):
+        keyword_set_and_ids = vals.split(",")
+    keyword_set_or_ids = []
+    if vals := params.get("keyword_set_OR", None):
+        keyword_set_or_ids = vals.split(",")
+    keyword_set_keyword_ids = _get_keyword_set_keyword_ids(
+        keyword_set_and_ids + keyword_set_or_ids
+    )
+
+    for keyword_set_id in dict.fromkeys(keyword_set_and_ids):
+        if keyword_set_id in keyword_set_keyword_ids:
+            plan.filter_keywords(keyword_set_keyword_ids[keyword_set_id])
+
+    if keyword_set_or_ids:
+        plan.filter_keywords(
+            set().union(
+                *(
+                    keyword_set_keyword_ids[keyword_set_id]
+                    for keyword_set_id in keyword_set_or_ids
+                    if keyword_set_id in keyword_set_keyword_ids
+                )
             )
-            queryset = queryset.filter(Exists(subqs))
-
-    vals = params.get("keyword_set_OR", None)
-    if vals:
-        vals = vals.split(",")
-        keyword_sets = KeywordSet.objects.filter(id__in=vals).prefetch_related(
-            Prefetch("keywords", Keyword.objects.all().only("id"))
-        )
-        all_keywords = set()
-        for keyword_set in keyword_sets:
-            keywords = keyword_set.keywords.all()
-            all_keywords.update(keywords)
-
-        kw_qs = Event.keywords.through.objects.filter(
-            event=OuterRef("pk"), keyword__in=all_keywords
         )
-        audience_qs = Event.audience.through.objects.filter(
-            event=OuterRef("pk"), keyword__in=all_keywords
-        )
-        queryset = queryset.filter(Exists(kw_qs) | Exists(audience_qs))
 
-    if "local_ongoing_OR_set1" in "".join(params):
+    for cache_prefix, cache_names in (
+        ("local_ongoing", ["local_ids"]),
+        ("internet_ongoing", ["internet_ids"]),
+        ("all_ongoing", ["internet_ids", "local_ids"]),
+    ):
+        if f"{cache_prefix}_OR_set1" not in "".join(params):
+            continue
         count = 1
         all_ids = []
-        while f"local_ongoing_OR_set{count}" in params:
-            val = params.get(f"local_ongoing_OR_set{count}", None)
-            if val:
-                rc = _terms_to_regex(val, "OR")
-                all_ids.append(
-                    {
-                        k
-                        for k, v in cache.get("local_ids").items()
-                        if rc.search(v, concurrent=True)
-                    }
-                )
-            count += 1
-        ids = set.intersection(*all_ids) if all_ids else set()
-        queryset = queryset.filter(id__in=ids)
-
-    if "internet_ongoing_OR_set1" in "".join(params):
-        count = 1
-        all_ids = []
-        while f"internet_ongoing_OR_set{count}" in params:
-            val = params.get(f"internet_ongoing_OR_set{count}", None)
-            if val:
-                rc = _terms_to_regex(val, "OR")
-                all_ids.append(
-                    {
-                        k
-                        for k, v in cache.get("internet_ids").items()
-                        if rc.search(v, concurrent=True)
-                    }
-                )
-            count += 1
-        ids = set.intersection(*all_ids) if all_ids else set()
-        queryset = queryset.filter(id__in=ids)
-
-    if "all_ongoing_OR_set1" in "".join(params):
-        count = 1
-        all_ids = []
-        while f"all_ongoing_OR_set{count}" in params:
-            val = params.get(f"all_ongoing_OR_set{count}", None)
+        while f"{cache_prefix}_OR_set{count}" in params:
+            val = params.get(f"{cache_prefix}_OR_set{count}", None)
             if val:
                 rc = _terms_to_regex(val, "OR")
                 cached_ids = {
                     k: v
-                    for i in cache.get_many(["internet_ids", "local_ids"]).values()
+                    for i in cache.get_many(cache_names).values()
                     for k, v in i.items()
-                }  # noqa E501
+                }
                 all_ids.append(
                     {k for k, v in cached_ids.items() if rc.search(v, concurrent=True)}
                 )
             count += 1
-        ids = set.intersection(*all_ids) if all_ids else set()
-        queryset = queryset.filter(id__in=ids)
-
-    if "keyword_OR_set" in "".join(params):
-        rc = regex.compile("keyword_OR_set[0-9]*")
-        all_sets = rc.findall("".join(params))
-        for i in all_sets:
-            val = params.get(i, None)
-            if val:
-                vals = val.split(",")
-                kw_qs = Event.keywords.through.objects.filter(
-                    event=OuterRef("pk"), keyword__in=vals
-                )
-                audience_qs = Event.audience.through.objects.filter(
-                    event=OuterRef("pk"), keyword__in=vals
-                )
-                queryset = queryset.filter(Exists(kw_qs) | Exists(audience_qs))
+        plan.filter_ids(set.intersection(*all_ids) if all_ids else set())
+
+    for param in params:
+        if regex.fullmatch("keyword_OR_set[0-9]*", param):
+            if val := params.get(param, None):
+                plan.filter_keywords(val.split(","))
 
     val = params.get("internet_based", None)
     if val and parse_bool(val, "internet_based"):
-        queryset = queryset.filter(location__id__contains="internet")
+        plan.filter(
+            "internet_based",
+            EventFilterCost.RELATION,
+            location__id__contains="internet",
+        )
 
-    #  Filter by event translated fields and keywords combined. The code is
-    #  repeated as this is the first iteration, which will be replaced by a similarity
-    #  based search on the index.
+    #  Filter by event translated fields and keywords combined. Both the text search
+    #  and the keyword similarity search use trigram indexes.
     val = params.get("combined_text", None)
     if val:
         val = val.lower()
@@ -1914,64 +2174,26 @@ def _filter_event_queryset(queryset, params, srs=None):  # noqa: C901
 
         combined_q = Q()
         for val in vals:
-            val_q = Q()
-            # Free string search from all translated event fields
-            event_fields = EventTranslationOptions.fields
-            for field in event_fields:
-                # check all languages for each field
-                val_q |= _text_qset_by_translated_field(field, val)
-
-            # Free string search from all translated place fields
-            place_fields = PlaceTranslationOptions.fields
-            for field in place_fields:
-                location_field = "location__" + field
-                # check all languages for each field
-                val_q |= _text_qset_by_translated_field(location_field, val)
-
-            langs = (
-                ["fi", "sv"]
-                if re.search("[\u00c0-\u00ff]", val)
-                else ["fi", "sv", "en"]
-            )
-            tri = [TrigramSimilarity(f"name_{i}", val) for i in langs]
-            keywords = list(
-                Keyword.objects.annotate(simile=Greatest(*tri))
-                .filter(simile__gt=0.2)
-                .order_by("-simile")[:3]
-            )
-
-            val_q |= Q(keywords__in=keywords)
+            # Free string search from all translated event and place fields
+            val_q = _text_qset_by_event_search_text(val)
+            val_q |= Q(keywords__in=_get_similar_keywords(val))
 
             combined_q &= val_q
 
-        # FYI: Biggest slowdown in this filter is the ordering of keywords simile
-        queryset = queryset.filter(
-            Exists(Event.objects.filter(combined_q, id=OuterRef("pk")).only("id"))
+        plan.filter(
+            "combined_text",
+            EventFilterCost.TEXT,
+            Exists(Event.objects.filter(combined_q, id=OuterRef("pk")).only("id")),
         )
 
     val = params.get("text", None)
     if val:
-        val = val.lower()
-        qset = Q()
-
-        # Free string search from all translated event fields
-        event_fields = EventTranslationOptions.fields
-        for field in event_fields:
-            # check all languages for each field
-            qset |= _text_qset_by_translated_field(field, val)
-
-        # Free string search from all translated place fields
-        place_fields = PlaceTranslationOptions.fields
-        for field in place_fields:
-            location_field = "location__" + field
-            # check all languages for each field
-            qset |= _text_qset_by_translated_field(location_field, val)
-
-        queryset = queryset.filter(qset)
+        # Free string search from all translated event and place fields
+        plan.filter("text", EventFilterCost.TEXT, _text_qset_by_event_search_text(val))
 
     val = params.get("ids", None)
     if val:
-        queryset = queryset.filter(id__in=val.strip("/").split(","))
+        plan.filter_ids(val.strip("/").split(","))
 
     val = params.get("event_type", None)
     if val:
@@ -1987,9 +2209,11 @@ def _filter_event_queryset(queryset, params, srs=None):  # noqa: C901
                 )
             search_vals.append(event_types[v])
 
-        queryset = queryset.filter(type_id__in=search_vals)
+        plan.filter("event_type", EventFilterCost.BROAD, type_id__in=search_vals)
+        plan.filter_upcoming("event_type", type_id__in=search_vals)
     else:
-        queryset = queryset.filter(type_id=Event.TypeId.GENERAL)
+        plan.filter("event_type", EventFilterCost.BROAD, type_id=Event.TypeId.GENERAL)
+        plan.filter_upcoming("event_type", type_id=Event.TypeId.GENERAL)
 
     val = params.get("last_modified_since", None)
     # This should be in format which dateutil.parser recognizes, e.g.
@@ -2000,74 +2224,82 @@ def _filter_event_queryset(queryset, params, srs=None):  # noqa: C901
         # implementation since 2014 has worked. No test coverage here at the
         # time of writing, so go figure.
         dt = utils.parse_end_time(val)[0]
-        queryset = queryset.filter(Q(last_modified_time__gte=dt))
+        plan.filter(
+            "last_modified_since",
+            EventFilterCost.COLUMN,
+            Q(last_modified_time__gte=dt),
+        )
 
     val = params.get("bbox", None)
     if val:
         bbox_filter = build_bbox_filter(srs, val, "position")
         places = Place.geo_objects.filter(**bbox_filter)
-        queryset = queryset.filter(location__in=places)
+        plan.filter("bbox", EventFilterCost.RELATION, location__in=places)
 
     # Filter by data source, multiple sources separated by comma
     val = params.get("data_source", None)
     if val:
         val = val.split(",")
-        queryset = queryset.filter(data_source_id__in=val)
+        plan.filter("data_source", EventFilterCost.RELATION, data_source_id__in=val)
     else:
-        queryset = queryset.exclude(data_source__private=True)
+        plan.exclude("data_source", EventFilterCost.BROAD, data_source__private=True)
 
     # Negative filter by data source, multiple sources separated by comma
     val = params.get("data_source!", None)
     if val:
         val = val.split(",")
-        queryset = queryset.exclude(data_source_id__in=val)
+        plan.exclude("data_source!", EventFilterCost.BROAD, data_source_id__in=val)
 
     # Filter by location id, multiple ids separated by comma
     val = params.get("location", None)
     if val:
         val = val.split(",")
-        queryset = queryset.filter(location_id__in=val)
-
-    if val := params.get("keyword", None):
-        queryset = _filter_events_keyword_or(queryset, val.split(","))
+        plan.filter("location", EventFilterCost.RELATION, location_id__in=val)
+        plan.filter_upcoming("location", location_id__in=val)
 
+    # Keyword replacements of all keyword params are resolved with one query.
     # 'keyword_OR' behaves the same way as 'keyword'
-    if val := params.get("keyword_OR", None):
-        queryset = _filter_events_keyword_or(queryset, val.split(","))
+    keyword_params = ("keyword", "keyword_OR", "keyword_AND", "keyword!")
+    keyword_param_ids = {
+        param: val.split(",")
+        for param in keyword_params
+        if (val := params.get(param, None))
+    }
+    keyword_replacements = dict(
+        zip(
+            keyword_param_ids,
+            _find_keyword_replacements_many(list(keyword_param_ids.values())),
+        )
+    )
+
+    for param in ("keyword", "keyword_OR"):
+        if param in keyword_replacements:
+            keywords, __ = keyword_replacements[param]
+            plan.filter_keywords(keyword.pk for keyword in keywords)
 
     # Filter by keyword ids requiring all keywords to be present in event
-    val = params.get("keyword_AND", None)
-    if val:
-        keywords, found_all_keywords = _find_keyword_replacements(val.split(","))
+    if "keyword_AND" in keyword_replacements:
+        keywords, found_all_keywords = keyword_replacements["keyword_AND"]
 
         # If some keywords were not found, AND can not match
         if not found_all_keywords:
-            return queryset.none()
-
-        q = Q()
-        for keyword in keywords:
-            q &= Q(keywords__pk=keyword.pk) | Q(audience__pk=keyword.pk)
+            plan.set_empty()
+            return plan
 
         for keyword in keywords:
-            kw_qs = Event.keywords.through.objects.filter(
-                event=OuterRef("pk"), keyword=keyword
-            )
-            audience_qs = Event.audience.through.objects.filter(
-                event=OuterRef("pk"), keyword=keyword
-            )
-            queryset = queryset.filter(Exists(kw_qs) | Exists(audience_qs))
+            plan.filter_keywords([keyword.pk])
 
     # Negative filter for keyword ids
-    val = params.get("keyword!", None)
-    if val:
-        keywords, __ = _find_keyword_replacements(val.split(","))
+    if "keyword!" in keyword_replacements:
+        keywords, __ = keyword_replacements["keyword!"]
         keyword_ids = [keyword.pk for keyword in keywords]
 
-        # This yields an AND NOT ((EXISTS.. keywords )) clause in SQL
-        # No distinct needed!
-        queryset = queryset.exclude(
-            Q(keywords__pk__in=keyword_ids) | Q(audience__pk__in=keyword_ids)
-        )
+        # Excluding by the keyword id arrays needs no joins or distinct
+        if keyword_ids:
+            plan.exclude(
+                "keyword!", EventFilterCost.RELATION, _get_keyword_group_q(keyword_ids)
+            )
+            plan.filter_upcoming("keyword!", ~Q(keyword_ids__overlap=keyword_ids))
 
     # filter only super or non-super events. to be deprecated?
     val = params.get("recurring", None)
@@ -2075,41 +2307,52 @@ def _filter_event_queryset(queryset, params, srs=None):  # noqa: C901
         val = val.lower()
         if val == "super":
             # same as ?super_event_type=recurring
-            queryset = queryset.filter(super_event_type=Event.SuperEventType.RECURRING)
+            plan.filter(
+                "recurring",
+                EventFilterCost.COLUMN,
+                super_event_type=Event.SuperEventType.RECURRING,
+            )
         elif val == "sub":
             # same as ?super_event_type=none,umbrella, weirdly yielding non-sub events too.  # noqa: E501
             # don't know if users want this to remain tho. do we want that or is there a need  # noqa: E501
             # to change this to actually filter only subevents of recurring events?
-            queryset = queryset.exclude(super_event_type=Event.SuperEventType.RECURRING)
+            plan.exclude(
+                "recurring",
+                EventFilterCost.BROAD,
+                super_event_type=Event.SuperEventType.RECURRING,
+            )
 
     # Filter by publisher, multiple sources separated by comma
     val = params.get("publisher", None)
     if val:
         val = val.split(",")
         q = get_publisher_query(val)
-        queryset = queryset.filter(q)
+        plan.filter("publisher", EventFilterCost.RELATION, q)
 
     # Filter by publisher ancestors, multiple ids separated by comma
     val = params.get("publisher_ancestor", None)
     if val:
         val = val.split(",")
-        ancestors = Organization.objects.filter(id__in=val)
-
         # Get ids of ancestors and all their descendants
-        publishers = Organization.objects.none()
-        for org in ancestors.all():
-            publishers |= org.get_descendants(include_self=True)
-        publisher_ids = [org["id"] for org in publishers.all().values("id")]
+        publisher_ids = get_organization_tree().get_descendant_ids_of_many(val)
 
         q = get_publisher_query(publisher_ids)
-        queryset = queryset.filter(q)
+        plan.filter("publisher_ancestor", EventFilterCost.RELATION, q)
 
     # Filter by publication status
     val = params.get("publication_status", None)
     if val == "draft":
-        queryset = queryset.filter(publication_status=PublicationStatus.DRAFT)
+        plan.filter(
+            "publication_status",
+            EventFilterCost.COLUMN,
+            publication_status=PublicationStatus.DRAFT,
+        )
     elif val == "public":
-        queryset = queryset.filter(publication_status=PublicationStatus.PUBLIC)
+        plan.filter(
+            "publication_status",
+            EventFilterCost.BROAD,
+            publication_status=PublicationStatus.PUBLIC,
+        )
 
     # Filter by event status
     if status_param := params.get("event_status"):
@@ -2124,7 +2367,7 @@ def _filter_event_queryset(queryset, params, srs=None):  # noqa: C901
             elif value == "eventpostponed":
                 statuses.append(Event.Status.POSTPONED)
 
-        queryset = queryset.filter(event_status__in=statuses)
+        plan.filter("event_status", EventFilterCost.COLUMN, event_status__in=statuses)
 
     # Filter by language, checking both string content and in_language field
     val = params.get("language", None)
@@ -2155,7 +2398,7 @@ def _filter_event_queryset(queryset, params, srs=None):  # noqa: C901
                     )
                 )
 
-        queryset = queryset.filter(q)
+        plan.filter("language", EventFilterCost.BROAD, q)
 
     # Filter by in_language field only
     val = params.get("in_language", None)
@@ -2169,35 +2412,21 @@ def _filter_event_queryset(queryset, params, srs=None):  # noqa: C901
                 )
             )
 
-        queryset = queryset.filter(q)
-
-    val = params.get("starts_after", None)
-    param = "starts_after"
-    if val:
-        split_time = val.split(":")
-        hour, minute = parse_hours(split_time, param)
-        queryset = queryset.filter(start_time__time__gte=datetime_time(hour, minute))
-
-    val = params.get("starts_before", None)
-    param = "starts_before"
-    if val:
-        split_time = val.split(":")
-        hour, minute = parse_hours(split_time, param)
-        queryset = queryset.filter(start_time__time__lte=datetime_time(hour, minute))
-
-    val = params.get("ends_after", None)
-    param = "ends_after"
-    if val:
-        split_time = val.split(":")
-        hour, minute = parse_hours(split_time, param)
-        queryset = queryset.filter(end_time__time__gte=datetime_time(hour, minute))
+        plan.filter("in_language", EventFilterCost.RELATION, q)
 
-    val = params.get("ends_before", None)
-    param = "ends_before"
-    if val:
-        split_time = val.split(":")
-        hour, minute = parse_hours(split_time, param)
-        queryset = queryset.filter(end_time__time__lte=datetime_time(hour, minute))
+    for param, lookup in (
+        ("starts_after", "start_time__time__gte"),
+        ("starts_before", "start_time__time__lte"),
+        ("ends_after", "end_time__time__gte"),
+        ("ends_before", "end_time__time__lte"),
+    ):
+        val = params.get(param, None)
+        if val:
+            split_time = val.split(":")
+            hour, minute = parse_hours(split_time, param)
+            plan.filter(
+                param, EventFilterCost.COLUMN, **{lookup: datetime_time(hour, minute)}
+            )
 
     # Filter by translation only
     val = params.get("translation", None)
@@ -2214,7 +2443,7 @@ def _filter_event_queryset(queryset, params, srs=None):  # noqa: C901
             else:
                 # language has no translations, matching condition must be false
                 q = q | Q(pk__in=[])
-        queryset = queryset.filter(q)
+        plan.filter("translation", EventFilterCost.BROAD, q)
 
     # Filter by audience min age
     val = params.get("audience_min_age", None) or params.get(
@@ -2222,12 +2451,16 @@ def _filter_event_queryset(queryset, params, srs=None):  # noqa: C901
     )
     if val:
         min_age = parse_digit(val, "audience_min_age")
-        queryset = queryset.filter(audience_min_age__lte=min_age)
+        plan.filter(
+            "audience_min_age_lt", EventFilterCost.COLUMN, audience_min_age__lte=min_age
+        )
 
     val = params.get("audience_min_age_gt", None)
     if val:
         min_age = parse_digit(val, "audience_min_age_gt")
-        queryset = queryset.filter(audience_min_age__gte=min_age)
+        plan.filter(
+            "audience_min_age_gt", EventFilterCost.COLUMN, audience_min_age__gte=min_age
+        )
 
     # Filter by audience max age
     val = params.get("audience_max_age", None) or params.get(
@@ -2235,33 +2468,41 @@ def _filter_event_queryset(queryset, params, srs=None):  # noqa: C901
     )
     if val:
         max_age = parse_digit(val, "audience_max_age")
-        queryset = queryset.filter(audience_max_age__gte=max_age)
+        plan.filter(
+            "audience_max_age_gt", EventFilterCost.COLUMN, audience_max_age__gte=max_age
+        )
 
     val = params.get("audience_max_age_lt", None)
     if val:
         max_age = parse_digit(val, "audience_max_age_lt")
-        queryset = queryset.filter(audience_max_age__lte=max_age)
+        plan.filter(
+            "audience_max_age_lt", EventFilterCost.COLUMN, audience_max_age__lte=max_age
+        )
 
     # Filter deleted events
     val = params.get("show_deleted", None)
     # ONLY deleted events (for cache updates etc., returns deleted object ids)
     val_deleted = params.get("deleted", None)
     if not val and not val_deleted:
-        queryset = queryset.filter(deleted=False)
+        plan.filter("deleted", EventFilterCost.BROAD, deleted=False)
     if val_deleted:
-        queryset = queryset.filter(deleted=True)
+        plan.filter("deleted", EventFilterCost.COLUMN, deleted=True)
 
     # Filter by free offer
     val = params.get("is_free", None)
     if val and val.lower() in ["true", "false"]:
         # Include events that have at least one free offer
         if val.lower() == "true":
-            queryset = queryset.filter(
-                Exists(Offer.objects.filter(event=OuterRef("pk"), is_free=True))
+            plan.filter(
+                "is_free",
+                EventFilterCost.RELATION,
+                Exists(Offer.objects.filter(event=OuterRef("pk"), is_free=True)),
             )
+            plan.filter_upcoming("is_free", is_free=True)
         # Include events that have no free offers
         elif val.lower() == "false":
-            queryset = queryset.exclude(offers__is_free=True)
+            plan.exclude("is_free", EventFilterCost.RELATION, offers__is_free=True)
+            plan.filter_upcoming("is_free", is_free=False)
 
     val = params.get("suitable_for", None)
     # Excludes all the events that have max age limit below or min age limit above the age or age range specified.  # noqa: E501
@@ -2280,12 +2521,51 @@ def _filter_event_queryset(queryset, params, srs=None):  # noqa: C901
             upper_boundary = max(int_vals)
         else:
             lower_boundary = upper_boundary = int_vals[0]
-        queryset = queryset.exclude(
+        plan.exclude(
+            "suitable_for",
+            EventFilterCost.COLUMN,
             Q(audience_min_age__gt=lower_boundary)
             | Q(audience_max_age__lt=upper_boundary)
-            | Q(Q(audience_min_age=None) & Q(audience_max_age=None))
+            | Q(Q(audience_min_age=None) & Q(audience_max_age=None)),
         )
-    return queryset
+
+    return plan.compile()
+
+
+def _get_upcoming_events_since(params):
+    """
+    Return the start of the time range the event list params are limited to if
+    the upcoming event table holds all the public events in the range,
+    otherwise None.
+    """
+    if params.get("show_deleted") or params.get("deleted"):
+        return None
+
+    default_tz = ZoneInfo(settings.TIME_ZONE)
+    now = timezone.now()
+    since = None
+    if val := params.get("start"):
+        since = utils.parse_time(val, default_tz=default_tz)[0]
+    elif params.get("days"):
+        # Same as in EventFilter.filter_days
+        since = utils.parse_time(now.date().isoformat(), default_tz=default_tz)[0]
+    if params.get("ongoing") in ("true", "True", "1"):
+        since = max(since, now) if since else now
+
+    if since is None or since < now - UPCOMING_EVENT_RETENTION:
+        return None
+    return since
+
+
+def _filter_event_queryset(queryset, params, srs=None, upcoming_since=None):
+    """
+    Filter events queryset by params
+    (e.g. self.request.query_params in EventViewSet)
+    """
+    plan = _compile_event_filters(params, srs=srs, upcoming_since=upcoming_since)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Compiled event filters: {plan.explain()}")
+    return plan.apply(queryset)
 
 
 class EventExtensionFilterBackend(BaseFilterBackend):
@@ -2308,6 +2588,7 @@ class EventViewSet(
     UserDataSourceAndOrganizationMixin,
     JSONAPIViewMixin,
     AuditLogApiViewMixin,
+    ConditionalGetMixin,
     BulkModelViewSet,
     viewsets.ModelViewSet,
 ):
@@ -2327,6 +2608,8 @@ class EventViewSet(
     )
 
     serializer_class = EventSerializer
+    # The capacities of registrations change with signups and seat reservations
+    conditional_get_excluded_includes = ("registration",)
     filter_backends = (
         EventOrderingFilter,
         django_filters.rest_framework.DjangoFilterBackend,
@@ -2508,8 +2791,16 @@ class EventViewSet(
                     queryset = queryset.filter(created_by=self.request.user)
                 else:
                     queryset = queryset.none()
+            # Public event listings are looked up from the upcoming event table
+            # when they are limited to upcoming events.
+            upcoming_since = None
+            if not show_all and not admin_user:
+                upcoming_since = _get_upcoming_events_since(self.request.query_params)
             queryset = _filter_event_queryset(
-                queryset, self.request.query_params, srs=self.srs
+                queryset,
+                self.request.query_params,
+                srs=self.srs,
+                upcoming_since=upcoming_since,
             )
         elif self.request.method not in permissions.SAFE_METHODS:
             # prevent changing events user does not have write permissions (for bulk
@@ -3322,12 +3613,13 @@ class EventViewSet(
                     {"detail": _("Must specify a location when fetching DOCX file.")}
                 )
             queryset = self.filter_queryset(self.get_queryset())
-            if queryset.count() == 0:
-                raise ParseError({"detail": _("No events.")})
-            if len(set([event.location for event in queryset])) > 1:
-                raise ParseError({"detail": _("Only one location allowed.")})
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
+            docx_export = EventProgrammeExportDOCX(queryset, request.query_params)
+            return FileResponse(
+                docx_export.get_docx(),
+                as_attachment=True,
+                filename=docx_export.filename,
+                content_type=DOCXRenderer.media_type,
+            )
         return super().list(request, *args, **kwargs)
 
     def finalize_response(self, request, response, *args, **kwargs):
@@ -3519,6 +3811,61 @@ class SearchViewSet(
 register_view(SearchViewSet, "search", base_name="search")
 
 
+class ChangeViewSet(
+    AuditLogApiViewMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    serializer_class = ChangeLogEntrySerializer
+    pagination_class = SequencePagination
+
+    def get_queryset(self):
+        queryset = ChangeLogEntry.objects.all()
+
+        if settings.CHANGE_FEED_DELAY:
+            queryset = queryset.filter(
+                created_time__lte=Now() - timedelta(seconds=settings.CHANGE_FEED_DELAY)
+            )
+
+        if val := self.request.query_params.get("resource_type"):
+            resource_types = val.lower().split(",")
+            for resource_type in resource_types:
+                if resource_type not in CHANGE_LOG_RESOURCE_TYPES.values():
+                    raise ParseError(
+                        _("Unknown resource_type: %(resource_type)s")
+                        % {"resource_type": resource_type}
+                    )
+            queryset = queryset.filter(resource_type__in=resource_types)
+
+        return queryset
+
+    @extend_schema(
+        summary="Return the changes of events, places, keywords and organizations",
+        description=(
+            "Returns the changes after the given sequence number in sequence order. "
+            "Each change tells the type and id of the changed resource and whether "
+            "it was created, updated or deleted. Events turned into drafts are "
+            "reported as deleted. To stay in sync, fetch the changed resources and "
+            "continue from <code>meta.last_sequence</code> in the next request."
+        ),
+        auth=[],
+        parameters=[
+            OpenApiParameter(
+                name="resource_type",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Comma-separated list of the resource types to return, any of "
+                    + ", ".join(CHANGE_LOG_RESOURCE_TYPES.values())
+                    + "."
+                ),
+            ),
+        ],
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+
+register_view(ChangeViewSet, "changes", base_name="changes")
+
+
 @extend_schema(exclude=True)
 class FeedbackViewSet(
     AuditLogApiViewMixin, mixins.CreateModelMixin, viewsets.GenericViewSet
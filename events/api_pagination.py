@@ -2,7 +2,9 @@ from collections import OrderedDict
 
 from django.utils.translation import gettext_lazy as _
 from rest_framework import pagination
+from rest_framework.exceptions import ParseError
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 # This needs to be in its own file because of circular
@@ -67,3 +69,112 @@ class LargeResultsSetPagination(CustomPagination):
     page_size_query_description = _(
         "Number of results to return per page. %(max_page_size)s is the maximum value for page_size."  # noqa: E501
     ) % {"max_page_size": max_page_size}
+
+
+class SequencePagination(pagination.BasePagination):
+    """
+    Keyset pagination over an increasing sequence number for change feeds. The
+    results after the "since" sequence number are returned in sequence order,
+    and meta.last_sequence is where the next request should continue from.
+    """
+
+    sequence_field = "id"
+    since_query_param = "since"
+    page_size = 1000
+    max_page_size = 1000
+    page_size_query_param = "page_size"
+
+    def get_since(self, request):
+        try:
+            return max(int(request.query_params.get(self.since_query_param, 0)), 0)
+        except ValueError:
+            raise ParseError(_("since must be a sequence number."))
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        since = self.get_since(request)
+
+        page = list(
+            queryset.filter(**{f"{self.sequence_field}__gt": since}).order_by(
+                self.sequence_field
+            )[: page_size + 1]
+        )
+        self.has_next = len(page) > page_size
+        page = page[:page_size]
+        self.last_sequence = getattr(page[-1], self.sequence_field) if page else since
+        return page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.since_query_param,
+            self.last_sequence,
+        )
+
+    def get_paginated_response(self, data):
+        meta = OrderedDict(
+            [
+                ("next", self.get_next_link()),
+                ("last_sequence", self.last_sequence),
+            ]
+        )
+
+        return Response(OrderedDict([("meta", meta), ("data", data)]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "meta": {
+                    "type": "object",
+                    "properties": {
+                        "next": {
+                            "type": "string",
+                            "nullable": True,
+                            "format": "uri",
+                            "example": (
+                                f"https://api.url/v1/example-endpoint/?{self.since_query_param}=1000"
+                            ),
+                        },
+                        "last_sequence": {
+                            "type": "integer",
+                            "example": 1000,
+                        },
+                    },
+                },
+                "data": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.since_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(_("Return the changes after this sequence number.")),
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(
+                    _(
+                        "Number of changes to return per page. %(max_page_size)s is the maximum value for page_size."  # noqa: E501
+                    )
+                    % {"max_page_size": self.max_page_size}
+                ),
+                "schema": {"type": "integer"},
+            },
+        ]
@@ -6,6 +6,7 @@ from helusers.oidc import ApiTokenAuthentication as HelApiTokenAuthentication
 from rest_framework import authentication, exceptions
 
 from events.models import DataSource
+from events.organization_tree import get_organization_tree
 from helevents.models import UserModelPermissionMixin
 
 
@@ -74,7 +75,11 @@ class ApiKeyUser(get_user_model(), UserModelPermissionMixin):
     def is_admin_of(self, publisher):
         if not self.data_source.owner_id:
             return False
-        return publisher in self.data_source.owner.get_descendants(include_self=True)
+        if publisher is None:
+            return False
+        return publisher.id in get_organization_tree().get_descendant_ids(
+            self.data_source.owner_id
+        )
 
     def is_registration_admin_of(self, publisher):
         return (
@@ -0,0 +1,160 @@
+import hashlib
+from functools import partial
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.postgres.aggregates import BitXor
+from django.core.paginator import Paginator
+from django.db.models import Count, F, Func, IntegerField, Max, TextField, Value
+from django.utils import translation
+from django.utils.cache import get_conditional_response
+from django.utils.functional import cached_property
+from django.utils.http import quote_etag
+from rest_framework.response import Response
+
+from linkedevents.utils import bump_cache_version, get_cache_version
+
+CONDITIONAL_GET_VERSION_KEY = "conditional_get_version"
+
+
+def invalidate_conditional_get_validators():
+    """
+    Change the validators of all responses, e.g. after an object that is
+    embedded in other objects' responses has changed.
+    """
+    bump_cache_version(CONDITIONAL_GET_VERSION_KEY)
+
+
+class CountedPaginator(Paginator):
+    """Paginator using an object count that has already been queried."""
+
+    def __init__(self, *args, count=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._count = count
+
+    @cached_property
+    def count(self):
+        if self._count is not None:
+            return self._count
+        return super().count
+
+
+class ConditionalGetMixin:
+    """
+    Add ETag validators to the retrieve and list responses, and answer the
+    requests whose If-None-Match still matches with 304 Not Modified before
+    anything is serialized.
+
+    The validators are derived from the request (URL, API version, format,
+    language and user), from a shared version bumped whenever objects
+    embedded in the responses change, and from the objects themselves: for
+    detail responses their last_modified_time and conditional_get_fields, and
+    for lists the max(last_modified_time), count and a checksum of the same
+    fields over the filtered queryset.
+
+    The validators are only sent when CONDITIONAL_GET_ENABLED is set, i.e. when
+    the version is shared by all processes.
+    """
+
+    # Serialized fields that are updated without touching last_modified_time
+    conditional_get_fields = ()
+    # Included objects whose changes don't change the shared version
+    conditional_get_excluded_includes = ()
+
+    def is_conditional_get_enabled(self):
+        if not settings.CONDITIONAL_GET_ENABLED:
+            return False
+
+        include = self.request.query_params.get("include", "")
+        return not any(
+            x.strip() in self.conditional_get_excluded_includes
+            for x in include.split(",")
+        )
+
+    def get_etag(self, *values):
+        version = get_cache_version(CONDITIONAL_GET_VERSION_KEY)
+        if version is None:
+            # Without the shared version, changes of embedded objects would go
+            # unnoticed
+            return None
+
+        request = self.request
+        user = request.user
+        parts = (
+            version,
+            # The pagination links in the responses are absolute
+            request.build_absolute_uri(request.path),
+            request.version,
+            getattr(request.accepted_renderer, "format", ""),
+            translation.get_language(),
+            f"{user._meta.label}:{user.pk}" if user.is_authenticated else "",
+            urlencode(sorted(request.query_params.lists()), doseq=True),
+            *values,
+        )
+        return quote_etag(hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest())
+
+    def get_not_modified_response(self, etag):
+        if etag is None:
+            return None
+        return get_conditional_response(self.request, etag=etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.is_conditional_get_enabled():
+            return super().retrieve(request, *args, **kwargs)
+
+        instance = self.get_object()
+        etag = self.get_etag(
+            instance.pk,
+            instance.last_modified_time.isoformat(),
+            *(getattr(instance, field) for field in self.conditional_get_fields),
+        )
+        if not_modified := self.get_not_modified_response(etag):
+            return not_modified
+
+        serializer = self.get_serializer(instance)
+        response = Response(serializer.data)
+        if etag:
+            response["ETag"] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_conditional_get_enabled():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        summary = queryset.aggregate(
+            last_modified_time=Max("last_modified_time"),
+            count=Count("pk"),
+            checksum=BitXor(
+                Func(
+                    Func(
+                        Value("|"),
+                        F("pk"),
+                        F("last_modified_time"),
+                        *map(F, self.conditional_get_fields),
+                        function="CONCAT_WS",
+                        output_field=TextField(),
+                    ),
+                    function="HASHTEXT",
+                    output_field=IntegerField(),
+                )
+            ),
+        )
+        etag = self.get_etag(*summary.values())
+        if not_modified := self.get_not_modified_response(etag):
+            return not_modified
+
+        if hasattr(self.paginator, "django_paginator_class"):
+            self.paginator.django_paginator_class = partial(
+                CountedPaginator, count=summary["count"]
+            )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        else:
+            serializer = self.get_serializer(queryset, many=True)
+            response = Response(serializer.data)
+        if etag:
+            response["ETag"] = etag
+        return response
@@ -0,0 +1,83 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.utils import timezone
+
+from events.sql import (
+    flag_n_events_changed,
+    update_has_upcoming_events_for_keywords,
+    update_has_upcoming_events_for_places,
+    update_n_events_for_keywords,
+    update_n_events_for_places,
+)
+
+logger = logging.getLogger(__name__)
+
+_current_session = ContextVar("event_counter_session", default=None)
+
+
+class EventCounterSession:
+    """
+    Collects the ids of keywords and places whose event counts have changed
+    while the session is active.
+    """
+
+    def __init__(self):
+        self.keyword_ids = set()
+        self.place_ids = set()
+
+    def recompute(self):
+        """
+        Recompute n_events and has_upcoming_events for the collected keywords and
+        places with one statement per model and field.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            n_keywords = update_n_events_for_keywords(self.keyword_ids)
+            n_places = update_n_events_for_places(self.place_ids)
+            update_has_upcoming_events_for_keywords(self.keyword_ids, now)
+            update_has_upcoming_events_for_places(self.place_ids, now)
+        logger.info(
+            f"Updated event counts of {n_keywords} keywords and {n_places} places."
+        )
+
+
+def get_event_counter_session():
+    """Return the active EventCounterSession or None."""
+    return _current_session.get()
+
+
+@contextmanager
+def deferred_event_counters(recompute=True):
+    """
+    Defer keyword and place event counter maintenance until the end of the block.
+
+    Within the block, event saves and keyword changes don't flag the affected
+    keywords and places with n_events_changed. Instead, their ids are collected
+    in memory and their counters are recomputed once when the block exits. If
+    the block raises or `recompute` is False, the collected rows are flagged
+    with one statement per model so that the update_n_events command picks
+    them up later.
+
+    Nested blocks join the outermost session.
+    """
+    session = get_event_counter_session()
+    if session is not None:
+        yield session
+        return
+
+    session = EventCounterSession()
+    token = _current_session.set(session)
+    try:
+        yield session
+    except BaseException:
+        _current_session.reset(token)
+        flag_n_events_changed(session.keyword_ids, session.place_ids)
+        raise
+    _current_session.reset(token)
+    if recompute:
+        session.recompute()
+    else:
+        flag_n_events_changed(session.keyword_ids, session.place_ids)
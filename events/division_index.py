@@ -0,0 +1,129 @@
+import logging
+import threading
+from collections import defaultdict
+
+from munigeo.models import AdministrativeDivision
+
+from events.models import Place
+from linkedevents.utils import bump_cache_version, get_snapshot_version
+
+logger = logging.getLogger(__name__)
+
+DIVISION_INDEX_VERSION_KEY = "division_index_version"
+DIVISION_PLACES_VERSION_KEY = "division_places_version"
+
+# Maximum number of cached place id lists per process
+MAX_CACHED_PLACE_ID_LISTS = 256
+
+
+class DivisionIndex:
+    """
+    An in-memory map of division ocd ids and names to division ids.
+
+    The ids of the places in a set of divisions are loaded on demand and cached
+    until the divisions of any place change, or without a shared cache for
+    LOCAL_SNAPSHOT_TIMEOUT seconds at most.
+    """
+
+    def __init__(self, rows, version=None):
+        self.version = version
+        self.ids_by_ocd_id = defaultdict(set)
+        self.ids_by_name = defaultdict(set)
+        for division_id, ocd_id, name in rows:
+            if ocd_id:
+                self.ids_by_ocd_id[ocd_id].add(division_id)
+            if name:
+                self.ids_by_name[name].add(division_id)
+        self._place_ids = {}
+        self._places_version = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, version=None) -> "DivisionIndex":
+        rows = AdministrativeDivision.objects.values_list(
+            "id", "ocd_id", "translations__name"
+        )
+        return cls(rows, version=version)
+
+    def get_division_ids(self, ocd_ids=(), names=()) -> set[int]:
+        """Return the ids of the divisions matching any of the ocd ids or names."""
+        division_ids = set()
+        for ocd_id in ocd_ids:
+            division_ids |= self.ids_by_ocd_id.get(ocd_id, set())
+        for name in names:
+            division_ids |= self.ids_by_name.get(name, set())
+        return division_ids
+
+    def get_place_ids(self, division_ids) -> list[str]:
+        """Return the ids of the places in any of the divisions."""
+        if not division_ids:
+            return []
+
+        places_version = get_snapshot_version(DIVISION_PLACES_VERSION_KEY)
+        key = frozenset(division_ids)
+        with self._lock:
+            if places_version is None or places_version != self._places_version:
+                self._place_ids = {}
+                self._places_version = places_version
+            place_ids = self._place_ids.get(key)
+        if place_ids is not None:
+            return place_ids
+
+        place_ids = sorted(
+            set(
+                Place.divisions.through.objects.filter(
+                    administrativedivision_id__in=key
+                ).values_list("place_id", flat=True)
+            )
+        )
+        if places_version is not None:
+            with self._lock:
+                if len(self._place_ids) >= MAX_CACHED_PLACE_ID_LISTS:
+                    # Drop the oldest list
+                    self._place_ids.pop(next(iter(self._place_ids)))
+                self._place_ids[key] = place_ids
+        return place_ids
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_division_index() -> DivisionIndex:
+    """
+    Return the division index of this process.
+
+    The index is reloaded when the version stored in the shared cache differs
+    from the version of the index, i.e. after divisions have been imported or
+    changed in any process. Without a shared cache, the index is reloaded every
+    LOCAL_SNAPSHOT_TIMEOUT seconds instead.
+    """
+    global _index
+
+    version = get_snapshot_version(DIVISION_INDEX_VERSION_KEY)
+    index = _index
+    if index is None or version is None or index.version != version:
+        with _index_lock:
+            index = _index
+            if index is None or version is None or index.version != version:
+                index = DivisionIndex.load(version=version)
+                if version is not None:
+                    _index = index
+                logger.debug(
+                    f"Loaded division index with {len(index.ids_by_ocd_id)} divisions"
+                )
+    return index
+
+
+def invalidate_division_index():
+    """Make all processes reload the division index on next access."""
+    global _index
+
+    _index = None
+    bump_cache_version(DIVISION_INDEX_VERSION_KEY)
+    bump_cache_version(DIVISION_PLACES_VERSION_KEY)
+
+
+def invalidate_division_places():
+    """Make all processes reload the place ids of divisions on next access."""
+    bump_cache_version(DIVISION_PLACES_VERSION_KEY)
@@ -1,5 +1,10 @@
+import hashlib
 import json
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import batched
 
 import requests
 from django.conf import settings
@@ -7,10 +12,12 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.management import CommandError
 from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
 from django.utils import timezone
 from httmock import HTTMock, all_requests, response
 from icalendar import Calendar
 from icalendar import Event as CalendarEvent
+from requests.adapters import HTTPAdapter
 
 from events.exporter.base import Exporter, register_exporter
 from events.models import Event, ExportInfo, Keyword, Place
@@ -23,6 +30,10 @@ CATEGORY_URL = BASE_API_URL + "categories?List=event"
 DRY_RUN_MODE = False  # If set True, do just local DB actions
 VERBOSE = False  # If set to True, print verbose creation logs
 
+# Number of objects generated, pushed and recorded at a time
+CHUNK_SIZE = 1000
+MAX_WORKERS = settings.CITYSDK_API_SETTINGS.get("MAX_WORKERS", 10)
+
 # maps ISO 639-1 alpha-2 to BCP 47 tags consumed by CitySDK
 bcp47_lang_map = {"fi": "fi-FI", "sv": "sv-SE", "en": "en-GB"}  # or sv-FI?
 
@@ -52,6 +63,13 @@ def jsonize(from_dict):
     return json.dumps(from_dict, cls=DjangoJSONEncoder)
 
 
+def get_content_hash(citysdk_model):
+    """Return a hash of the exported content for detecting unchanged objects."""
+    return hashlib.sha256(
+        json.dumps(citysdk_model, cls=DjangoJSONEncoder, sort_keys=True).encode()
+    ).hexdigest()
+
+
 def generate_icalendar_element(event):
     icalendar_event = CalendarEvent()
     if event.start_time:
@@ -87,10 +105,21 @@ def generate_icalendar_element(event):
 @register_exporter
 class CitySDKExporter(Exporter):
     name = "CitySDK"
-    session_cookies = None
     response_headers = {"content-type": "application/json"}
 
     def setup(self):
+        # The pushes are made concurrently over the session's pooled
+        # connections, and the session keeps the authentication cookies
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=MAX_WORKERS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(self.response_headers)
+        self.authentication_lock = threading.Lock()
+
+        self.category_target_ids = {}
+        self.poi_target_ids = {}
+
         self.authenticate()
 
     def authenticate(self):
@@ -99,11 +128,10 @@ class CitySDKExporter(Exporter):
         """
         username = settings.CITYSDK_API_SETTINGS["USERNAME"]
         password = settings.CITYSDK_API_SETTINGS["PASSWORD"]
-        session_response = requests.get(
+        session_response = self.session.get(
             f"{BASE_API_URL}auth?username={username}&password={password}"
         )
         if session_response.status_code == 200:
-            self.session_cookies = session_response.cookies
             print(f"Authentication successful with response: {session_response.text}")  # noqa: T201
         else:
             raise CommandError(
@@ -114,26 +142,18 @@ class CitySDKExporter(Exporter):
         citysdk_event = CITYSDK_EVENT_DEFAULTS_TPL.copy()
 
         # fetch category ID from exported categories
-        citysdk_event["category"] = []
-        for category in event.keywords.all():
-            exported_category = ExportInfo.objects.filter(
-                content_type=ContentType.objects.get_for_model(Keyword),
-                object_id=category.id,
-                target_system=self.name,
-            ).first()
-            citysdk_event["category"].append({"id": exported_category.target_id})
-
-        if event.location:
-            exported_poi = ExportInfo.objects.filter(
-                content_type=ContentType.objects.get_for_model(Place),
-                object_id=event.location.id,
-                target_system=self.name,
-            ).first()
-
+        citysdk_event["category"] = [
+            {"id": self.category_target_ids[category.id]}
+            # Sorted for a stable content hash
+            for category in sorted(event.keywords.all(), key=lambda k: k.id)
+            if category.id in self.category_target_ids
+        ]
+
+        if event.location_id in self.poi_target_ids:
             citysdk_event["location"] = {
                 "relationship": [
                     {
-                        "targetPOI": exported_poi.target_id,
+                        "targetPOI": self.poi_target_ids[event.location_id],
                         "term": "equal",
                         "base": POIS_URL,
                     }
@@ -245,12 +265,194 @@ class CitySDKExporter(Exporter):
         self._export_places()
         self._export_events()
 
-    def _export_models(self, klass, generate, url, json_wrapper, extra_filters=None):
+    def _get_target_ids(self, klass):
+        return dict(
+            ExportInfo.objects.filter(
+                content_type=ContentType.objects.get_for_model(klass),
+                target_system=self.name,
+            ).values_list("object_id", "target_id")
+        )
+
+    @staticmethod
+    def _get_request_data(klass, citysdk_model, json_wrapper):
+        if klass is Keyword:
+            return {"list": "event", "category": citysdk_model}
+        return {json_wrapper: citysdk_model}
+
+    def _do_concurrent_reqs(self, reqs):
+        """
+        Make the (method, url, data) requests concurrently and return their
+        responses, or the exceptions they raised, in the same order.
+        """
+
+        def do_req(req):
+            try:
+                return self._do_req(*req)
+            except (requests.RequestException, AssertionError) as exc:
+                return exc
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            return list(executor.map(do_req, reqs))
+
+    def _update_exported(self, klass, queryset, generate, url, json_wrapper, infos):
+        """
+        Push the objects whose content has changed since their export. Return
+        the number of updated objects and the ids of the objects that have
+        been deleted locally.
+        """
+        model_name = klass.__name__
+        models = queryset.filter(pk__in=infos.keys()).in_bulk()
+        updates = []
+        hashed_infos = []
+
+        for object_id, export_info in infos.items():
+            model = models.get(object_id)
+            if model is None:
+                continue
+
+            citysdk_model = generate(model)
+            content_hash = get_content_hash(citysdk_model)
+            if export_info.content_hash is None and (
+                model.last_modified_time <= export_info.last_exported_time
+            ):
+                # Exported before the content hashes were stored
+                export_info.content_hash = content_hash
+                hashed_infos.append(export_info)
+            elif content_hash != export_info.content_hash:
+                citysdk_model["id"] = export_info.target_id
+                updates.append(
+                    (
+                        export_info,
+                        content_hash,
+                        self._get_request_data(klass, citysdk_model, json_wrapper),
+                    )
+                )
+
+        modify_responses = self._do_concurrent_reqs(
+            [("post", url, data) for _export_info, _content_hash, data in updates]
+        )
+        now = timezone.now()
+        modify_count = 0
+        for (export_info, content_hash, _data), modify_response in zip(
+            updates, modify_responses
+        ):
+            if isinstance(modify_response, Exception):
+                print(  # noqa: T201
+                    f"{model_name} update failed (original id: "
+                    f"{export_info.object_id}): {modify_response}"
+                )
+                continue
+
+            export_info.content_hash = content_hash
+            export_info.last_exported_time = now
+            hashed_infos.append(export_info)
+            modify_count += 1
+            print(  # noqa: T201
+                f"{model_name} updated (original id: {export_info.object_id}, "
+                f"target id: {export_info.target_id})"
+            )
+
+        ExportInfo.objects.bulk_update(
+            hashed_infos, ["content_hash", "last_exported_time"]
+        )
+
+        return modify_count, [
+            object_id for object_id in infos if object_id not in models
+        ]
+
+    def _delete_exported(self, klass, url, infos):
+        model_name = klass.__name__
+        if klass is Keyword:
+            reqs = [
+                ("delete", url, {"id": export_info.target_id}) for export_info in infos
+            ]
+        else:
+            reqs = [("delete", url + export_info.target_id) for export_info in infos]
+
+        deleted_pks = []
+        for export_info, delete_response in zip(infos, self._do_concurrent_reqs(reqs)):
+            if isinstance(delete_response, Exception):
+                print(  # noqa: T201
+                    f"{model_name} removal failed (original id: "
+                    f"{export_info.object_id}): {delete_response}"
+                )
+                continue
+
+            deleted_pks.append(export_info.pk)
+            print(  # noqa: T201
+                f"{model_name} removed (original id: {export_info.object_id},"
+                f" target id: {export_info.target_id}) "
+                "from target system"
+            )
+
+        ExportInfo.objects.filter(pk__in=deleted_pks).delete()
+
+        return len(deleted_pks)
+
+    def _export_created(self, klass, models, generate, url, json_wrapper):
+        model_name = klass.__name__
         model_type = ContentType.objects.get_for_model(klass)
+        content_hashes = []
+        reqs = []
+
+        for model in models:
+            citysdk_model = generate(model)
+            content_hashes.append(get_content_hash(citysdk_model))
+            citysdk_model["created"] = timezone.now()
+            reqs.append(
+                ("put", url, self._get_request_data(klass, citysdk_model, json_wrapper))
+            )
+
+        now = timezone.now()
+        new_export_infos = []
+        for model, content_hash, new_response in zip(
+            models, content_hashes, self._do_concurrent_reqs(reqs)
+        ):
+            if isinstance(new_response, Exception):
+                print(f"{model_name} export failed (original id: {model.pk})")  # noqa: T201
+                continue
+
+            new = new_response.json()
+            if isinstance(new, dict) and "id" in new:
+                new_id = new["id"]
+            else:
+                new_id = new
+            if VERBOSE:
+                print(  # noqa: T201
+                    f"{model_name} exported (original id: {model.pk}, "
+                    f"target id: {new_id})"
+                )
+            new_export_infos.append(
+                ExportInfo(
+                    content_type=model_type,
+                    object_id=model.pk,
+                    target_id=new_id,
+                    target_system=self.name,
+                    last_exported_time=now,
+                    content_hash=content_hash,
+                )
+            )
+
+        ExportInfo.objects.bulk_create(new_export_infos)
+
+        return len(new_export_infos)
+
+    def _export_models(
+        self, klass, generate, url, json_wrapper, queryset=None, extra_filters=None
+    ):
+        """
+        Export the new objects, push the exported objects whose content hash
+        has changed and delete the objects that no longer exist locally. The
+        objects are loaded, pushed and recorded in chunks, and the requests of
+        a chunk are made concurrently.
+        """
+        if queryset is None:
+            queryset = klass.objects.all()
 
         # get all exported
         export_infos = ExportInfo.objects.filter(
-            content_type=model_type, target_system=self.name
+            content_type=ContentType.objects.get_for_model(klass),
+            target_system=self.name,
         )
 
         model_name = klass.__name__
@@ -259,122 +461,80 @@ class CitySDKExporter(Exporter):
         new_count = 0
 
         # deleted or modified
-        for export_info in export_infos:
-            try:
-                model = klass.objects.get(pk=export_info.object_id)
-                if model.last_modified_time > export_info.last_exported_time:
-                    citysdk_model = generate(model)
-                    citysdk_model["id"] = export_info.target_id
-                    if model_name == "Keyword":
-                        data = {"list": "event", "category": citysdk_model}
-                    else:
-                        data = {json_wrapper: citysdk_model}
-                    modify_response = self._do_req("post", url, data)
-                    if modify_response.status_code == 200:
-                        export_info.save()  # refresh last export date
-                        print(  # noqa: T201
-                            f"{model_name} updated (original id: {model.pk}, "
-                            f"target id: {export_info.target_id})"
-                        )
-                        modify_count += 1
+        deleted_ids = []
+        for chunk in batched(export_infos.order_by("pk").iterator(), CHUNK_SIZE):
+            count, chunk_deleted_ids = self._update_exported(
+                klass,
+                queryset,
+                generate,
+                url,
+                json_wrapper,
+                {export_info.object_id: export_info for export_info in chunk},
+            )
+            modify_count += count
+            deleted_ids.extend(chunk_deleted_ids)
 
-            except ObjectDoesNotExist:
-                if model_name == "Keyword":
-                    delete_response = self._do_req(
-                        "delete", url, data={"id": export_info.target_id}
-                    )
-                else:
-                    delete_response = self._do_req(
-                        "delete", url + export_info.target_id
-                    )
-                if delete_response.status_code == 200:
-                    export_info.delete()
-                    print(  # noqa: T201
-                        f"{model_name} removed (original id: {export_info.object_id:d},"
-                        f" target id: {export_info.target_id}) "
-                        "from target system"
-                    )
-                    delete_count += 1
+        for ids in batched(deleted_ids, CHUNK_SIZE):
+            delete_count += self._delete_exported(
+                klass, url, list(export_infos.filter(object_id__in=ids))
+            )
 
         # new
-        imported = {"id__in": export_infos.values("object_id")}
+        new_models = queryset.exclude(pk__in=export_infos.values("object_id"))
         if extra_filters:
-            qs = klass.objects.exclude(**imported).filter(**extra_filters).distinct()
-        else:
-            qs = klass.objects.exclude(**imported)
-        for model in qs:
-            citysdk_model = generate(model)
-            citysdk_model["created"] = timezone.now()
-            if model_name == "Keyword":
-                data = {"list": "event", "category": citysdk_model}
-            else:
-                data = {json_wrapper: citysdk_model}
-            new_response = self._do_req("put", url, data)
-            if new_response.status_code == 200:
-                new = new_response.json()
-                if isinstance(new, dict) and "id" in new:
-                    new_id = new["id"]
-                else:
-                    new_id = new
-                if VERBOSE:
-                    print(  # noqa: T201
-                        f"{model_name} exported (original id: {model.pk:d}, "
-                        f"target id: {new_id})"
-                    )
-                new_export_info = ExportInfo(
-                    content_object=model,
-                    content_type=model_type,
-                    target_id=new_id,
-                    target_system=self.name,
-                )
-                new_export_info.save()
-                new_count += 1
-            else:
-                print(f"{model_name} export failed (original id: {model.pk})")  # noqa: T201
+            new_models = new_models.filter(**extra_filters).distinct()
+        for chunk in batched(new_models.iterator(chunk_size=CHUNK_SIZE), CHUNK_SIZE):
+            new_count += self._export_created(klass, chunk, generate, url, json_wrapper)
 
         print(model_name + " items added: " + str(new_count))  # noqa: T201
         print(model_name + " items modified: " + str(modify_count))  # noqa: T201
         print(model_name + " items deleted: " + str(delete_count))  # noqa: T201
 
     def _do_req(self, method, url, data=None):
-        kwargs = {"headers": self.response_headers, "cookies": self.session_cookies}
+        kwargs = {}
         if data:
             kwargs["data"] = jsonize(data)
 
-        if DRY_RUN_MODE:
-            with HTTMock(citysdk_mock):
-                return requests.request(method, url, **kwargs)
-        else:
-            resp = requests.request(method, url, **kwargs)
-            # if session dies while doing exporting
-            if resp.status_code == 401:
+        resp = self.session.request(method, url, **kwargs)
+        # if session dies while doing exporting
+        if resp.status_code == 401:
+            with self.authentication_lock:
                 self.authenticate()
-                return requests.request(method, url, **kwargs)
-            assert resp.status_code == 200
-            return resp
+            resp = self.session.request(method, url, **kwargs)
+        assert resp.status_code == 200
+        return resp
 
     def _export_categories(self):
-        filters = {"event__in": Event.objects.all()}
         self._export_models(
             Keyword,
             self._generate_exportable_category,
             CATEGORY_URL,
             "poi",
-            extra_filters=filters,
+            extra_filters={"events__isnull": False},
         )
 
     def _export_places(self):
-        filters = {"event__in": Event.objects.all()}
         self._export_models(
             Place,
             self._generate_exportable_place,
             POIS_URL,
             "poi",
-            extra_filters=filters,
+            extra_filters={"events__isnull": False},
         )
 
     def _export_events(self):
-        self._export_models(Event, self._generate_exportable_event, EVENTS_URL, "event")
+        # The categories and places have been exported before the events
+        self.category_target_ids = self._get_target_ids(Keyword)
+        self.poi_target_ids = self._get_target_ids(Place)
+        self._export_models(
+            Event,
+            self._generate_exportable_event,
+            EVENTS_URL,
+            "event",
+            queryset=Event.objects.prefetch_related(
+                Prefetch("keywords", queryset=Keyword.objects.only("id"))
+            ),
+        )
 
     def __delete_resource(self, resource, url):
         response = self._do_req("delete", f"{url}/{resource.target_id}")
@@ -427,10 +587,13 @@ class CitySDKExporter(Exporter):
                 )
 
     def export_events(self, is_delete=False):
-        if is_delete:
-            self._delete_exported_from_target()
-        else:
-            self._export_new()
+        # The requests are made in several threads, so they are mocked for the
+        # whole export
+        with HTTMock(citysdk_mock) if DRY_RUN_MODE else nullcontext():
+            if is_delete:
+                self._delete_exported_from_target()
+            else:
+                self._export_new()
 
 
 # For dry run request mocking
@@ -0,0 +1,147 @@
+import tempfile
+
+from django.db.models import (
+    BooleanField,
+    Count,
+    ExpressionWrapper,
+    Max,
+    Min,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+)
+from django.db.models.functions import TruncDate
+from django.utils.html import strip_tags
+from django.utils.timezone import localtime
+from django.utils.translation import gettext as _
+from docx import Document
+from rest_framework.exceptions import ParseError
+
+from events.models import Offer, Place
+from events.renderers.docx import (
+    DateRange,
+    add_event,
+    get_any_language,
+    get_document_dates,
+    get_filename,
+)
+
+# The languages get_any_language() falls back to
+LANGUAGES = ("fi", "sv", "en")
+
+
+def _get_translations(row, field_name):
+    return {lang: row[f"{field_name}_{lang}"] for lang in LANGUAGES}
+
+
+class EventProgrammeExportDOCX:
+    """
+    Programme of a single location's events grouped by date. The location and
+    the date range are resolved with one aggregate query, and only the fields
+    shown in the programme are fetched in chunks, sorted by date in the
+    database, so that the document is written in one pass over the events.
+    """
+
+    chunk_size = 2000
+
+    def __init__(self, queryset: QuerySet, query_params) -> None:
+        summary = queryset.aggregate(
+            count=Count("pk"),
+            location_count=Count("location", distinct=True),
+            location_id=Min("location"),
+            earliest_time=Min("start_time"),
+            latest_time=Max("end_time"),
+        )
+        if summary["count"] == 0:
+            raise ParseError({"detail": _("No events.")})
+        if summary["location_count"] > 1:
+            raise ParseError({"detail": _("Only one location allowed.")})
+
+        self.location = Place.objects.filter(pk=summary["location_id"]).first()
+        self.start_date, self.end_date = get_document_dates(
+            query_params,
+            localtime(summary["earliest_time"]).date(),
+            localtime(summary["latest_time"]).date(),
+        )
+        self.filename = get_filename(self.location, self.start_date, self.end_date)
+
+        offers = Offer.objects.filter(event=OuterRef("pk")).order_by("pk")
+        self.events = (
+            queryset.order_by(
+                TruncDate("start_time"), TruncDate("end_time"), "start_time"
+            )
+            .annotate(
+                **{
+                    f"price_{lang}": Subquery(offers.values(f"price_{lang}")[:1])
+                    for lang in LANGUAGES
+                },
+                # The serializer leaves a translated field null without texts
+                has_short_description=ExpressionWrapper(
+                    Q(
+                        *(
+                            Q(**{f"short_description_{lang}__isnull": False})
+                            for lang in LANGUAGES
+                        ),
+                        _connector=Q.OR,
+                    ),
+                    output_field=BooleanField(),
+                ),
+            )
+            .values(
+                "start_time",
+                "end_time",
+                "has_short_description",
+                *(
+                    f"{field_name}_{lang}"
+                    for field_name in (
+                        "name",
+                        "short_description",
+                        "description",
+                        "price",
+                    )
+                    for lang in LANGUAGES
+                ),
+            )
+        )
+
+    @staticmethod
+    def _parse_event(row) -> dict:
+        description_field = (
+            "short_description" if row["has_short_description"] else "description"
+        )
+        return {
+            "name": get_any_language(_get_translations(row, "name")),
+            "description": strip_tags(
+                get_any_language(_get_translations(row, description_field))
+            ),
+            "start_time": localtime(row["start_time"]),
+            "end_time": localtime(row["end_time"]),
+            "price": get_any_language(_get_translations(row, "price")),
+        }
+
+    def get_docx(self):
+        """Return the export as a temporary file positioned at its beginning."""
+        document = Document()
+        document.add_heading(str(self.location), 0)
+        document.add_paragraph(str(DateRange(self.start_date, self.end_date)))
+
+        date_range = None
+        for row in self.events.iterator(chunk_size=self.chunk_size):
+            event = self._parse_event(row)
+            event_date_range = DateRange(
+                event["start_time"].date(),
+                event["end_time"].date(),
+                previous=date_range,
+            )
+            if date_range is None or event_date_range != date_range:
+                document.add_heading(str(event_date_range), 1)
+                date_range = event_date_range
+
+            add_event(document, event)
+
+        output = tempfile.TemporaryFile()
+        document.save(output)
+        output.seek(0)
+
+        return output
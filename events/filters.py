@@ -28,11 +28,11 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django_orghierarchy.models import Organization
 from munigeo.api import srid_to_srs
-from munigeo.models import AdministrativeDivision
 from rest_framework import serializers
 from rest_framework.exceptions import ParseError
 
 from events import utils
+from events.division_index import get_division_index
 from events.models import Event, EventAggregate, Place
 from events.search_index.utils import extract_word_bases
 from events.widgets import DistanceWithinWidget
@@ -157,32 +157,24 @@ def filter_division(queryset, name: str, value: Iterable[str]):
             names.append(item.title())
 
     if isinstance(queryset, QuerySet):
-        q = Q()
-        if ocd_ids:
-            q |= Q(ocd_id__in=ocd_ids)
-        if names:
-            q |= Q(translations__name__in=names)
-
-        if not q:
+        if not ocd_ids and not names:
             return queryset.none()
 
-        # Prefetching the divisions makes life a lot easier for the query planner:
-        # The Through table between Place and AdministrativeDivision has 400000
-        # rows in production, joining through it is a performance killer.
-        divisions = list(
-            AdministrativeDivision.objects.filter(q).values_list("id", flat=True)
+        # Resolving the places from the cached division index makes life a lot
+        # easier for the query planner: The Through table between Place and
+        # AdministrativeDivision has 400000 rows in production, joining through
+        # it is a performance killer.
+        division_index = get_division_index()
+        place_ids = division_index.get_place_ids(
+            division_index.get_division_ids(ocd_ids, names)
         )
 
         if queryset.model is Place:
-            outer_ref = "id"
+            field_name = "id"
         else:
-            outer_ref = "location_id"
+            field_name = "location_id"
 
-        # Subquery against the through table
-        place_division_qs = Place.divisions.through.objects.filter(
-            place_id=OuterRef(outer_ref), administrativedivision_id__in=divisions
-        )
-        return queryset.filter(Exists(place_division_qs))
+        return queryset.filter(**{f"{field_name}__in": place_ids})
     else:
         # Haystack SearchQuerySet
         if ocd_ids:
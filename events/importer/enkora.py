@@ -1,4 +1,6 @@
+import hashlib
 import html
+import json
 import logging
 import re
 from collections.abc import Generator
@@ -16,7 +18,7 @@ from django.utils import timezone
 from django_orghierarchy.models import Organization
 
 from events.importer.sync import ModelSyncher
-from events.models import DataSource, Event, Keyword, Place
+from events.models import DataSource, Event, ImportedContentHash, Keyword, Place
 
 from .base import Importer, recur_dict, register_importer
 
@@ -995,6 +997,19 @@ class EnkoraImporter(Importer):
             check_deleted_func=self.check_deleted,
         )
 
+        # Unless a full sync was requested, courses whose source data hasn't
+        # changed since the last import are skipped before any conversion.
+        full_sync = self.options.get("full", False) or self.options["single"]
+        if full_sync:
+            course_hashes = {}
+        else:
+            course_hashes = dict(
+                ImportedContentHash.objects.filter(
+                    data_source=self.data_source
+                ).values_list("origin_id", "content_hash")
+            )
+        changed_course_hashes = {}
+
         # Now we have the course list populated, iterate it.
         if self.options["single"]:
             logger.info(
@@ -1004,6 +1019,7 @@ class EnkoraImporter(Importer):
         course_count = 0
         course_event_count = 0
         course_sync_count = 0
+        course_skip_count = 0
         errors = []
         for course_id, course in reservation_event_groups.items():
             course_count += 1
@@ -1020,6 +1036,17 @@ class EnkoraImporter(Importer):
                     )
                 )
                 continue
+
+            origin_id = str(course["reservation_event_group_id"])
+            content_hash = self._get_course_hash(course)
+            if course_hashes.get(origin_id) == content_hash:
+                event = event_syncher.get(f"{self.data_source.id}:{origin_id}")
+                if event is not None and not event.deleted:
+                    logger.debug(f"Skipping unchanged course {origin_id}")
+                    event_syncher.mark(event)
+                    course_skip_count += 1
+                    continue
+
             # Convert a course into Linked Event
             # Conversion can fail. Failures will be raised at end of iteration
             try:
@@ -1064,11 +1091,15 @@ class EnkoraImporter(Importer):
             if event._changed:
                 event.save()
 
+            changed_course_hashes[origin_id] = content_hash
             course_sync_count += 1
 
         # After looping all the courses, delete the obsoleted ones (unless doing a
         # single event).
         event_syncher.finish(force=True)
+        self._save_course_hashes(changed_course_hashes)
+        if course_skip_count:
+            logger.info(f"Skipped {course_skip_count} unchanged courses.")
 
         # Delayed conversion exception?
         if errors:
@@ -1084,6 +1115,33 @@ class EnkoraImporter(Importer):
             "No errors encounterd."
         )
 
+    @staticmethod
+    def _get_course_hash(course: dict) -> str:
+        """
+        Hash of the course data including its events, used to detect changed
+        courses between imports.
+        :param: course, dict containing data for a course
+        :return: str, hex digest
+        """
+        course_json = json.dumps(course, sort_keys=True, default=str)
+        return hashlib.sha256(course_json.encode()).hexdigest()
+
+    def _save_course_hashes(self, course_hashes: dict[str, str]) -> None:
+        ImportedContentHash.objects.bulk_create(
+            [
+                ImportedContentHash(
+                    data_source=self.data_source,
+                    origin_id=origin_id,
+                    content_hash=content_hash,
+                )
+                for origin_id, content_hash in course_hashes.items()
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["data_source", "origin_id"],
+            update_fields=["content_hash", "last_modified_time"],
+        )
+
     def mark_deleted(self, event: Event) -> bool:
         if event.deleted:
             return False
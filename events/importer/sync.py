@@ -1,4 +1,7 @@
 import logging
+from types import SimpleNamespace
+
+from django.db import transaction
 
 CHUNK_SIZE = 10000
 
@@ -77,3 +80,122 @@ class ModelSyncher:
                 deleted = True
             if deleted:
                 logger.info(f"Deleting object {obj}")
+
+
+class BulkModelSyncher:
+    """
+    Compact, set-based variant of ModelSyncher.
+
+    Instead of materializing every existing object of the queryset, only the
+    primary key and the fields listed in `fields` are kept in memory, as named
+    tuples keyed by the object id. Stale objects are removed in `finish()` with
+    one UPDATE (soft delete) or DELETE statement per chunk of primary keys.
+
+    `check_deleted_func` and `allow_deleting_func` receive the projected rows
+    instead of model instances, so they may only use the projected fields.
+    """
+
+    def __init__(
+        self,
+        queryset,
+        id_fields,
+        fields=(),
+        soft_delete_field=None,
+        check_deleted_func=None,
+        allow_deleting_func=None,
+        chunk_size=CHUNK_SIZE,
+    ):
+        if isinstance(id_fields, str):
+            id_fields = (id_fields,)
+        self.model = queryset.model
+        self.id_fields = tuple(id_fields)
+        self.fields = tuple(
+            field for field in fields if field not in ("pk", *self.id_fields)
+        )
+        self.soft_delete_field = soft_delete_field
+        self.check_deleted_func = check_deleted_func
+        self.allow_deleting_func = allow_deleting_func
+        self.chunk_size = chunk_size
+
+        self.obj_dict = {}
+        self.found = set()
+        rows = queryset.values_list(
+            "pk", *self.id_fields, *self.fields, named=True
+        ).iterator(chunk_size=chunk_size)
+        for row in rows:
+            self.obj_dict[self._get_row_id(row)] = row
+
+    def _get_row_id(self, row):
+        if len(self.id_fields) == 1:
+            return getattr(row, self.id_fields[0])
+        return tuple(getattr(row, field) for field in self.id_fields)
+
+    def is_marked(self, obj_id):
+        return obj_id in self.found
+
+    def mark(self, obj_id, pk=None):
+        """
+        Mark the object with the given id as found. Objects created during the
+        import are not in the initial projection; pass their primary key so that
+        subsequent `get()` calls find them too.
+        """
+        if obj_id in self.found:
+            raise Exception(f"Object {obj_id} already marked")
+
+        if obj_id not in self.obj_dict:
+            if pk is None:
+                raise Exception(f"Primary key is required for new object {obj_id}")
+            self.obj_dict[obj_id] = SimpleNamespace(pk=pk)
+        self.found.add(obj_id)
+
+    def get(self, obj_id):
+        return self.obj_dict.get(obj_id, None)
+
+    def get_instance(self, obj_id):
+        """Load the full model instance for the given object id on demand."""
+        row = self.get(obj_id)
+        if row is None:
+            return None
+        return self.model.objects.filter(pk=row.pk).first()
+
+    def finish(self, force=False):
+        delete_list = []
+        for obj_id, row in self.obj_dict.items():
+            if obj_id in self.found:
+                continue
+            if self.check_deleted_func is not None and self.check_deleted_func(row):
+                continue
+            delete_list.append(row)
+        self.found = set()
+        if (
+            len(delete_list) > 5
+            and len(delete_list) > len(self.obj_dict) * 0.2
+            and not force
+        ):
+            raise Exception(
+                f"Attempting to delete {len(delete_list)} out of a total of {len(self.obj_dict)} items"  # noqa: E501
+            )
+        if self.allow_deleting_func:
+            for row in delete_list:
+                if not self.allow_deleting_func(row):
+                    raise Exception(
+                        f"Deleting {self.model.__name__} {row.pk} not allowed by the importer"  # noqa: E501
+                    )
+
+        pks = [row.pk for row in delete_list]
+        deleted = 0
+        for start in range(0, len(pks), self.chunk_size):
+            chunk = pks[start : start + self.chunk_size]
+            with transaction.atomic():
+                deleted += self._delete_chunk(chunk)
+        if deleted:
+            logger.info(f"Deleted {deleted} {self.model._meta.verbose_name_plural}")
+        return deleted
+
+    def _delete_chunk(self, pks):
+        queryset = self.model.objects.filter(pk__in=pks)
+        if self.soft_delete_field:
+            return queryset.exclude(**{self.soft_delete_field: True}).update(
+                **{self.soft_delete_field: True}
+            )
+        return queryset.delete()[1].get(self.model._meta.label, 0)
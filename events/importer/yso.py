@@ -11,7 +11,7 @@ from rdflib.namespace import DCTERMS, OWL, RDFS, SKOS
 from events.models import BaseModel, DataSource, Keyword, KeywordLabel, Language
 
 from .base import Importer, register_importer
-from .sync import ModelSyncher
+from .sync import BulkModelSyncher, ModelSyncher
 
 logger = logging.getLogger(__name__)
 
@@ -190,11 +190,7 @@ class YsoImporter(Importer):
         logger.debug("Saving data")
 
         queryset = KeywordLabel.objects.all()
-        label_syncher = ModelSyncher(
-            queryset,
-            lambda obj: (obj.name, obj.language_id),
-            delete_func=lambda obj: obj.delete(),
-        )
+        label_syncher = BulkModelSyncher(queryset, ("name", "language_id"))
 
         keyword_labels = {}
         for subject, label in graph.subject_objects(SKOS.altLabel):
@@ -297,28 +293,30 @@ class YsoImporter(Importer):
         Keyword.objects.bulk_create(keywords, batch_size=1000)
 
     def save_alt_label(self, syncher, graph, label):
+        """
+        Save the label unless it exists already and return its primary key.
+        """
         if label.language is None:
             logger.error(f"Error: {label} has no language")
             return None
         if label.language not in self.supported_languages:
             return None
 
-        label_text = str(label)
-        label_object = syncher.get((label_text, str(label.language)))
-        if label_object is None:
+        label_id = (str(label), str(label.language))
+        label_row = syncher.get(label_id)
+        if label_row is None:
             language = Language.objects.get(id=label.language)
-            label_object = KeywordLabel(name=label_text, language=language)
-            label_object._changed = True
-            label_object._created = True
+            label_object = KeywordLabel.objects.create(
+                name=label_id[0], language=language
+            )
+            label_pk = label_object.pk
         else:
-            label_object._created = False
-        if label_object._created:
-            # Since there are duplicates, only save & mark them once.
-            label_object.save()
-
-        if not getattr(label_object, "_found", False):
-            syncher.mark(label_object)
-        return label_object
+            label_pk = label_row.pk
+
+        # Since there are duplicates, only mark them once.
+        if not syncher.is_marked(label_id):
+            syncher.mark(label_id, pk=label_pk)
+        return label_pk
 
     def save_keyword(self, syncher, graph, subject, keyword_labels, save_set):
         if is_deprecated(graph, subject):
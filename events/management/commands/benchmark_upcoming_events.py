@@ -0,0 +1,144 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from django_orghierarchy.models import Organization
+
+from events.api import _filter_event_queryset, _get_upcoming_events_since
+from events.filters import EventFilter
+from events.models import DataSource, Event, Keyword, Place, PublicationStatus
+
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the event list filters with and without the upcoming event "
+        "table on a synthetic dataset. The dataset is created in a transaction "
+        "that is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=500000)
+        parser.add_argument(
+            "--upcoming-share",
+            type=float,
+            default=0.05,
+            help="Share of the events that are upcoming",
+        )
+        parser.add_argument("--keywords", type=int, default=2000)
+        parser.add_argument("--places", type=int, default=2000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, **options):
+        random.seed(options["seed"])
+        with transaction.atomic():
+            self.create_dataset(options)
+            self.run_benchmarks(options["repeat"])
+            transaction.set_rollback(True)
+
+    def create_dataset(self, options):
+        data_source = DataSource.objects.create(id="benchmark", name="Benchmark")
+        organization = Organization.objects.create(
+            origin_id="benchmark", name="Benchmark", data_source=data_source
+        )
+        self.places = Place.objects.bulk_create(
+            Place(
+                id=f"benchmark:place{i}",
+                name=f"Place {i}",
+                data_source=data_source,
+                publisher=organization,
+                tree_id=i,
+                lft=1,
+                rght=2,
+                level=0,
+            )
+            for i in range(options["places"])
+        )
+        self.keywords = Keyword.objects.bulk_create(
+            Keyword(id=f"benchmark:kw{i}", name=f"Keyword {i}", data_source=data_source)
+            for i in range(options["keywords"])
+        )
+
+        now = timezone.now()
+        n_events = options["events"]
+        self.stdout.write(f"Creating {n_events} events...")
+        for start in range(0, n_events, BATCH_SIZE):
+            events = []
+            for i in range(start, min(start + BATCH_SIZE, n_events)):
+                if random.random() < options["upcoming_share"]:
+                    start_time = now + timedelta(days=random.uniform(0, 180))
+                else:
+                    start_time = now - timedelta(days=random.uniform(3, 3650))
+                events.append(
+                    Event(
+                        id=f"benchmark:{i}",
+                        name=f"Event {i}",
+                        data_source=data_source,
+                        publisher=organization,
+                        location=random.choice(self.places),
+                        start_time=start_time,
+                        end_time=start_time + timedelta(hours=2),
+                        publication_status=(
+                            PublicationStatus.DRAFT
+                            if random.random() < 0.05
+                            else PublicationStatus.PUBLIC
+                        ),
+                        audience_min_age=random.choice([None, 0, 7, 13, 18]),
+                        # The keyword relations are created from these below
+                        keyword_ids=sorted(
+                            keyword.id for keyword in random.sample(self.keywords, 3)
+                        ),
+                    )
+                )
+            Event.objects.bulk_create(events)
+            Event.keywords.through.objects.bulk_create(
+                Event.keywords.through(event=event, keyword_id=keyword_id)
+                for event in events
+                for keyword_id in event.keyword_ids
+            )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def get_benchmark_params(self):
+        keywords = random.sample(self.keywords, 3)
+        return [
+            {"start": "now"},
+            {"days": "7"},
+            {"start": "today", "keyword": f"{keywords[0].id},{keywords[1].id}"},
+            {"start": "now", "keyword_AND": f"{keywords[0].id},{keywords[2].id}"},
+            {"start": "now", "location": random.choice(self.places).id},
+            {"start": "now", "is_free": "false", "keyword!": keywords[1].id},
+        ]
+
+    def run_benchmarks(self, repeat):
+        for params in self.get_benchmark_params():
+            baseline = self.time_listing(params, None, repeat)
+            upcoming = self.time_listing(
+                params, _get_upcoming_events_since(params), repeat
+            )
+            query_string = "&".join(f"{key}={value}" for key, value in params.items())
+            self.stdout.write(
+                f"{query_string}: {baseline * 1000:.1f} ms without and "
+                f"{upcoming * 1000:.1f} ms with the upcoming event table "
+                f"({baseline / upcoming:.1f}x)"
+            )
+
+    def time_listing(self, params, upcoming_since, repeat):
+        """Return the best time of counting the events and fetching the first page."""
+        timings = []
+        for __ in range(repeat):
+            begin = time.perf_counter()
+            queryset = Event.objects.filter(publication_status=PublicationStatus.PUBLIC)
+            queryset = _filter_event_queryset(
+                queryset, params, upcoming_since=upcoming_since
+            )
+            queryset = EventFilter(params, queryset=queryset).qs
+            queryset.count()
+            list(queryset.order_by("-last_modified_time").values_list("id")[:20])
+            timings.append(time.perf_counter() - begin)
+        return min(timings)
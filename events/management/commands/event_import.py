@@ -5,6 +5,7 @@ from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.utils.translation import override
 
+from events.counters import deferred_event_counters
 from events.importer.base import get_importers
 
 
@@ -48,6 +49,13 @@ class Command(BaseCommand):
             dest="force",
             help="Allow deleting any number of entities if necessary",
         )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            dest="full",
+            help="Reconcile all entities, also the ones unchanged since the last "
+            "import (for importers that skip unchanged entities)",
+        )
         parser.add_argument(
             "--disable-indexing",
             action="store_true",
@@ -55,6 +63,14 @@ class Command(BaseCommand):
             help="Disable updating the search index to speed up the import.",
         )
 
+        parser.add_argument(
+            "--defer-counters",
+            action="store_true",
+            dest="defer_counters",
+            help="Only flag changed keyword and place event counters instead of "
+            "recomputing them. Run update_n_events afterwards.",
+        )
+
         for imp in self.importer_types:
             parser.add_argument(
                 f"--{imp}", dest=imp, action="store_true", help=f"import {imp}"
@@ -87,12 +103,17 @@ class Command(BaseCommand):
                 "single": options["single"],
                 "remap": options["remap"],
                 "force": options["force"],
+                "full": options["full"],
             }
         )
 
         # Activate the default language for the duration of the import
-        # to make sure translated fields are populated correctly.
-        with override(settings.LANGUAGES[0][0]):
+        # to make sure translated fields are populated correctly. Keyword and
+        # place event counters are recomputed once at the end of the import.
+        with (
+            override(settings.LANGUAGES[0][0]),
+            deferred_event_counters(recompute=not options["defer_counters"]),
+        ):
             for imp_type in self.importer_types:
                 name = f"import_{imp_type}"
                 method = getattr(importer, name, None)
@@ -0,0 +1,39 @@
+import logging
+
+from django.core.management import BaseCommand
+from django.db import connection, transaction
+
+from events.models import Event
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the keyword_ids and audience_ids arrays of events from their "
+        "keyword and audience relations. The database keeps the arrays up to "
+        "date, this repairs them e.g. after the triggers have been disabled."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Number of events updated per transaction",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Event.objects.order_by("pk").values_list("pk", flat=True)
+        last_id = ""
+        count = 0
+
+        while ids := list(queryset.filter(pk__gt=last_id)[: options["batch_size"]]):
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute("SELECT events_event_keyword_ids_sync(%s)", [ids])
+            last_id = ids[-1]
+            count += len(ids)
+
+        logger.info(f"Rebuilt the keyword id arrays of {count} events.")
@@ -0,0 +1,265 @@
+import logging
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import yaml
+from django import db
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+logger = logging.getLogger(__name__)
+
+IMPORT_TYPES = ("places", "events", "keywords", "courses")
+
+DEFAULT_POST_IMPORT = (
+    "update_n_events",
+    "update_has_upcoming_events",
+    "populate_local_event_cache",
+)
+
+HAYSTACK_DUMMY_ENGINE = "haystack.backends.simple_backend.SimpleEngine"
+
+
+def get_default_post_import():
+    """
+    Return the default post-import commands. The runs don't index the imported
+    objects, so the commands end with rebuilding the search indexes of the
+    configured backends once.
+    """
+    post_import = list(DEFAULT_POST_IMPORT)
+    if any(
+        connection.get("BASE_ENGINE", HAYSTACK_DUMMY_ENGINE) != HAYSTACK_DUMMY_ENGINE
+        for connection in settings.HAYSTACK_CONNECTIONS.values()
+    ):
+        post_import.append(["update_index", "--remove"])
+    post_import.append("rebuild_event_search_index")
+    return post_import
+
+
+class ImportRun:
+    def __init__(self, name, module, types, depends_on=(), options=()):
+        self.name = name
+        self.module = module
+        self.types = tuple(types)
+        self.depends_on = tuple(depends_on)
+        self.options = tuple(options)
+
+    def get_args(self):
+        return (
+            self.module,
+            *(f"--{imp_type}" for imp_type in self.types),
+            "--disable-indexing",
+            "--defer-counters",
+            *self.options,
+        )
+
+
+def parse_pipeline(config):
+    """
+    Parse and validate a pipeline configuration, e.g.
+
+        runs:
+          yso:
+            module: yso
+            types: [keywords]
+          tprek:
+            module: tprek
+            types: [places]
+            depends_on: [yso]
+          kulke:
+            module: kulke
+            types: [events, courses]
+            depends_on: [yso, tprek]
+        post_import:
+          - update_n_events
+          - [update_index, --remove]
+
+    :return: a tuple of a dict of ImportRuns by name and a list of post-import
+             commands as argument lists
+    """
+    if not isinstance(config, dict) or not isinstance(config.get("runs"), dict):
+        raise CommandError("Pipeline configuration must contain a 'runs' mapping.")
+
+    runs = {}
+    for name, run_config in config["runs"].items():
+        run_config = run_config or {}
+        types = run_config.get("types") or ["all"]
+        for imp_type in types:
+            if imp_type != "all" and imp_type not in IMPORT_TYPES:
+                raise CommandError(f"Run {name} has unknown import type {imp_type}.")
+        runs[name] = ImportRun(
+            name,
+            run_config.get("module", name),
+            types,
+            depends_on=run_config.get("depends_on", ()),
+            options=run_config.get("options", ()),
+        )
+
+    for run in runs.values():
+        for dependency in run.depends_on:
+            if dependency not in runs:
+                raise CommandError(
+                    f"Run {run.name} depends on unknown run {dependency}."
+                )
+    get_stages(runs)
+
+    if "post_import" in config:
+        post_import = config["post_import"]
+    else:
+        post_import = get_default_post_import()
+    post_import = [
+        [command] if isinstance(command, str) else list(command)
+        for command in post_import
+    ]
+    return runs, post_import
+
+
+def get_stages(runs):
+    """
+    Group the runs into stages that only depend on earlier stages. Runs of the
+    same stage may be executed in parallel.
+
+    :raises CommandError: if the dependencies contain a cycle
+    """
+    done = set()
+    stages = []
+    remaining = dict(runs)
+    while remaining:
+        stage = [
+            name
+            for name, run in remaining.items()
+            if all(dependency in done for dependency in run.depends_on)
+        ]
+        if not stage:
+            raise CommandError(
+                f"Dependency cycle between runs {', '.join(sorted(remaining))}."
+            )
+        stages.append(stage)
+        done.update(stage)
+        for name in stage:
+            del remaining[name]
+    return stages
+
+
+def execute_run(run):
+    start = time.monotonic()
+    call_command("event_import", *run.get_args())
+    return time.monotonic() - start
+
+
+def execute_run_in_worker(run):
+    # Each worker process needs its own database connections.
+    db.connections.close_all()
+    return execute_run(run)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run several importers according to a dependency graph. Independent "
+        "importers run in parallel processes, and counters, caches and search "
+        "indexes are updated once after all imports."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("config", help="Path to a YAML pipeline configuration")
+        parser.add_argument(
+            "--max-workers",
+            type=int,
+            default=4,
+            help="Maximum number of importers to run in parallel. With 1, "
+            "importers run in this process.",
+        )
+        parser.add_argument(
+            "--skip-post-import",
+            action="store_true",
+            help="Don't run the post-import commands",
+        )
+
+    def handle(self, *args, **options):
+        with open(options["config"]) as f:
+            runs, post_import = parse_pipeline(yaml.safe_load(f))
+
+        start = time.monotonic()
+        timings, failed = self.run_imports(runs, options["max_workers"])
+        for name, duration in timings.items():
+            self.stdout.write(f"Import {name} finished in {duration:.1f} s")
+        imports_duration = time.monotonic() - start
+        self.stdout.write(f"Imports finished in {imports_duration:.1f} s")
+
+        if timings and not options["skip_post_import"]:
+            self.run_post_import(post_import)
+
+        self.stdout.write(f"Pipeline finished in {time.monotonic() - start:.1f} s")
+        if failed:
+            raise CommandError(f"Failed or skipped runs: {', '.join(sorted(failed))}")
+
+    def run_imports(self, runs, max_workers):
+        """
+        Execute the runs as soon as their dependencies have finished. Runs whose
+        dependencies failed are skipped.
+
+        :return: a tuple of a dict of durations by run name and a set of names of
+                 failed or skipped runs
+        """
+        timings = {}
+        failed = set()
+        pending = dict(runs)
+
+        def pop_ready():
+            ready = []
+            skipped = True
+            while skipped:
+                skipped = False
+                for name, run in list(pending.items()):
+                    if any(dependency in failed for dependency in run.depends_on):
+                        logger.error(f"Skipping import {name}, a dependency failed")
+                        failed.add(name)
+                        del pending[name]
+                        skipped = True
+                    elif all(dependency in timings for dependency in run.depends_on):
+                        ready.append(pending.pop(name))
+            return ready
+
+        if max_workers <= 1:
+            while ready := pop_ready():
+                for run in ready:
+                    self.stdout.write(f"Starting import {run.name}")
+                    try:
+                        timings[run.name] = execute_run(run)
+                    except Exception:
+                        logger.exception(f"Import {run.name} failed")
+                        failed.add(run.name)
+            return timings, failed
+
+        # Close the connections so the forked workers don't share them.
+        db.connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            futures = {}
+            while True:
+                for run in pop_ready():
+                    self.stdout.write(f"Starting import {run.name}")
+                    futures[executor.submit(execute_run_in_worker, run)] = run
+                if not futures:
+                    break
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    run = futures.pop(future)
+                    try:
+                        timings[run.name] = future.result()
+                    except Exception:
+                        logger.exception(f"Import {run.name} failed")
+                        failed.add(run.name)
+        return timings, failed
+
+    def run_post_import(self, post_import):
+        for command in post_import:
+            start = time.monotonic()
+            call_command(*command)
+            self.stdout.write(
+                f"Post-import {' '.join(command)} finished in "
+                f"{time.monotonic() - start:.1f} s"
+            )
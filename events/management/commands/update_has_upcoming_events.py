@@ -2,15 +2,20 @@ import logging
 
 from django.core.management import BaseCommand
 
-from events.models import Keyword, Place
+from events.models import Keyword, Place, UpcomingEvent
 
 logger = logging.getLogger(__name__)
 
 
 class Command(BaseCommand):
-    help = "Update keyword has_upcoming_events field"
+    help = (
+        "Update keyword has_upcoming_events field and prune ended events from the "
+        "upcoming event table"
+    )
 
     def handle(self, **kwargs):
         Keyword.objects.has_upcoming_events_update()
         Place.upcoming_events.has_upcoming_events_update()
         logger.info("has_upcoming_events for Keywords and Places updated.")
+        pruned = UpcomingEvent.objects.prune()
+        logger.info(f"Pruned {pruned} ended events from the upcoming event table.")
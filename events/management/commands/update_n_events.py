@@ -19,23 +19,33 @@ class Command(BaseCommand):
 
     def handle_keywords(self, update_all=False):
         if update_all:
-            keywords = Keyword.objects.all()
+            keyword_ids = ()
+            count = Keyword.objects.count()
         else:
-            keywords = Keyword.objects.filter(n_events_changed=True)
-        recache_n_events((k.id for k in keywords), all=update_all)
+            keyword_ids = list(
+                Keyword.objects.filter(n_events_changed=True).values_list(
+                    "id", flat=True
+                )
+            )
+            count = len(keyword_ids)
+        recache_n_events(keyword_ids, all=update_all)
         print(  # noqa: T201
             "Updated %s keyword event numbers." % ("all" if update_all else "changed")
         )
-        print(f"A total of {str(keywords.count())} keywords updated.")  # noqa: T201
+        print(f"A total of {count} keywords updated.")  # noqa: T201
 
     def handle_places(self, update_all=False):
         if update_all:
-            places = Place.objects.all()
+            place_ids = ()
+            count = Place.objects.count()
         else:
-            places = Place.objects.filter(n_events_changed=True)
-        recache_n_events_in_locations((k.id for k in places), all=update_all)
+            place_ids = list(
+                Place.objects.filter(n_events_changed=True).values_list("id", flat=True)
+            )
+            count = len(place_ids)
+        recache_n_events_in_locations(place_ids, all=update_all)
         print("Updated %s place event numbers." % ("all" if update_all else "changed"))  # noqa: T201
-        print(f"A total of {str(places.count())} places updated.")  # noqa: T201
+        print(f"A total of {count} places updated.")  # noqa: T201
 
     def handle(self, model=None, update_all=False, **kwargs):
         if model and model not in ("keyword", "place"):
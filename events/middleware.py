@@ -1,5 +1,7 @@
 from django.utils.cache import add_never_cache_headers
 
+from helevents.permission_resolver import organization_permission_scope
+
 
 class AuthenticationCacheDisableMiddleware:
     """
@@ -16,3 +18,17 @@ class AuthenticationCacheDisableMiddleware:
         if request.user.is_authenticated:
             add_never_cache_headers(response)
         return response
+
+
+class OrganizationPermissionScopeMiddleware:
+    """
+    Middleware to share the organization permission checks of a user within a
+    request, so that the user's organizations are loaded only once per request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with organization_permission_scope():
+            return self.get_response(request)
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.15 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0110_remove_keyword_keywords_index_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportedContentHash",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("origin_id", models.CharField(max_length=100)),
+                ("content_hash", models.CharField(max_length=64)),
+                ("last_modified_time", models.DateTimeField(auto_now=True)),
+                (
+                    "data_source",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="events.datasource",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("data_source", "origin_id")},
+            },
+        ),
+    ]
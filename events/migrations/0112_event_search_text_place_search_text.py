@@ -0,0 +1,126 @@
+# Generated by Django 5.2.15 on 2026-10-18 10:05
+"""This migration adds denormalized, lowercased search_text columns to events_event
+and events_place, triggers to keep them up to date and trigram indexes for them and
+for the keyword names.
+"""
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+LANGUAGES = ("fi", "sv", "en", "zh_hans", "ru", "ar")
+
+EVENT_FIELDS = (
+    "name",
+    "description",
+    "short_description",
+    "info_url",
+    "location_extra_info",
+    "headline",
+    "secondary_headline",
+    "provider",
+    "provider_contact_info",
+)
+
+PLACE_FIELDS = (
+    "name",
+    "description",
+    "info_url",
+    "street_address",
+    "address_locality",
+    "telephone",
+)
+
+
+def search_text_expression(fields, prefix):
+    columns = ", ".join(
+        f"{prefix}{field}_{lang}" for field in fields for lang in LANGUAGES
+    )
+    return f"lower(concat_ws(E'\\n', {columns}))"
+
+
+def search_text_sql(table, fields):
+    return [
+        f"CREATE FUNCTION {table}_search_text_trigger_function() RETURNS trigger AS $$ "
+        "begin "
+        f"new.search_text := {search_text_expression(fields, 'new.')}; "
+        "return new; "
+        "end "
+        "$$ LANGUAGE plpgsql;",
+        f"CREATE TRIGGER {table}_search_text_trigger BEFORE INSERT OR UPDATE ON {table} "
+        f"FOR EACH ROW EXECUTE PROCEDURE {table}_search_text_trigger_function();",
+        f"UPDATE {table} SET search_text = {search_text_expression(fields, '')};",
+    ]
+
+
+def search_text_reverse_sql(table):
+    return [
+        f"DROP TRIGGER {table}_search_text_trigger ON {table};",
+        f"DROP FUNCTION {table}_search_text_trigger_function;",
+    ]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0111_importedcontenthash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="search_text",
+            field=models.TextField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="place",
+            name="search_text",
+            field=models.TextField(editable=False, null=True),
+        ),
+        migrations.RunSQL(
+            sql=search_text_sql("events_event", EVENT_FIELDS),
+            reverse_sql=search_text_reverse_sql("events_event"),
+        ),
+        migrations.RunSQL(
+            sql=search_text_sql("events_place", PLACE_FIELDS),
+            reverse_sql=search_text_reverse_sql("events_place"),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_text"],
+                name="event_search_text_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="place",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_text"],
+                name="place_search_text_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="keyword",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name_fi"],
+                name="keyword_name_fi_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="keyword",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name_sv"],
+                name="keyword_name_sv_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="keyword",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name_en"],
+                name="keyword_name_en_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,208 @@
+# Generated by Django 5.2.15 on 2026-10-18 12:40
+"""This migration adds the events_upcomingevent table holding the listing columns
+of public, non-deleted upcoming events, and triggers that keep it up to date when
+events, their keywords, audiences or offers change.
+"""
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Publication status 1 is public. The events that have ended are removed from the
+# table by UpcomingEvent.objects.prune().
+SYNC_FUNCTION_SQL = """
+CREATE FUNCTION events_upcomingevent_sync(event_ids text[]) RETURNS void AS $$
+begin
+  DELETE FROM events_upcomingevent WHERE event_id = ANY(event_ids);
+  INSERT INTO events_upcomingevent (
+    event_id, start_time, end_time, event_status, type_id, location_id,
+    publisher_id, keyword_ids, audience_min_age, audience_max_age, is_free
+  )
+  SELECT
+    e.id, e.start_time, e.end_time, e.event_status, e.type_id, e.location_id,
+    e.publisher_id,
+    ARRAY(
+      SELECT keyword_id FROM events_event_keywords WHERE event_id = e.id
+      UNION
+      SELECT keyword_id FROM events_event_audience WHERE event_id = e.id
+    ),
+    e.audience_min_age, e.audience_max_age,
+    EXISTS (SELECT 1 FROM events_offer o WHERE o.event_id = e.id AND o.is_free)
+  FROM events_event e
+  WHERE e.id = ANY(event_ids)
+    AND e.publication_status = 1
+    AND NOT e.deleted;
+end
+$$ LANGUAGE plpgsql;
+"""
+
+# The trigger function takes the name of the event id column as its argument,
+# so that the same function serves the event table and the tables referring it.
+TRIGGER_FUNCTION_SQL = """
+CREATE FUNCTION events_upcomingevent_trigger_function() RETURNS trigger AS $$
+declare
+  old_id text;
+  new_id text;
+begin
+  IF TG_OP <> 'INSERT' THEN
+    old_id := to_jsonb(old) ->> TG_ARGV[0];
+  END IF;
+  IF TG_OP <> 'DELETE' THEN
+    new_id := to_jsonb(new) ->> TG_ARGV[0];
+  END IF;
+  IF old_id IS NOT NULL AND old_id IS DISTINCT FROM new_id THEN
+    PERFORM events_upcomingevent_sync(ARRAY[old_id]);
+  END IF;
+  IF new_id IS NOT NULL THEN
+    PERFORM events_upcomingevent_sync(ARRAY[new_id]);
+  END IF;
+  RETURN NULL;
+end
+$$ LANGUAGE plpgsql;
+"""
+
+EVENT_COLUMNS = (
+    "publication_status",
+    "deleted",
+    "start_time",
+    "end_time",
+    "event_status",
+    "type_id",
+    "location_id",
+    "publisher_id",
+    "audience_min_age",
+    "audience_max_age",
+)
+
+
+def trigger_sql(table, column, name="upcomingevent_trigger", events="", when=""):
+    return (
+        f"CREATE TRIGGER {table}_{name} "
+        f"AFTER {events or 'INSERT OR UPDATE OR DELETE'} ON {table} FOR EACH ROW "
+        f"{when}EXECUTE PROCEDURE events_upcomingevent_trigger_function('{column}');"
+    )
+
+
+def drop_trigger_sql(table, name="upcomingevent_trigger"):
+    return f"DROP TRIGGER {table}_{name} ON {table};"
+
+
+# Most event updates don't touch the listing columns, those are skipped.
+EVENT_UPDATE_WHEN = "WHEN (({old}) IS DISTINCT FROM ({new})) ".format(
+    old=", ".join(f"old.{column}" for column in EVENT_COLUMNS),
+    new=", ".join(f"new.{column}" for column in EVENT_COLUMNS),
+)
+
+RELATED_TABLES = (
+    "events_event_keywords",
+    "events_event_audience",
+    "events_offer",
+)
+
+# The horizon matches events.models.UPCOMING_EVENT_RETENTION and event status 3
+# is postponed.
+POPULATE_SQL = """
+SELECT events_upcomingevent_sync(ARRAY(
+  SELECT id FROM events_event
+  WHERE end_time IS NULL
+    OR end_time >= now() - interval '2 days'
+    OR start_time >= now() - interval '2 days'
+    OR event_status = 3
+));
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_orghierarchy", "0013_add_organization_indexes"),
+        ("events", "0112_event_search_text_place_search_text"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UpcomingEvent",
+            fields=[
+                (
+                    "event",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="upcoming",
+                        serialize=False,
+                        to="events.event",
+                    ),
+                ),
+                ("start_time", models.DateTimeField(db_index=True, null=True)),
+                ("end_time", models.DateTimeField(db_index=True, null=True)),
+                ("event_status", models.SmallIntegerField()),
+                ("type_id", models.PositiveSmallIntegerField()),
+                (
+                    "keyword_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=100),
+                        default=list,
+                        size=None,
+                    ),
+                ),
+                ("audience_min_age", models.PositiveSmallIntegerField(null=True)),
+                ("audience_max_age", models.PositiveSmallIntegerField(null=True)),
+                ("is_free", models.BooleanField(default=False)),
+                (
+                    "location",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="events.place",
+                    ),
+                ),
+                (
+                    "publisher",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="django_orghierarchy.organization",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["keyword_ids"], name="upcoming_keyword_ids_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            sql=[SYNC_FUNCTION_SQL, TRIGGER_FUNCTION_SQL],
+            reverse_sql=[
+                "DROP FUNCTION events_upcomingevent_trigger_function;",
+                "DROP FUNCTION events_upcomingevent_sync;",
+            ],
+        ),
+        migrations.RunSQL(
+            sql=[
+                trigger_sql("events_event", "id", events="INSERT OR DELETE"),
+                trigger_sql(
+                    "events_event",
+                    "id",
+                    name="upcomingevent_update_trigger",
+                    events="UPDATE",
+                    when=EVENT_UPDATE_WHEN,
+                ),
+                *(trigger_sql(table, "event_id") for table in RELATED_TABLES),
+            ],
+            reverse_sql=[
+                drop_trigger_sql("events_event"),
+                drop_trigger_sql("events_event", name="upcomingevent_update_trigger"),
+                *(drop_trigger_sql(table) for table in RELATED_TABLES),
+            ],
+        ),
+        migrations.RunSQL(
+            sql=POPULATE_SQL,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
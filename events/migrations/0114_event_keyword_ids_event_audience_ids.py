@@ -0,0 +1,64 @@
+# Generated by Django 5.2.15 on 2026-10-18 13:30
+"""This migration adds the keyword_ids and audience_ids arrays to events_event for
+the keyword filters, populates them from the through tables and indexes them.
+"""
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+POPULATE_SQL = """
+UPDATE events_event e SET
+  keyword_ids = ARRAY(
+    SELECT keyword_id FROM events_event_keywords
+    WHERE event_id = e.id ORDER BY keyword_id
+  ),
+  audience_ids = ARRAY(
+    SELECT keyword_id FROM events_event_audience
+    WHERE event_id = e.id ORDER BY keyword_id
+  )
+WHERE EXISTS (SELECT 1 FROM events_event_keywords WHERE event_id = e.id)
+  OR EXISTS (SELECT 1 FROM events_event_audience WHERE event_id = e.id);
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0113_upcomingevent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="keyword_ids",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(max_length=100),
+                default=list,
+                editable=False,
+                size=None,
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="audience_ids",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(max_length=100),
+                default=list,
+                editable=False,
+                size=None,
+            ),
+        ),
+        migrations.RunSQL(sql=POPULATE_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="event",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["keyword_ids"], name="event_keyword_ids_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["audience_ids"], name="event_audience_ids_idx"
+            ),
+        ),
+    ]
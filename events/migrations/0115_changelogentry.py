@@ -0,0 +1,56 @@
+# Generated by Django 5.2.15 on 2026-10-18 15:05
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0114_event_keyword_ids_event_audience_ids"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeLogEntry",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "resource_type",
+                    models.CharField(
+                        choices=[
+                            ("event", "event"),
+                            ("place", "place"),
+                            ("keyword", "keyword"),
+                            ("organization", "organization"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("resource_id", models.CharField(max_length=255)),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("updated", "Updated"),
+                            ("deleted", "Deleted"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "created_time",
+                    models.DateTimeField(
+                        db_default=django.db.models.functions.datetime.Now()
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["resource_type", "id"], name="changelog_type_id_idx"
+                    )
+                ],
+            },
+        ),
+    ]
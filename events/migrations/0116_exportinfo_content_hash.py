@@ -0,0 +1,17 @@
+# Generated by Django 5.2.15 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0115_changelogentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportinfo",
+            name="content_hash",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
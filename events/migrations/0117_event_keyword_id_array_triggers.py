@@ -0,0 +1,99 @@
+# Generated by Django 5.2.15 on 2026-10-18 19:10
+"""This migration moves maintaining the keyword_ids and audience_ids arrays of
+events_event to the database. Triggers on the keyword and audience through tables
+recompute the arrays of the affected events, which also covers the rows removed
+by keyword deletes, and ordinary event updates can't overwrite the arrays.
+"""
+
+from django.db import migrations
+
+# The arrays are only written while the events.keyword_ids_sync setting is on.
+SYNC_FUNCTION_SQL = """
+CREATE FUNCTION events_event_keyword_ids_sync(event_ids text[]) RETURNS void AS $$
+begin
+  PERFORM set_config('events.keyword_ids_sync', 'on', true);
+  UPDATE events_event e SET
+    keyword_ids = ARRAY(
+      SELECT keyword_id FROM events_event_keywords
+      WHERE event_id = e.id ORDER BY keyword_id
+    ),
+    audience_ids = ARRAY(
+      SELECT keyword_id FROM events_event_audience
+      WHERE event_id = e.id ORDER BY keyword_id
+    )
+  WHERE e.id = ANY(event_ids);
+  PERFORM set_config('events.keyword_ids_sync', 'off', true);
+end
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGER_FUNCTION_SQL = """
+CREATE FUNCTION events_event_keyword_ids_trigger_function() RETURNS trigger AS $$
+begin
+  IF TG_OP = 'INSERT' THEN
+    PERFORM events_event_keyword_ids_sync(ARRAY[new.event_id]);
+  ELSIF TG_OP = 'DELETE' THEN
+    PERFORM events_event_keyword_ids_sync(ARRAY[old.event_id]);
+  ELSE
+    PERFORM events_event_keyword_ids_sync(ARRAY[old.event_id, new.event_id]);
+  END IF;
+  RETURN NULL;
+end
+$$ LANGUAGE plpgsql;
+"""
+
+KEEP_FUNCTION_SQL = """
+CREATE FUNCTION events_event_keep_keyword_ids() RETURNS trigger AS $$
+begin
+  IF current_setting('events.keyword_ids_sync', true) IS DISTINCT FROM 'on' THEN
+    new.keyword_ids := old.keyword_ids;
+    new.audience_ids := old.audience_ids;
+  END IF;
+  RETURN new;
+end
+$$ LANGUAGE plpgsql;
+"""
+
+THROUGH_TABLES = ("events_event_keywords", "events_event_audience")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0116_exportinfo_content_hash"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[SYNC_FUNCTION_SQL, TRIGGER_FUNCTION_SQL, KEEP_FUNCTION_SQL],
+            reverse_sql=[
+                "DROP FUNCTION events_event_keep_keyword_ids;",
+                "DROP FUNCTION events_event_keyword_ids_trigger_function;",
+                "DROP FUNCTION events_event_keyword_ids_sync;",
+            ],
+        ),
+        migrations.RunSQL(
+            sql=[
+                *(
+                    f"CREATE TRIGGER {table}_keyword_ids_trigger "
+                    f"AFTER INSERT OR UPDATE OR DELETE ON {table} FOR EACH ROW "
+                    "EXECUTE PROCEDURE events_event_keyword_ids_trigger_function();"
+                    for table in THROUGH_TABLES
+                ),
+                "CREATE TRIGGER events_event_keep_keyword_ids_trigger "
+                "BEFORE UPDATE OF keyword_ids, audience_ids ON events_event "
+                "FOR EACH ROW EXECUTE PROCEDURE events_event_keep_keyword_ids();",
+            ],
+            reverse_sql=[
+                *(
+                    f"DROP TRIGGER {table}_keyword_ids_trigger ON {table};"
+                    for table in THROUGH_TABLES
+                ),
+                "DROP TRIGGER events_event_keep_keyword_ids_trigger ON events_event;",
+            ],
+        ),
+        # Repair the arrays that may have gone stale before the triggers
+        migrations.RunSQL(
+            sql="SELECT events_event_keyword_ids_sync(ARRAY(SELECT id FROM events_event));",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -18,6 +18,8 @@ attribute to change @context when need to define schemas for custom fields.
 """
 
 import logging
+from datetime import timedelta
+from functools import partial
 
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
@@ -31,6 +33,7 @@ from django.core.mail import send_mail
 from django.db import transaction
 from django.db.models import Q
 from django.db.models.base import ModelBase
+from django.db.models.functions import Now
 from django.db.models.signals import m2m_changed
 from django.dispatch import receiver
 from django.utils import timezone
@@ -44,8 +47,13 @@ from rest_framework.exceptions import ValidationError
 from reversion import revisions as reversion
 
 from events import translation_utils
+from events.counters import get_event_counter_session
+from events.sql import (
+    update_has_upcoming_events_for_keywords,
+    update_has_upcoming_events_for_places,
+)
 from events.translation_utils import TranslatableSerializableMixin
-from linkedevents.utils import get_fixed_lang_codes
+from linkedevents.utils import get_fixed_lang_codes, iter_pk_chunks
 from notifications.models import (
     NotificationTemplateError,
     NotificationType,
@@ -170,16 +178,20 @@ class BaseSerializableManager(TranslatableSerializableMixin.SerializableManager)
 
 class BaseTreeQuerySet(TreeQuerySet, BaseQuerySet):
     def soft_delete(self):
-        return self.filter(deleted=False).update(
-            deleted=True, last_modified_time=timezone.now()
+        queryset = self.filter(deleted=False)
+        ChangeLogEntry.objects.record(
+            self.model, queryset.values_list("pk", flat=True), ChangeAction.DELETED
         )
+        return queryset.update(deleted=True, last_modified_time=timezone.now())
 
     soft_delete.alters_data = True
 
     def undelete(self):
-        return self.filter(deleted=True).update(
-            deleted=False, last_modified_time=timezone.now()
+        queryset = self.filter(deleted=True)
+        ChangeLogEntry.objects.record(
+            self.model, queryset.values_list("pk", flat=True), ChangeAction.UPDATED
         )
+        return queryset.update(deleted=False, last_modified_time=timezone.now())
 
     undelete.alters_data = True
 
@@ -485,15 +497,25 @@ class KeywordLabel(TranslatableSerializableMixin):
 
 
 class UpcomingEventsUpdater(BaseSerializableManager):
+    chunk_size = 5000
+
     def has_upcoming_events_update(self):
         now = timezone.now()
         qs = self.model.objects.filter(n_events__gte=1)
         if self.model.__name__ == "Keyword":
             qs = qs.filter(deprecated=False)
+            update_func = update_has_upcoming_events_for_keywords
         elif self.model.__name__ == "Place":
             qs = qs.filter(deleted=False)
-        qs.filter(events__end_time__gte=now).update(has_upcoming_events=True)
-        qs.exclude(events__end_time__gte=now).update(has_upcoming_events=False)
+            update_func = update_has_upcoming_events_for_places
+        else:
+            raise ImproperlyConfigured(
+                f"has_upcoming_events is not supported for {self.model.__name__}"
+            )
+        # One aggregate UPDATE per id range, each in its own transaction
+        for chunk in iter_pk_chunks(qs, self.chunk_size):
+            with transaction.atomic():
+                update_func(chunk, now)
 
 
 class Keyword(BaseModel, ImageMixin, ReplacedByMixin, TranslatableSerializableMixin):
@@ -650,6 +672,23 @@ class Keyword(BaseModel, ImageMixin, ReplacedByMixin, TranslatableSerializableMi
                 fields=["data_source_id", "n_events"],
                 name="data_source_id_n_events_idx",
             ),
+            # Trigram indexes for the keyword similarity search of the
+            # combined_text event filter
+            GinIndex(
+                name="keyword_name_fi_trgm_idx",
+                fields=["name_fi"],
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                name="keyword_name_sv_trgm_idx",
+                fields=["name_sv"],
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                name="keyword_name_en_trgm_idx",
+                fields=["name_en"],
+                opclasses=["gin_trgm_ops"],
+            ),
         ]
 
 
@@ -788,6 +827,10 @@ class Place(
     )
     n_events_changed = models.BooleanField(default=False, db_index=True)
 
+    # lowercased translated fields for the text search of events, populated and
+    # kept up to date by the db. See migration 0112
+    search_text = models.TextField(null=True, editable=False)
+
     class Meta:
         verbose_name = _("place")
         verbose_name_plural = _("places")
@@ -797,6 +840,11 @@ class Place(
                 fields=["n_events", "data_source_id"],
                 name="n_events_data_source_id_idx",
             ),
+            GinIndex(
+                name="place_search_text_trgm_idx",
+                fields=["search_text"],
+                opclasses=["gin_trgm_ops"],
+            ),
         ]
 
     def __str__(self):
@@ -835,13 +883,17 @@ class Place(
 
         # needed to remap events to replaced location
         if not old_replaced_by == self.replaced_by:
-            Event.objects.filter(location=self).update(location=self.replaced_by)
+            events = Event.objects.filter(location=self)
+            ChangeLogEntry.objects.record(
+                Event, events.values_list("pk", flat=True), ChangeAction.UPDATED
+            )
+            events.update(location=self.replaced_by)
             # Update doesn't call save so we update event numbers manually.
             # Not all of the below are necessarily present.
             ids_to_update = [
                 event.id for event in (self, self.replaced_by, old_replaced_by) if event
             ]
-            Place.objects.filter(id__in=ids_to_update).update(n_events_changed=True)
+            flag_places_n_events_changed(ids_to_update)
 
         if self.position:
             self.divisions.set(
@@ -1176,6 +1228,19 @@ class Event(
     search_vector_en = SearchVectorField(null=True)
     search_vector_sv = SearchVectorField(null=True)
 
+    # lowercased translated fields for the text and combined_text filters,
+    # populated and kept up to date by the db. See migration 0112
+    search_text = models.TextField(null=True, editable=False)
+
+    # ids of the keywords and audience for the keyword filters, populated and
+    # kept up to date by the db. See migration 0117
+    keyword_ids = ArrayField(
+        models.CharField(max_length=100), default=list, editable=False
+    )
+    audience_ids = ArrayField(
+        models.CharField(max_length=100), default=list, editable=False
+    )
+
     class Meta:
         verbose_name = _("event")
         verbose_name_plural = _("events")
@@ -1193,6 +1258,13 @@ class Event(
                     deleted=False, publication_status=PublicationStatus.PUBLIC
                 ),
             ),
+            GinIndex(
+                name="event_search_text_trgm_idx",
+                fields=["search_text"],
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(name="event_keyword_ids_idx", fields=["keyword_ids"]),
+            GinIndex(name="event_audience_ids_idx", fields=["audience_ids"]),
         ]
 
     class MPTTMeta:
@@ -1272,14 +1344,12 @@ class Event(
 
         # needed to cache location event numbers
         if not old_location and self.location:
-            Place.objects.filter(id=self.location.id).update(n_events_changed=True)
+            flag_places_n_events_changed((self.location.id,))
         if old_location and not self.location:
             # drafts (or imported events) may not always have location set
-            Place.objects.filter(id=old_location.id).update(n_events_changed=True)
+            flag_places_n_events_changed((old_location.id,))
         if old_location and self.location and old_location != self.location:
-            Place.objects.filter(id__in=(old_location.id, self.location.id)).update(
-                n_events_changed=True
-            )
+            flag_places_n_events_changed((old_location.id, self.location.id))
 
         # send notifications
         if (
@@ -1588,6 +1658,13 @@ def keyword_added_or_removed(
     Listens to event-keyword add signals to keep event number up to date
     """
     if action in ("post_add", "post_remove"):
+        if session := get_event_counter_session():
+            # Counters are recomputed when the session ends.
+            if model is Keyword:
+                session.keyword_ids.update(pk_set)
+            if model is Event:
+                session.keyword_ids.add(instance.pk)
+            return
         if model is Keyword:
             Keyword.objects.filter(pk__in=pk_set).update(n_events_changed=True)
         if model is Event:
@@ -1597,6 +1674,17 @@ def keyword_added_or_removed(
             )
 
 
+def flag_places_n_events_changed(place_ids):
+    """
+    Mark the given places as having a changed event count, or collect them in
+    the active event counter session.
+    """
+    if session := get_event_counter_session():
+        session.place_ids.update(place_ids)
+    else:
+        Place.objects.filter(id__in=place_ids).update(n_events_changed=True)
+
+
 class Offer(SimpleValueMixin, TranslatableSerializableMixin):
     serialize_fields = [{"name": "price"}, {"name": "description"}]
 
@@ -1671,6 +1759,8 @@ class ExportInfo(models.Model):
         max_length=255, db_index=True, null=True, blank=True
     )
     last_exported_time = models.DateTimeField(null=True, blank=True)
+    # Hash of the exported content for skipping unchanged objects
+    content_hash = models.CharField(max_length=64, null=True, blank=True)
 
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.CharField(max_length=50)
@@ -1713,3 +1803,148 @@ class Feedback(models.Model):
         )
 
         super().save(*args, **kwargs)
+
+
+class ImportedContentHash(models.Model):
+    """
+    Hash of the source data an importer last saved an object from. Importers use
+    it to skip unchanged source objects before doing any ORM work.
+    """
+
+    data_source = models.ForeignKey(DataSource, on_delete=models.CASCADE)
+    origin_id = models.CharField(max_length=100)
+    content_hash = models.CharField(max_length=64)
+    last_modified_time = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (("data_source", "origin_id"),)
+
+
+# How long ended events are kept in the upcoming event table
+UPCOMING_EVENT_RETENTION = timedelta(days=2)
+
+
+class UpcomingEventManager(models.Manager):
+    def prune(self, now=None):
+        """Remove the events that ended more than UPCOMING_EVENT_RETENTION ago."""
+        horizon = (now or timezone.now()) - UPCOMING_EVENT_RETENTION
+        count, __ = (
+            self.get_queryset()
+            .exclude(
+                Q(end_time__isnull=True)
+                | Q(end_time__gte=horizon)
+                | Q(start_time__gte=horizon)
+                | Q(event_status=Event.Status.POSTPONED)
+            )
+            .delete()
+        )
+        return count
+
+
+class UpcomingEvent(models.Model):
+    """
+    Narrow copy of the columns the event list is usually filtered by, for the
+    public, non-deleted events that have not ended before
+    UPCOMING_EVENT_RETENTION ago.
+
+    The rows are kept up to date by database triggers on the event, keyword,
+    audience and offer tables, see migration 0113. The triggers don't look at
+    the event times, the rows of events that have ended are removed by
+    UpcomingEvent.objects.prune().
+    """
+
+    event = models.OneToOneField(
+        Event,
+        related_name="upcoming",
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+    start_time = models.DateTimeField(null=True, db_index=True)
+    end_time = models.DateTimeField(null=True, db_index=True)
+    event_status = models.SmallIntegerField()
+    type_id = models.PositiveSmallIntegerField()
+    location = models.ForeignKey(
+        Place,
+        related_name="+",
+        null=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+    )
+    publisher = models.ForeignKey(
+        "django_orghierarchy.Organization",
+        related_name="+",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+    )
+    # ids of both the keywords and the audience of the event
+    keyword_ids = ArrayField(models.CharField(max_length=100), default=list)
+    audience_min_age = models.PositiveSmallIntegerField(null=True)
+    audience_max_age = models.PositiveSmallIntegerField(null=True)
+    is_free = models.BooleanField(default=False)
+
+    objects = UpcomingEventManager()
+
+    class Meta:
+        indexes = (GinIndex(fields=["keyword_ids"], name="upcoming_keyword_ids_idx"),)
+
+
+class ChangeAction(models.TextChoices):
+    CREATED = "created", _("Created")
+    UPDATED = "updated", _("Updated")
+    DELETED = "deleted", _("Deleted")
+
+
+# Resource types of the change log by model label
+CHANGE_LOG_RESOURCE_TYPES = {
+    "events.Event": "event",
+    "events.Place": "place",
+    "events.Keyword": "keyword",
+    "django_orghierarchy.Organization": "organization",
+}
+
+
+class ChangeLogEntryManager(models.Manager):
+    def record(self, model, ids, action):
+        """
+        Record changes of the objects with the given ids once the current
+        transaction commits, so that rolled back changes are never recorded and
+        the entries of a transaction get consecutive sequence numbers.
+        """
+        resource_type = CHANGE_LOG_RESOURCE_TYPES.get(model._meta.label)
+        if resource_type is None:
+            return
+
+        entries = [
+            self.model(resource_type=resource_type, resource_id=pk, action=action)
+            for pk in ids
+        ]
+        if entries:
+            transaction.on_commit(partial(self.bulk_create, entries))
+
+
+class ChangeLogEntry(models.Model):
+    """
+    Append-only log of the changes of events, places, keywords and
+    organizations, served as a feed where the id is the sequence number.
+
+    Changes made with QuerySet.update() bypass the log, except for the
+    soft_delete() and undelete() queryset methods.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    resource_type = models.CharField(
+        max_length=16,
+        choices=[(value, value) for value in CHANGE_LOG_RESOURCE_TYPES.values()],
+    )
+    resource_id = models.CharField(max_length=255)
+    action = models.CharField(max_length=16, choices=ChangeAction.choices)
+    # Database time, so that the feed delay doesn't depend on the app server
+    # clocks
+    created_time = models.DateTimeField(db_default=Now())
+
+    objects = ChangeLogEntryManager()
+
+    class Meta:
+        indexes = (
+            models.Index(fields=["resource_type", "id"], name="changelog_type_id_idx"),
+        )
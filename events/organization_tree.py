@@ -0,0 +1,147 @@
+import logging
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import NamedTuple
+
+from django_orghierarchy.models import Organization
+
+from linkedevents.utils import bump_cache_version, get_snapshot_version
+
+logger = logging.getLogger(__name__)
+
+ORGANIZATION_TREE_VERSION_KEY = "organization_tree_version"
+
+
+class OrganizationNode(NamedTuple):
+    id: str
+    parent_id: str | None
+    tree_id: int
+    lft: int
+    rght: int
+    replaced_by_id: str | None
+    internal_type: str
+
+
+class OrganizationTree:
+    """
+    An in-memory snapshot of the organization forest.
+
+    Ancestor and descendant lookups are answered from the MPTT intervals of the
+    snapshot without database queries, and descendant id lists are memoized
+    per organization.
+    """
+
+    def __init__(self, nodes, version=None):
+        self.version = version
+        self.nodes = {node.id: node for node in nodes}
+        self._trees = defaultdict(list)
+        for node in sorted(self.nodes.values(), key=lambda n: (n.tree_id, n.lft)):
+            self._trees[node.tree_id].append(node)
+        self._tree_lfts = {
+            tree_id: [node.lft for node in tree_nodes]
+            for tree_id, tree_nodes in self._trees.items()
+        }
+        self._descendant_ids = {}
+
+    @classmethod
+    def load(cls, version=None) -> "OrganizationTree":
+        nodes = [
+            OrganizationNode(*row)
+            for row in Organization.objects.values_list(*OrganizationNode._fields)
+        ]
+        return cls(nodes, version=version)
+
+    def __contains__(self, organization_id):
+        return organization_id in self.nodes
+
+    def get_descendant_ids(self, organization_id, include_self=True) -> list[str]:
+        """Return the ids of the descendants of an organization in tree order."""
+        node = self.nodes.get(organization_id)
+        if node is None:
+            return []
+
+        if organization_id not in self._descendant_ids:
+            tree_nodes = self._trees[node.tree_id]
+            lfts = self._tree_lfts[node.tree_id]
+            start = bisect_left(lfts, node.lft)
+            end = bisect_right(lfts, node.rght)
+            self._descendant_ids[organization_id] = tuple(
+                descendant.id for descendant in tree_nodes[start:end]
+            )
+
+        descendant_ids = self._descendant_ids[organization_id]
+        return list(descendant_ids if include_self else descendant_ids[1:])
+
+    def get_ancestor_ids(self, organization_id, include_self=False) -> list[str]:
+        """Return the ids of the ancestors of an organization, root first."""
+        node = self.nodes.get(organization_id)
+        if node is None:
+            return []
+
+        ancestor_ids = [node.id] if include_self else []
+        while node.parent_id is not None and node.parent_id in self.nodes:
+            node = self.nodes[node.parent_id]
+            ancestor_ids.append(node.id)
+        ancestor_ids.reverse()
+        return ancestor_ids
+
+    def get_descendant_ids_of_many(
+        self, organization_ids, include_replacements=False
+    ) -> list[str]:
+        """
+        Return the ids of the given organizations and all their descendants.
+
+        With include_replacements, the organizations replacing the given ones
+        and their descendants are included, too.
+        """
+        organization_ids = set(organization_ids)
+        if include_replacements:
+            organization_ids |= {
+                self.nodes[org_id].replaced_by_id
+                for org_id in organization_ids
+                if org_id in self.nodes and self.nodes[org_id].replaced_by_id
+            }
+
+        result = {}
+        for org_id in organization_ids:
+            result.update(dict.fromkeys(self.get_descendant_ids(org_id)))
+        return list(result)
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_organization_tree() -> OrganizationTree:
+    """
+    Return the organization tree snapshot of this process.
+
+    The snapshot is reloaded when the version stored in the shared cache
+    differs from the version of the snapshot, i.e. after an organization has
+    been saved or deleted in any process. Without a shared cache, the snapshot
+    is reloaded every LOCAL_SNAPSHOT_TIMEOUT seconds instead.
+    """
+    global _snapshot
+
+    version = get_snapshot_version(ORGANIZATION_TREE_VERSION_KEY)
+    snapshot = _snapshot
+    if snapshot is None or version is None or snapshot.version != version:
+        with _snapshot_lock:
+            snapshot = _snapshot
+            if snapshot is None or version is None or snapshot.version != version:
+                snapshot = OrganizationTree.load(version=version)
+                if version is not None:
+                    _snapshot = snapshot
+                logger.debug(
+                    f"Loaded organization tree with {len(snapshot.nodes)} organizations"
+                )
+    return snapshot
+
+
+def invalidate_organization_tree():
+    """Make all processes reload the organization tree on next access."""
+    global _snapshot
+
+    _snapshot = None
+    bump_cache_version(ORGANIZATION_TREE_VERSION_KEY)
@@ -164,6 +164,56 @@ def group_by_date(events):
     return dates
 
 
+def add_event(document, event):
+    """Add a parsed event's heading and paragraphs to the document."""
+    start_time = event["start_time"]
+    end_time = event["end_time"]
+
+    # This is here to prevent 00:00-00:00 from being shown.
+    if start_time.time() == end_time.time() == datetime.time(0, 0):
+        document.add_heading(event["name"], 2)
+    else:
+        document.add_heading(
+            (
+                f"{start_time.strftime('%H:%M')}-"
+                f"{end_time.strftime('%H:%M')} {event['name']}"
+            ),
+            2,
+        )
+
+    document.add_paragraph(event["description"])
+    if event["price"]:
+        document.add_paragraph(event["price"])
+
+
+def get_document_dates(query_params, earliest_date, latest_date):
+    # We need to get the daterange for the entire document, which is
+    # determined by either the query or the actual events.
+    start = query_params.get("start")
+    end = query_params.get("end")
+
+    if start is None:
+        start_date = earliest_date
+    else:
+        start_date = utils.parse_time(start)[0]
+
+    if end is None:
+        end_date = latest_date
+    else:
+        end_date = utils.parse_end_time(end)[0]
+
+    return start_date, end_date
+
+
+def get_filename(location, start_date, end_date):
+    location_name = location.name if location else "no-location"
+    return (
+        f"{slugify(location_name)}-"
+        f"{start_date.strftime('%Y%m%d')}-"
+        f"{end_date.strftime('%Y%m%d')}.docx"
+    )
+
+
 class DOCXRenderer(renderers.BaseRenderer):
     media_type = (
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
@@ -200,24 +250,12 @@ class DOCXRenderer(renderers.BaseRenderer):
         for location in locations:
             locations[location] = group_by_date(locations[location])
 
-        # We need to get the daterange for the entire document, which is
-        # determined by either the query or the actual events.
-        start = query_params.get("start")
-        end = query_params.get("end")
-
-        if start is None:
-            query_start_date = event_parser.earliest_date
-        else:
-            query_start_date = utils.parse_time(start)[0]
-
-        if end is None:
-            query_end_date = event_parser.latest_date
-        else:
-            query_end_date = utils.parse_end_time(end)[0]
+        query_start_date, query_end_date = get_document_dates(
+            query_params, event_parser.earliest_date, event_parser.latest_date
+        )
 
         total_date_range = DateRange(query_start_date, query_end_date)
 
-        midnight = datetime.time(0, 0)
         for location, dateranges in locations.items():
             document.add_heading(str(location), 0)
             document.add_paragraph(str(total_date_range))
@@ -226,31 +264,9 @@ class DOCXRenderer(renderers.BaseRenderer):
                 document.add_heading(str(daterange), 1)
 
                 for event in events:
-                    # This is here to prevent 00:00-00:00 from being shown.
-                    start_time = event["start_time"]
-                    end_time = event["end_time"]
-
-                    if start_time.time() == end_time.time() == midnight:
-                        document.add_heading(event["name"], 2)
-                    else:
-                        document.add_heading(
-                            (
-                                f"{event['start_time'].strftime('%H:%M')}-"
-                                f"{event['end_time'].strftime('%H:%M')} {event['name']}"
-                            ),
-                            2,
-                        )
-
-                    document.add_paragraph(event["description"])
-                    if event["price"]:
-                        document.add_paragraph(event["price"])
-
-        location_name = first_location.name if first_location else "no-location"
-        filename = (
-            f"{slugify(location_name)}-"
-            f"{query_start_date.strftime('%Y%m%d')}-"
-            f"{query_end_date.strftime('%Y%m%d')}.docx"
-        )
+                    add_event(document, event)
+
+        filename = get_filename(first_location, query_start_date, query_end_date)
 
         renderer_context["response"]["Content-Disposition"] = (
             f"attachment; filename={filename}"
@@ -45,6 +45,7 @@ from events.fields import (
 )
 from events.models import (
     PUBLICATION_STATUSES,
+    ChangeLogEntry,
     DataSource,
     Event,
     EventLink,
@@ -199,6 +200,14 @@ class EventLinkSerializer(serializers.ModelSerializer):
         exclude = ["id", "event"]
 
 
+class ChangeLogEntrySerializer(serializers.ModelSerializer):
+    sequence = serializers.IntegerField(source="id", read_only=True)
+
+    class Meta:
+        model = ChangeLogEntry
+        fields = ("sequence", "resource_type", "resource_id", "action", "created_time")
+
+
 class FeedbackSerializer(serializers.ModelSerializer):
     class Meta:
         model = Feedback
@@ -673,7 +682,7 @@ class PlaceSerializer(EditableLinkedEventsObjectSerializer, GeoModelSerializer):
 
     class Meta:
         model = Place
-        exclude = ("n_events_changed",)
+        exclude = ("n_events_changed", "search_text")
 
 
 class OrganizationDetailSerializer(OrganizationListSerializer):
@@ -1133,6 +1142,9 @@ class EventSerializer(BulkSerializerMixin, EditableLinkedEventsObjectSerializer)
             "search_vector_en",
             "search_vector_fi",
             "search_vector_sv",
+            "search_text",
+            "keyword_ids",
+            "audience_ids",
         )
         list_serializer_class = BulkListSerializer
 
@@ -1,7 +1,18 @@
 import logging
 
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
+from django_orghierarchy.models import Organization
+
+from events.conditional_get import invalidate_conditional_get_validators
+from events.division_index import (
+    invalidate_division_index,
+    invalidate_division_places,
+)
+from events.models import ChangeAction, ChangeLogEntry, Event, PublicationStatus
+from events.organization_tree import invalidate_organization_tree
+from helevents.permission_resolver import clear_organization_permission_cache
 
 logger = logging.getLogger(__name__)
 
@@ -22,3 +33,158 @@ def organization_replaced(sender, instance, created, **kwargs):
 
         # update owned systems to new owner
         instance.owned_systems.update(owner=new_org)
+
+
+@receiver(
+    [post_save, post_delete],
+    sender="django_orghierarchy.Organization",
+    dispatch_uid="organization_changed_clear_permissions",
+)
+@receiver(m2m_changed, dispatch_uid="organization_users_changed_clear_permissions")
+def clear_permissions_on_organization_change(sender, instance, model=None, **kwargs):
+    """
+    Forget the permission resolvers of the current request when organizations
+    or their users change, so later checks in the request see the change.
+    """
+    if model is None or model is Organization or isinstance(instance, Organization):
+        clear_organization_permission_cache()
+
+
+@receiver(
+    [post_save, post_delete],
+    sender="django_orghierarchy.Organization",
+    dispatch_uid="organization_changed_invalidate_tree",
+)
+def invalidate_tree_on_organization_change(sender, instance, **kwargs):
+    """
+    Make the organization tree snapshots reload. The snapshots are invalidated
+    again on commit so that no process keeps a snapshot loaded before the
+    change became visible.
+    """
+    invalidate_organization_tree()
+    transaction.on_commit(invalidate_organization_tree)
+
+
+@receiver(
+    [post_save, post_delete],
+    sender="munigeo.AdministrativeDivision",
+    dispatch_uid="division_changed_invalidate_index",
+)
+@receiver(
+    [post_save, post_delete],
+    sender="munigeo.AdministrativeDivisionTranslation",
+    dispatch_uid="division_translation_changed_invalidate_index",
+)
+def invalidate_division_index_on_division_change(sender, instance, **kwargs):
+    """
+    Make the division indexes reload after divisions have been imported or
+    changed.
+    """
+    invalidate_division_index()
+    transaction.on_commit(invalidate_division_index)
+
+
+@receiver(
+    m2m_changed,
+    sender="events.Place_divisions",
+    dispatch_uid="place_divisions_changed_invalidate_places",
+)
+def invalidate_division_places_on_place_change(
+    sender, instance, action, pk_set=None, **kwargs
+):
+    """Make the cached place ids of divisions reload when place divisions change."""
+    if action == "post_clear" or (action in ("post_add", "post_remove") and pk_set):
+        invalidate_division_places()
+        transaction.on_commit(invalidate_division_places)
+
+
+def _get_change_action(instance, created):
+    if getattr(instance, "deleted", False):
+        return ChangeAction.DELETED
+    if (
+        isinstance(instance, Event)
+        and instance.publication_status != PublicationStatus.PUBLIC
+    ):
+        # Drafts are not public, an event turned back into a draft is gone
+        # from the consumers' point of view
+        return None if created else ChangeAction.DELETED
+    return ChangeAction.CREATED if created else ChangeAction.UPDATED
+
+
+@receiver(post_save, sender="events.Event", dispatch_uid="event_saved_log_change")
+@receiver(post_save, sender="events.Place", dispatch_uid="place_saved_log_change")
+@receiver(post_save, sender="events.Keyword", dispatch_uid="keyword_saved_log_change")
+@receiver(
+    post_save,
+    sender="django_orghierarchy.Organization",
+    dispatch_uid="organization_saved_log_change",
+)
+def log_change_on_save(sender, instance, created, raw=False, **kwargs):
+    action = _get_change_action(instance, created)
+    if action and not raw:
+        ChangeLogEntry.objects.record(sender, [instance.pk], action)
+
+
+@receiver(post_delete, sender="events.Event", dispatch_uid="event_deleted_log_change")
+@receiver(post_delete, sender="events.Place", dispatch_uid="place_deleted_log_change")
+@receiver(
+    post_delete, sender="events.Keyword", dispatch_uid="keyword_deleted_log_change"
+)
+@receiver(
+    post_delete,
+    sender="django_orghierarchy.Organization",
+    dispatch_uid="organization_deleted_log_change",
+)
+def log_change_on_delete(sender, instance, **kwargs):
+    ChangeLogEntry.objects.record(sender, [instance.pk], ChangeAction.DELETED)
+
+
+@receiver(
+    [post_save, post_delete],
+    sender="events.Image",
+    dispatch_uid="image_changed_invalidate_validators",
+)
+@receiver(
+    [post_save, post_delete],
+    sender="events.Place",
+    dispatch_uid="place_changed_invalidate_validators",
+)
+@receiver(
+    [post_save, post_delete],
+    sender="events.Keyword",
+    dispatch_uid="keyword_changed_invalidate_validators",
+)
+@receiver(
+    [post_save, post_delete],
+    sender="events.Language",
+    dispatch_uid="language_changed_invalidate_validators",
+)
+@receiver(
+    [post_save, post_delete],
+    sender="django_orghierarchy.Organization",
+    dispatch_uid="organization_changed_invalidate_validators",
+)
+@receiver(
+    [post_save, post_delete],
+    sender="registrations.Registration",
+    dispatch_uid="registration_changed_invalidate_validators",
+)
+def invalidate_validators_on_embedded_change(sender, instance, **kwargs):
+    """
+    Change the conditional GET validators when objects that are embedded or
+    linked in other objects' responses change.
+    """
+    invalidate_conditional_get_validators()
+    transaction.on_commit(invalidate_conditional_get_validators)
+
+
+@receiver(
+    [post_save, post_delete],
+    sender="events.Event",
+    dispatch_uid="event_changed_invalidate_validators",
+)
+def invalidate_validators_on_sub_event_change(sender, instance, **kwargs):
+    """The sub events of an event are listed in its response."""
+    if instance.super_event_id:
+        invalidate_conditional_get_validators()
+        transaction.on_commit(invalidate_conditional_get_validators)
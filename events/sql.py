@@ -84,3 +84,165 @@ def count_events_for_places(place_ids=(), all=False):
         else:
             return {}
         return dict(cursor.fetchall())
+
+
+def update_n_events_for_keywords(keyword_ids):
+    """
+    Recompute the event count of the given keywords in a single statement and
+    clear their n_events_changed flag.
+
+    :param keyword_ids: set of keyword ids
+    :type keyword_ids: Iterable[str]
+    :return: number of keywords updated
+    :rtype: int
+    """
+    keyword_ids = list(set(keyword_ids))
+    if not keyword_ids:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+        UPDATE events_keyword k
+        SET n_events = c.n_events, n_events_changed = false
+        FROM (
+          SELECT ids.id AS keyword_id, COUNT(DISTINCT t.event_id) AS n_events
+          FROM unnest(%s::text[]) AS ids(id)
+          LEFT JOIN (
+            SELECT keyword_id, event_id FROM events_event_keywords WHERE keyword_id = ANY(%s)
+            UNION
+            SELECT keyword_id, event_id FROM events_event_audience WHERE keyword_id = ANY(%s)
+          ) t ON t.keyword_id = ids.id
+          GROUP BY ids.id
+        ) c
+        WHERE k.id = c.keyword_id;
+        """,  # noqa: E501
+            [keyword_ids, keyword_ids, keyword_ids],
+        )
+        return cursor.rowcount
+
+
+def update_n_events_for_places(place_ids):
+    """
+    Recompute the event count of the given places in a single statement and
+    clear their n_events_changed flag.
+
+    :param place_ids: set of place ids
+    :type place_ids: Iterable[str]
+    :return: number of places updated
+    :rtype: int
+    """
+    place_ids = list(set(place_ids))
+    if not place_ids:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+        UPDATE events_place p
+        SET n_events = c.n_events, n_events_changed = false
+        FROM (
+          SELECT ids.id AS location_id, COUNT(e.id) AS n_events
+          FROM unnest(%s::text[]) AS ids(id)
+          LEFT JOIN events_event e ON e.location_id = ids.id
+          GROUP BY ids.id
+        ) c
+        WHERE p.id = c.location_id;
+        """,
+            [place_ids],
+        )
+        return cursor.rowcount
+
+
+def update_has_upcoming_events_for_keywords(keyword_ids, now):
+    """
+    Recompute has_upcoming_events of the given keywords in a single statement.
+    Like Keyword.objects.has_upcoming_events_update, only keywords that have
+    events and are not deprecated are updated.
+
+    :param keyword_ids: set of keyword ids
+    :type keyword_ids: Iterable[str]
+    :param now: events ending before this are not upcoming
+    :type now: datetime
+    :return: number of keywords updated
+    :rtype: int
+    """
+    keyword_ids = list(set(keyword_ids))
+    if not keyword_ids:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+        UPDATE events_keyword k
+        SET has_upcoming_events = u.has_upcoming_events
+        FROM (
+          SELECT ids.id AS keyword_id,
+                 COALESCE(bool_or(e.end_time >= %s), false) AS has_upcoming_events
+          FROM unnest(%s::text[]) AS ids(id)
+          LEFT JOIN events_event_keywords ek ON ek.keyword_id = ids.id
+          LEFT JOIN events_event e ON e.id = ek.event_id
+          GROUP BY ids.id
+        ) u
+        WHERE k.id = u.keyword_id AND k.n_events >= 1 AND NOT k.deprecated;
+        """,
+            [now, keyword_ids],
+        )
+        return cursor.rowcount
+
+
+def update_has_upcoming_events_for_places(place_ids, now):
+    """
+    Recompute has_upcoming_events of the given places in a single statement.
+    Like Place.upcoming_events.has_upcoming_events_update, only places that
+    have events and are not deleted are updated.
+
+    :param place_ids: set of place ids
+    :type place_ids: Iterable[str]
+    :param now: events ending before this are not upcoming
+    :type now: datetime
+    :return: number of places updated
+    :rtype: int
+    """
+    place_ids = list(set(place_ids))
+    if not place_ids:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+        UPDATE events_place p
+        SET has_upcoming_events = u.has_upcoming_events
+        FROM (
+          SELECT ids.id AS location_id,
+                 COALESCE(bool_or(e.end_time >= %s), false) AS has_upcoming_events
+          FROM unnest(%s::text[]) AS ids(id)
+          LEFT JOIN events_event e ON e.location_id = ids.id
+          GROUP BY ids.id
+        ) u
+        WHERE p.id = u.location_id AND p.n_events >= 1 AND NOT p.deleted;
+        """,
+            [now, place_ids],
+        )
+        return cursor.rowcount
+
+
+def flag_n_events_changed(keyword_ids=(), place_ids=()):
+    """
+    Set n_events_changed for the given keywords and places so that the
+    update_n_events command picks them up.
+
+    :param keyword_ids: set of keyword ids
+    :type keyword_ids: Iterable[str]
+    :param place_ids: set of place ids
+    :type place_ids: Iterable[str]
+    """
+    keyword_ids = list(set(keyword_ids))
+    place_ids = list(set(place_ids))
+    with connection.cursor() as cursor:
+        if keyword_ids:
+            cursor.execute(
+                "UPDATE events_keyword SET n_events_changed = true WHERE id = ANY(%s);",
+                [keyword_ids],
+            )
+        if place_ids:
+            cursor.execute(
+                "UPDATE events_place SET n_events_changed = true WHERE id = ANY(%s);",
+                [place_ids],
+            )
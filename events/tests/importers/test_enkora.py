@@ -8,7 +8,8 @@ from django.core import serializers
 from django.utils import timezone
 
 from events.importer.enkora import EnkoraImporter
-from events.models import Event
+from events.models import Event, ImportedContentHash
+from events.tests.factories import EventFactory
 
 
 class TestEnkoraImporter:
@@ -2628,3 +2629,104 @@ class TestEnkoraImporter:
             EnkoraImporter.infer_event_language(test_input_tags)
             == expected_event_language
         )
+
+    @staticmethod
+    def _course_response(course_id: int, capacity: int) -> dict:
+        course = {
+            "reservation_event_group_id": str(course_id),
+            "reservation_event_group_name": "EASYSPORT TENNIS",
+            "created_timestamp": "2023-03-14 12:16:37",
+            "created_user_id": "322433",
+            "reservation_group_name": "Tennis",
+            "description": "Tenniskurssi",
+            "description_long": None,
+            "description_form": None,
+            "season_id": "37",
+            "season_name": "Kesä 2023",
+            "public_reservation_start": "2023-04-12 16:00:00",
+            "public_reservation_end": "2023-06-16 00:00:00",
+            "public_visibility_start": "2023-03-27 00:00:00",
+            "public_visibility_end": "2023-06-16 00:00:00",
+            "instructor_visibility_start": None,
+            "instructor_visibility_end": None,
+            "is_course": "1",
+            "reservation_event_count": "1",
+            "first_event_date": "2023-06-05 10:00:00",
+            "last_event_date": "2023-06-05 10:00:00",
+            "capacity": str(capacity),
+            "queue_capacity": "5",
+            "service_id": "99",
+            "service_name": "Ryhmäliikunta",
+            "service_at_area_id": "1137",
+            "service_at_area_name": "Ryhmäliikunta at Latokartanon liikuntapuisto",
+            "location_id": "62",
+            "location_name": "Latokartanon liikuntapuisto",
+            "region_id": "2",
+            "region_name": "Pohjoinen",
+            "reserved_count": "5",
+            "queue_count": "",
+            "reservation_events": [
+                {
+                    "reservation_event_id": "2471108",
+                    "reservation_event_name": "EASYSPORT TENNIS",
+                    "time_start": "2023-06-05 10:00:00",
+                    "time_end": "2023-06-05 11:00:00",
+                    "instructors": [],
+                    "quantity_attended": "0",
+                }
+            ],
+        }
+        return {"errors": [], "result": {"courses": [course]}}
+
+    @pytest.mark.django_db
+    @patch("events.importer.enkora.EnkoraImporter.save_event")
+    @patch("events.importer.enkora.EnkoraImporter._handle_course")
+    @patch("events.importer.enkora.Enkora._request_json")
+    @patch("events.importer.enkora.EnkoraImporter._get_timestamps")
+    def test_importing_skips_unchanged_courses(
+        self, mock_get_timestamps, mock_request, mock_handle_course, mock_save_event
+    ):
+        importer = EnkoraImporter({"single": False})
+        event = EventFactory(
+            id="enkora:50148",
+            origin_id="50148",
+            data_source=importer.data_source,
+            publisher=importer.organization,
+            start_time=timezone.now(),
+            end_time=timezone.now(),
+        )
+        mock_get_timestamps.return_value = (
+            datetime(2023, 6, 1, 13, 58, 20, 691641),
+            timezone.now(),
+        )
+        mock_handle_course.return_value = ({}, [])
+        mock_save_event.return_value = event
+
+        mock_request.return_value = self._course_response(50148, capacity=8)
+        importer.import_courses()
+        assert mock_handle_course.call_count == 1
+        content_hash = ImportedContentHash.objects.get(
+            data_source=importer.data_source, origin_id="50148"
+        ).content_hash
+
+        # Unchanged course is skipped and its event isn't deleted
+        importer.import_courses()
+        assert mock_handle_course.call_count == 1
+        event.refresh_from_db()
+        assert event.deleted is False
+
+        # Changed course is synchronized again
+        mock_request.return_value = self._course_response(50148, capacity=10)
+        importer.import_courses()
+        assert mock_handle_course.call_count == 2
+        assert (
+            ImportedContentHash.objects.get(
+                data_source=importer.data_source, origin_id="50148"
+            ).content_hash
+            != content_hash
+        )
+
+        # Full sync processes unchanged courses too
+        importer.options["full"] = True
+        importer.import_courses()
+        assert mock_handle_course.call_count == 3
@@ -0,0 +1,85 @@
+import pytest
+
+from events.importer.sync import BulkModelSyncher
+from events.models import KeywordLabel, Place
+from events.tests.factories import (
+    DataSourceFactory,
+    KeywordLabelFactory,
+    LanguageFactory,
+    PlaceFactory,
+)
+
+
+@pytest.fixture
+def language():
+    return LanguageFactory()
+
+
+@pytest.mark.django_db
+def test_bulk_syncher_deletes_unmarked_objects(language):
+    labels = KeywordLabelFactory.create_batch(10, language=language)
+    syncher = BulkModelSyncher(KeywordLabel.objects.all(), ("name", "language_id"))
+
+    for label in labels[:9]:
+        syncher.mark((label.name, label.language_id))
+    assert syncher.finish() == 1
+
+    assert KeywordLabel.objects.count() == 9
+    assert not KeywordLabel.objects.filter(pk=labels[9].pk).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_syncher_soft_deletes_in_chunks():
+    data_source = DataSourceFactory()
+    places = PlaceFactory.create_batch(5, data_source=data_source)
+    syncher = BulkModelSyncher(
+        Place.objects.filter(data_source=data_source),
+        "id",
+        fields=("deleted",),
+        soft_delete_field="deleted",
+        check_deleted_func=lambda row: row.deleted,
+        chunk_size=2,
+    )
+
+    syncher.mark(places[0].id)
+    assert syncher.finish(force=True) == 4
+
+    assert Place.objects.filter(data_source=data_source, deleted=True).count() == 4
+    assert Place.objects.get(pk=places[0].pk).deleted is False
+
+
+@pytest.mark.django_db
+def test_bulk_syncher_keeps_safety_threshold(language):
+    KeywordLabelFactory.create_batch(10, language=language)
+    syncher = BulkModelSyncher(KeywordLabel.objects.all(), ("name", "language_id"))
+
+    with pytest.raises(Exception, match="Attempting to delete 10 out of a total of 10"):
+        syncher.finish()
+    assert KeywordLabel.objects.count() == 10
+
+
+@pytest.mark.django_db
+def test_bulk_syncher_checks_allow_deleting_func(language):
+    KeywordLabelFactory.create_batch(2, language=language)
+    syncher = BulkModelSyncher(
+        KeywordLabel.objects.all(),
+        ("name", "language_id"),
+        allow_deleting_func=lambda row: False,
+    )
+
+    with pytest.raises(Exception, match="not allowed by the importer"):
+        syncher.finish()
+    assert KeywordLabel.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_bulk_syncher_tracks_new_objects(language):
+    syncher = BulkModelSyncher(KeywordLabel.objects.all(), ("name", "language_id"))
+    label = KeywordLabelFactory(language=language)
+
+    syncher.mark((label.name, label.language_id), pk=label.pk)
+
+    assert syncher.get((label.name, label.language_id)).pk == label.pk
+    assert syncher.is_marked((label.name, label.language_id))
+    with pytest.raises(Exception, match="already marked"):
+        syncher.mark((label.name, label.language_id))
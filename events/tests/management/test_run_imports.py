@@ -0,0 +1,130 @@
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import yaml
+from django.core.management import CommandError, call_command
+
+from events.management.commands.run_imports import get_stages, parse_pipeline
+
+PIPELINE = {
+    "runs": {
+        "yso": {"types": ["keywords"]},
+        "tprek": {"types": ["places"], "depends_on": ["yso"]},
+        "osoite": {"types": ["places"], "depends_on": ["yso"]},
+        "kulke": {"types": ["events", "courses"], "depends_on": ["tprek", "osoite"]},
+        "lippupiste": {"types": ["events"], "depends_on": ["tprek"]},
+    },
+    "post_import": ["update_n_events", ["update_index", "--remove"]],
+}
+
+
+def create_pipeline_file(tmp_path: Path, data: dict) -> Path:
+    path = tmp_path / "pipeline.yaml"
+    path.write_text(yaml.safe_dump(data))
+    return path
+
+
+def test_parse_pipeline():
+    runs, post_import = parse_pipeline(PIPELINE)
+
+    assert runs["kulke"].get_args() == (
+        "kulke",
+        "--events",
+        "--courses",
+        "--disable-indexing",
+        "--defer-counters",
+    )
+    assert post_import == [["update_n_events"], ["update_index", "--remove"]]
+    assert get_stages(runs) == [
+        ["yso"],
+        ["tprek", "osoite"],
+        ["kulke", "lippupiste"],
+    ]
+
+
+@pytest.mark.parametrize("elasticsearch", [False, True])
+def test_parse_pipeline_default_post_import_ends_with_index_rebuild(
+    settings, elasticsearch
+):
+    if elasticsearch:
+        settings.HAYSTACK_CONNECTIONS = {
+            **settings.HAYSTACK_CONNECTIONS,
+            "default-fi": {
+                "ENGINE": "multilingual_haystack.backends.LanguageSearchEngine",
+                "BASE_ENGINE": (
+                    "events.custom_elasticsearch_search_backend.CustomEsSearchEngine"
+                ),
+            },
+        }
+
+    _runs, post_import = parse_pipeline({"runs": PIPELINE["runs"]})
+
+    assert post_import[:3] == [
+        ["update_n_events"],
+        ["update_has_upcoming_events"],
+        ["populate_local_event_cache"],
+    ]
+    assert post_import[-1] == ["rebuild_event_search_index"]
+    assert (["update_index", "--remove"] in post_import) is elasticsearch
+
+
+@pytest.mark.parametrize(
+    "runs,message",
+    [
+        ({"tprek": {"depends_on": ["yso"]}}, "unknown run yso"),
+        (
+            {"a": {"depends_on": ["b"]}, "b": {"depends_on": ["a"]}},
+            "Dependency cycle",
+        ),
+        ({"yso": {"types": ["labels"]}}, "unknown import type labels"),
+    ],
+)
+def test_parse_pipeline_invalid(runs, message):
+    with pytest.raises(CommandError, match=message):
+        parse_pipeline({"runs": runs})
+
+
+def test_run_imports_in_dependency_order(tmp_path):
+    path = create_pipeline_file(tmp_path, PIPELINE)
+    out = StringIO()
+
+    with patch("events.management.commands.run_imports.call_command") as mock:
+        call_command("run_imports", path, "--max-workers", "1", stdout=out)
+
+    commands = [
+        c.args[:2] if c.args[0] == "event_import" else c.args
+        for c in mock.call_args_list
+    ]
+    assert commands == [
+        ("event_import", "yso"),
+        ("event_import", "tprek"),
+        ("event_import", "osoite"),
+        ("event_import", "kulke"),
+        ("event_import", "lippupiste"),
+        ("update_n_events",),
+        ("update_index", "--remove"),
+    ]
+    assert "Import kulke finished in" in out.getvalue()
+    assert "Post-import update_n_events finished in" in out.getvalue()
+
+
+def test_run_imports_skips_dependents_of_failed_runs(tmp_path):
+    path = create_pipeline_file(tmp_path, PIPELINE)
+
+    def fail_tprek(*args):
+        if args[:2] == ("event_import", "tprek"):
+            raise Exception("tprek is down")
+
+    with patch(
+        "events.management.commands.run_imports.call_command",
+        side_effect=fail_tprek,
+    ) as mock:
+        with pytest.raises(CommandError, match="kulke, lippupiste, tprek"):
+            call_command("run_imports", path, "--max-workers", "1", stdout=StringIO())
+
+    imported = [c.args[1] for c in mock.call_args_list if c.args[0] == "event_import"]
+    assert imported == ["yso", "tprek", "osoite"]
+    # Post-import commands still run for the imports that succeeded
+    assert mock.call_args_list[-1].args == ("update_index", "--remove")
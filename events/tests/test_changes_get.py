@@ -0,0 +1,158 @@
+import pytest
+from rest_framework import status
+
+from events.models import ChangeLogEntry, Event, PublicationStatus
+
+from .factories import EventFactory, PlaceFactory
+from .utils import get
+from .utils import versioned_reverse as reverse
+
+# === util methods ===
+
+
+def get_list(api_client, query_string=None):
+    url = reverse("changes-list")
+
+    if query_string:
+        url = f"{url}?{query_string}"
+
+    return get(api_client, url)
+
+
+def get_changes(resource_id):
+    return list(
+        ChangeLogEntry.objects.filter(resource_id=resource_id)
+        .order_by("id")
+        .values_list("resource_type", "action")
+    )
+
+
+# === tests ===
+
+
+@pytest.mark.django_db
+def test_changes_are_logged_on_commit(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        event = EventFactory()
+    assert get_changes(event.id) == [("event", "created")]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        event.name = "Uusi nimi"
+        event.save()
+        event.soft_delete()
+    assert get_changes(event.id) == [
+        ("event", "created"),
+        ("event", "updated"),
+        ("event", "deleted"),
+    ]
+
+
+@pytest.mark.django_db
+def test_draft_events_are_logged_as_deleted(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        draft = EventFactory(publication_status=PublicationStatus.DRAFT)
+    assert get_changes(draft.id) == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        event = EventFactory()
+        event.publication_status = PublicationStatus.DRAFT
+        event.save()
+    assert get_changes(event.id) == [("event", "created"), ("event", "deleted")]
+
+
+@pytest.mark.django_db
+def test_bulk_soft_delete_is_logged(django_capture_on_commit_callbacks):
+    events = EventFactory.create_batch(2)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Event.objects.filter(id__in=[event.id for event in events]).soft_delete()
+
+    for event in events:
+        assert get_changes(event.id) == [("event", "deleted")]
+
+
+@pytest.mark.django_db
+def test_changes_are_not_logged_without_commit():
+    event = EventFactory()
+
+    assert get_changes(event.id) == []
+
+
+@pytest.mark.django_db
+def test_get_changes_after_sequence(api_client, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        place = PlaceFactory()
+        event = EventFactory(location=place)
+    last_sequence = ChangeLogEntry.objects.latest("id").id
+
+    with django_capture_on_commit_callbacks(execute=True):
+        place.save()
+        event.delete()
+
+    response = get_list(api_client, f"since={last_sequence}")
+
+    assert response.data["meta"] == {
+        "next": None,
+        "last_sequence": last_sequence + 2,
+    }
+    assert [
+        (change["sequence"], change["resource_id"], change["action"])
+        for change in response.data["data"]
+    ] == [
+        (last_sequence + 1, place.id, "updated"),
+        (last_sequence + 2, event.id, "deleted"),
+    ]
+
+
+@pytest.mark.django_db
+def test_get_changes_paginates_by_sequence(
+    api_client, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        PlaceFactory.create_batch(3)
+    sequences = list(ChangeLogEntry.objects.order_by("id").values_list("id", flat=True))
+
+    response = get_list(api_client, "page_size=2")
+
+    assert [change["sequence"] for change in response.data["data"]] == sequences[:2]
+    assert response.data["meta"]["last_sequence"] == sequences[1]
+    assert f"since={sequences[1]}" in response.data["meta"]["next"]
+
+    response = get(api_client, response.data["meta"]["next"])
+
+    assert [change["sequence"] for change in response.data["data"]] == sequences[2:]
+    assert response.data["meta"]["next"] is None
+
+
+@pytest.mark.django_db
+def test_get_changes_by_resource_type(api_client, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        event = EventFactory()
+
+    response = get_list(api_client, "resource_type=event")
+
+    assert [change["resource_id"] for change in response.data["data"]] == [event.id]
+
+
+@pytest.mark.django_db
+def test_get_changes_are_delayed(
+    api_client, settings, django_capture_on_commit_callbacks
+):
+    settings.CHANGE_FEED_DELAY = 60
+    with django_capture_on_commit_callbacks(execute=True):
+        EventFactory()
+
+    response = get_list(api_client)
+
+    assert response.data["data"] == []
+    assert response.data["meta"]["last_sequence"] == 0
+
+
+@pytest.mark.parametrize(
+    "query_string", ["since=abc", "resource_type=image", "resource_type=event,"]
+)
+@pytest.mark.django_db
+def test_get_changes_with_invalid_params(api_client, query_string):
+    response = api_client.get(f"{reverse('changes-list')}?{query_string}")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
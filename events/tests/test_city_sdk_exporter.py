@@ -0,0 +1,60 @@
+import pytest
+from httmock import HTTMock, all_requests
+
+from events.exporter.city_sdk import CitySDKExporter, citysdk_mock
+from events.models import Event, ExportInfo
+
+from .factories import EventFactory, KeywordFactory, PlaceFactory
+
+
+@pytest.fixture
+def citysdk_requests():
+    requests = []
+
+    @all_requests
+    def recording_citysdk_mock(url, request):
+        requests.append((request.method, url.path))
+        return citysdk_mock(url, request)
+
+    with HTTMock(recording_citysdk_mock):
+        yield requests
+
+
+@pytest.mark.django_db
+def test_export_events_skips_unchanged_objects(citysdk_requests):
+    place = PlaceFactory()
+    event = EventFactory(
+        data_source=place.data_source, publisher=place.publisher, location=place
+    )
+    event.keywords.add(KeywordFactory(data_source=place.data_source))
+
+    exporter = CitySDKExporter()
+    exporter.export_events()
+
+    assert [method for method, _path in citysdk_requests].count("PUT") == 3
+    assert ExportInfo.objects.count() == 3
+    assert not ExportInfo.objects.filter(content_hash__isnull=True).exists()
+
+    citysdk_requests.clear()
+    exporter.export_events()
+
+    assert citysdk_requests == []
+
+    Event.objects.filter(pk=event.pk).update(name_fi="Uusi nimi")
+    exporter.export_events()
+
+    assert citysdk_requests == [("POST", "/CitySDK/events/")]
+
+
+@pytest.mark.django_db
+def test_export_events_deletes_removed_objects(citysdk_requests):
+    event = EventFactory()
+
+    exporter = CitySDKExporter()
+    exporter.export_events()
+    event.delete()
+    citysdk_requests.clear()
+    exporter.export_events()
+
+    assert citysdk_requests == [("DELETE", "/CitySDK/events/foo")]
+    assert not ExportInfo.objects.exists()
@@ -0,0 +1,119 @@
+import pytest
+from rest_framework import status
+
+from events.models import Event, Place
+from registrations.tests.factories import RegistrationFactory, SignUpFactory
+
+from .factories import EventFactory
+from .utils import versioned_reverse as reverse
+
+
+def get_conditional(api_client, url, etag):
+    return api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+
+@pytest.mark.django_db
+def test_event_detail_not_modified(api_client, event):
+    url = reverse("event-detail", kwargs={"pk": event.pk})
+    response = api_client.get(url)
+    etag = response["ETag"]
+
+    response = get_conditional(api_client, url, etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not response.content
+
+    event.name_fi = "Uusi nimi"
+    event.save()
+    response = get_conditional(api_client, url, etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_event_detail_etag_depends_on_request_shape(api_client, event):
+    url = reverse("event-detail", kwargs={"pk": event.pk})
+    etag = api_client.get(url)["ETag"]
+
+    response = get_conditional(api_client, f"{url}?include=location", etag)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_event_detail_modified_when_included_registration_gets_signups(
+    api_client, event
+):
+    registration = RegistrationFactory(event=event, maximum_attendee_capacity=10)
+    url = f"{reverse('event-detail', kwargs={'pk': event.pk})}?include=registration"
+    response = api_client.get(url)
+    etag = response.get("ETag", "")
+
+    SignUpFactory(registration=registration)
+    response = get_conditional(api_client, url, etag)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_event_detail_no_etag_without_shared_cache(api_client, event, settings):
+    settings.CONDITIONAL_GET_ENABLED = False
+    url = reverse("event-detail", kwargs={"pk": event.pk})
+
+    response = api_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not response.has_header("ETag")
+
+
+@pytest.mark.django_db
+def test_event_detail_modified_when_embedded_image_changes(api_client, event, image):
+    event.images.add(image)
+    url = reverse("event-detail", kwargs={"pk": event.pk})
+    etag = api_client.get(url)["ETag"]
+
+    image.name = "Uusi nimi"
+    image.save()
+    response = get_conditional(api_client, url, etag)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_event_list_not_modified(api_client, event):
+    url = reverse("event-list")
+    response = api_client.get(url)
+    etag = response["ETag"]
+
+    assert get_conditional(api_client, url, etag).status_code == (
+        status.HTTP_304_NOT_MODIFIED
+    )
+
+    new_event = EventFactory(
+        data_source=event.data_source,
+        publisher=event.publisher,
+        start_time=event.start_time,
+        end_time=event.end_time,
+    )
+    response = get_conditional(api_client, url, etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["meta"]["count"] == 2
+    etag = response["ETag"]
+
+    Event.objects.filter(pk=new_event.pk).update(deleted=True)
+
+    assert get_conditional(api_client, url, etag).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_place_detail_modified_when_event_count_changes(api_client, place):
+    url = reverse("place-detail", kwargs={"pk": place.pk})
+    etag = api_client.get(url)["ETag"]
+
+    Place.objects.filter(pk=place.pk).update(n_events=10)
+    response = get_conditional(api_client, url, etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["n_events"] == 10
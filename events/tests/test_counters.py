@@ -0,0 +1,140 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from pytest_django.asserts import assertNumQueries
+
+from events.counters import deferred_event_counters, get_event_counter_session
+from events.models import Keyword, Place
+from events.tests.factories import EventFactory, KeywordFactory, PlaceFactory
+from events.utils import recache_n_events, recache_n_events_in_locations
+
+
+@pytest.fixture
+def keywords_and_places_with_events(data_source, organization):
+    """
+    Enough keywords and places that a per-row recompute would issue hundreds
+    of queries, while the set-based one issues a constant number per chunk.
+    """
+    keywords = KeywordFactory.create_batch(
+        200, data_source=data_source, publisher=organization
+    )
+    places = PlaceFactory.create_batch(
+        100, data_source=data_source, publisher=organization
+    )
+    now = timezone.now()
+    for index, place in enumerate(places):
+        event = EventFactory(
+            data_source=data_source,
+            publisher=organization,
+            location=place,
+            start_time=now,
+            end_time=now + timedelta(days=1 if index % 2 else -1),
+        )
+        event.keywords.add(*keywords[index * 2 : index * 2 + 2])
+    return keywords, places
+
+
+@pytest.mark.django_db
+def test_deferred_event_counters_recomputes_touched_rows(
+    keyword, keyword2, event, past_event, place
+):
+    Place.objects.filter(id=place.id).update(n_events=0, n_events_changed=False)
+
+    with deferred_event_counters() as session:
+        event.keywords.add(keyword)
+        past_event.keywords.add(keyword2)
+        past_event.audience.add(keyword)
+        event.location = None
+        event.save()
+        event.location = place
+        event.save()
+
+        assert get_event_counter_session() is session
+        assert session.keyword_ids == {keyword.id, keyword2.id}
+        assert session.place_ids == {place.id}
+        # Nothing is flagged while the session is active
+        assert not Keyword.objects.filter(n_events_changed=True).exists()
+        assert not Place.objects.filter(n_events_changed=True).exists()
+
+    assert get_event_counter_session() is None
+    keyword.refresh_from_db()
+    keyword2.refresh_from_db()
+    place.refresh_from_db()
+    assert keyword.n_events == 2
+    assert keyword.has_upcoming_events is True
+    assert keyword2.n_events == 1
+    assert keyword2.has_upcoming_events is False
+    assert place.n_events == 2
+    assert place.has_upcoming_events is True
+
+
+@pytest.mark.django_db
+def test_deferred_event_counters_flags_touched_rows_on_error(keyword, event):
+    with pytest.raises(ValueError), deferred_event_counters():
+        event.keywords.add(keyword)
+        raise ValueError
+
+    keyword.refresh_from_db()
+    assert keyword.n_events_changed is True
+    assert keyword.n_events == 0
+
+
+@pytest.mark.django_db
+def test_nested_deferred_event_counters_share_session():
+    with deferred_event_counters() as outer, deferred_event_counters() as inner:
+        assert inner is outer
+
+
+@pytest.mark.django_db
+def test_recache_all_n_events_uses_one_query_per_chunk(
+    keywords_and_places_with_events,
+):
+    keywords, places = keywords_and_places_with_events
+    Keyword.objects.update(n_events=0)
+    Place.objects.update(n_events=0)
+
+    # One query to fetch the id chunk, one UPDATE, one empty chunk query,
+    # plus the savepoint queries of the per-chunk transaction.
+    with assertNumQueries(5):
+        recache_n_events((), all=True)
+    with assertNumQueries(5):
+        recache_n_events_in_locations((), all=True)
+
+    assert set(
+        Keyword.objects.filter(id__in=[k.id for k in keywords]).values_list(
+            "n_events", flat=True
+        )
+    ) == {1}
+    assert set(
+        Place.objects.filter(id__in=[p.id for p in places]).values_list(
+            "n_events", flat=True
+        )
+    ) == {1}
+
+
+@pytest.mark.django_db
+def test_has_upcoming_events_update_uses_one_query_per_chunk(
+    keywords_and_places_with_events,
+):
+    keywords, places = keywords_and_places_with_events
+    recache_n_events((), all=True)
+    recache_n_events_in_locations((), all=True)
+
+    with assertNumQueries(5):
+        Keyword.objects.has_upcoming_events_update()
+    with assertNumQueries(5):
+        Place.upcoming_events.has_upcoming_events_update()
+
+    upcoming_places = set(
+        Place.objects.filter(has_upcoming_events=True).values_list("id", flat=True)
+    )
+    assert upcoming_places == {place.id for place in places[1::2]}
+    upcoming_keywords = set(
+        Keyword.objects.filter(has_upcoming_events=True).values_list("id", flat=True)
+    )
+    assert upcoming_keywords == {
+        keyword.id
+        for index in range(1, len(places), 2)
+        for keyword in keywords[index * 2 : index * 2 + 2]
+    }
@@ -0,0 +1,86 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from freezegun import freeze_time
+from parler.utils.context import switch_language
+
+from events.division_index import DivisionIndex, get_division_index
+from events.models import Place
+
+
+def test_get_division_ids():
+    index = DivisionIndex(
+        [
+            (1, "ocd-division/test:1", "Kamppi"),
+            (1, "ocd-division/test:1", "Kampen"),
+            (2, "ocd-division/test:2", "Kamppi"),
+            (3, "ocd-division/test:3", None),
+        ]
+    )
+
+    assert index.get_division_ids(["ocd-division/test:1"], []) == {1}
+    assert index.get_division_ids([], ["Kamppi"]) == {1, 2}
+    assert index.get_division_ids(["ocd-division/test:3"], ["Kampen"]) == {1, 3}
+    assert index.get_division_ids(["unknown"], ["Unknown"]) == set()
+
+
+@pytest.mark.django_db
+def test_place_ids_are_cached_until_place_divisions_change(
+    place, place2, administrative_division
+):
+    place.divisions.set([administrative_division])
+    index = get_division_index()
+    division_ids = index.get_division_ids([administrative_division.ocd_id])
+
+    assert index.get_place_ids(division_ids) == [place.id]
+    with CaptureQueriesContext(connection) as queries:
+        assert get_division_index().get_place_ids(division_ids) == [place.id]
+    assert not [q for q in queries if "events_place_divisions" in q["sql"]]
+
+    place2.divisions.add(administrative_division)
+
+    assert get_division_index().get_place_ids(division_ids) == sorted(
+        [place.id, place2.id]
+    )
+
+
+@pytest.mark.django_db
+def test_index_is_reloaded_when_divisions_change(administrative_division):
+    index = get_division_index()
+    assert get_division_index() is index
+    assert index.get_division_ids([], ["Uusi Nimi"]) == set()
+
+    with switch_language(administrative_division, "en"):
+        administrative_division.name = "uusi nimi"
+        administrative_division.save()
+
+    assert get_division_index() is not index
+    assert get_division_index().get_division_ids([], ["uusi nimi"]) == {
+        administrative_division.id
+    }
+
+
+@pytest.mark.django_db
+def test_place_ids_are_reloaded_after_timeout_without_shared_cache(
+    settings, place, place2, administrative_division
+):
+    settings.SHARED_CACHE_ENABLED = False
+    settings.LOCAL_SNAPSHOT_TIMEOUT = 10
+    place.divisions.set([administrative_division])
+
+    with freeze_time("2024-01-01 12:00:00"):
+        division_ids = get_division_index().get_division_ids(
+            [administrative_division.ocd_id]
+        )
+        assert get_division_index().get_place_ids(division_ids) == [place.id]
+        # A change made in another process doesn't invalidate the cached ids
+        Place.divisions.through.objects.create(
+            place=place2, administrativedivision=administrative_division
+        )
+
+        assert get_division_index().get_place_ids(division_ids) == [place.id]
+
+    with freeze_time("2024-01-01 12:00:10"):
+        assert get_division_index().get_place_ids(division_ids) == sorted(
+            [place.id, place2.id]
+        )
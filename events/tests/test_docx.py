@@ -1,11 +1,30 @@
+import io
 from datetime import UTC, date, datetime
+from zoneinfo import ZoneInfo
 
 import pytest
+from django.conf import settings
+from docx import Document
 
 from events.renderers.docx import DateRange, EventParser
 
+from .factories import EventFactory, PlaceFactory
 from .utils import versioned_reverse as reverse
 
+LOCAL_TZ = ZoneInfo(settings.TIME_ZONE)
+
+
+def _get_docx_list(api_client, location_ids):
+    return api_client.get(
+        reverse("event-list"),
+        {
+            "format": "docx",
+            "location": ",".join(location_ids),
+            "start": "2030-01-01",
+            "end": "2030-01-31",
+        },
+    )
+
 
 @pytest.mark.django_db
 def test_docx_renderer(api_client, event, place):
@@ -20,6 +39,59 @@ def test_docx_renderer(api_client, event, place):
     assert response.status_code == 200
 
 
+@pytest.mark.django_db
+def test_docx_export_groups_events_by_date(api_client, place):
+    for start_hour, end_hour, day, name in [
+        (10, 12, 2, "Toinen"),
+        (18, 20, 1, "Ilta"),
+        (9, 10, 1, "Aamu"),
+    ]:
+        EventFactory(
+            data_source=place.data_source,
+            publisher=place.publisher,
+            location=place,
+            name_fi=name,
+            start_time=datetime(2030, 1, day, start_hour, tzinfo=LOCAL_TZ),
+            end_time=datetime(2030, 1, day, end_hour, tzinfo=LOCAL_TZ),
+        )
+
+    response = _get_docx_list(api_client, [place.id])
+
+    assert response.status_code == 200
+    assert response["Content-Disposition"].endswith('-20300101-20300201.docx"')
+    document = Document(io.BytesIO(b"".join(response.streaming_content)))
+    headings = [
+        (paragraph.style.name, paragraph.text)
+        for paragraph in document.paragraphs
+        if paragraph.style.name in ("Heading 1", "Heading 2")
+    ]
+    assert headings == [
+        ("Heading 1", "1.1.2030 tiistai"),
+        ("Heading 2", "09:00-10:00 Aamu"),
+        ("Heading 2", "18:00-20:00 Ilta"),
+        ("Heading 1", "2.1. keskiviikko"),
+        ("Heading 2", "10:00-12:00 Toinen"),
+    ]
+
+
+@pytest.mark.django_db
+def test_docx_export_requires_single_location(api_client, place):
+    other_place = PlaceFactory(data_source=place.data_source)
+    for location in (place, other_place):
+        EventFactory(
+            data_source=place.data_source,
+            publisher=place.publisher,
+            location=location,
+            start_time=datetime(2030, 1, 1, 12, tzinfo=LOCAL_TZ),
+            end_time=datetime(2030, 1, 1, 14, tzinfo=LOCAL_TZ),
+        )
+
+    response = _get_docx_list(api_client, [place.id, other_place.id])
+
+    assert response.status_code == 400
+    assert "detail" in response.data
+
+
 def test_date_range_supports_all_ordering_comparisons():
     earlier = DateRange(date(2026, 1, 1), date(2026, 1, 2))
     later = DateRange(date(2026, 2, 1), date(2026, 2, 2))
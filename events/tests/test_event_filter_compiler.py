@@ -0,0 +1,170 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from events.api import _compile_event_filters, _filter_event_queryset
+from events.models import Event, KeywordSet
+from events.tests.factories import EventFactory, KeywordFactory
+
+
+@pytest.fixture
+def keywords(data_source):
+    return KeywordFactory.create_batch(4, data_source=data_source)
+
+
+@pytest.fixture
+def keyword_set(data_source, organization, keywords):
+    keyword_set = KeywordSet.objects.create(
+        id=f"{data_source.id}:set",
+        name="set",
+        data_source=data_source,
+        organization=organization,
+    )
+    keyword_set.keywords.set(keywords[2:])
+    return keyword_set
+
+
+@pytest.fixture
+def keyword_events(data_source, keywords):
+    events = EventFactory.create_batch(3, data_source=data_source)
+    events[0].keywords.set(keywords[:2])
+    events[1].audience.set([keywords[0], keywords[2]])
+    events[2].keywords.set([keywords[3]])
+    return events
+
+
+def _filter(params):
+    return set(_filter_event_queryset(Event.objects.all(), params))
+
+
+@pytest.mark.django_db
+def test_keyword_constraints_are_merged_into_one_predicate(
+    keywords, keyword_set, keyword_events
+):
+    params = {
+        "keyword": keywords[0].id,
+        "keyword_AND": f"{keywords[0].id}",
+        "keyword_set_OR": keyword_set.id,
+        "keyword_OR_set1": f"{keywords[2].id},{keywords[3].id}",
+    }
+
+    with CaptureQueriesContext(connection) as queries:
+        plan = _compile_event_filters(params)
+
+    # One query resolves the keyword replacements and one the keyword sets
+    assert len(queries) == 2
+    predicate_names = [predicate["name"] for predicate in plan.explain()]
+    assert predicate_names.count("keywords") == 1
+    assert _filter(params) == {keyword_events[1]}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params,expected_indexes",
+    [
+        ({"keyword": "{0},{3}"}, {0, 1, 2}),
+        ({"keyword_AND": "{0},{1}"}, {0}),
+        ({"keyword_AND": "{0},unknown"}, set()),
+        ({"keyword_set_AND": "{set}"}, {1, 2}),
+        ({"keyword_OR_set1": "{1}", "keyword_OR_set2": "{2}"}, set()),
+        ({"keyword_OR_set1": "{0}", "keyword_OR_set2": "{2},{1}"}, {0, 1}),
+        ({"keyword!": "{0}"}, {2}),
+    ],
+)
+def test_keyword_filters(
+    keywords, keyword_set, keyword_events, params, expected_indexes
+):
+    ids = {str(i): keyword.id for i, keyword in enumerate(keywords)}
+    ids["set"] = keyword_set.id
+    params = {key: value.format(**ids) for key, value in params.items()}
+
+    assert _filter(params) == {keyword_events[i] for i in expected_indexes}
+
+
+@pytest.mark.django_db
+def test_predicates_are_ordered_by_cost(keyword_events):
+    plan = _compile_event_filters(
+        {"ids": keyword_events[0].id, "text": "foo", "location": "place"}
+    )
+
+    assert [predicate["name"] for predicate in plan.explain()] == [
+        "ids",
+        "location",
+        "text",
+        "event_type",
+        "data_source",
+        "deleted",
+    ]
+
+
+@pytest.mark.django_db
+def test_keyword_id_arrays_follow_keyword_relations(keywords, keyword_events):
+    event = keyword_events[0]
+    event.refresh_from_db()
+    assert event.keyword_ids == sorted([keywords[0].id, keywords[1].id])
+
+    event.keywords.remove(keywords[0])
+    event.save()
+    event.refresh_from_db()
+    assert event.keyword_ids == [keywords[1].id]
+
+    keywords[3].events.add(event)
+    keywords[3].audience_events.add(event)
+    event.refresh_from_db()
+    assert event.keyword_ids == sorted([keywords[1].id, keywords[3].id])
+    assert event.audience_ids == [keywords[3].id]
+
+    keywords[3].audience_events.clear()
+    event.keywords.clear()
+    event.refresh_from_db()
+    assert event.keyword_ids == []
+    assert event.audience_ids == []
+    assert Event.objects.get(pk=keyword_events[1].pk).audience_ids == sorted(
+        [keywords[0].id, keywords[2].id]
+    )
+
+
+@pytest.mark.django_db
+def test_keyword_id_arrays_are_not_overwritten_by_stale_saves(keywords, keyword_events):
+    stale_event = Event.objects.get(pk=keyword_events[0].pk)
+    keywords[3].events.add(keyword_events[0])
+    stale_event.save()
+    stale_event.refresh_from_db()
+
+    assert stale_event.keyword_ids == sorted(
+        [keywords[0].id, keywords[1].id, keywords[3].id]
+    )
+
+
+@pytest.mark.django_db
+def test_keyword_id_arrays_follow_keyword_deletes(keywords, keyword_events):
+    keywords[0].delete()
+
+    assert Event.objects.get(pk=keyword_events[0].pk).keyword_ids == [keywords[1].id]
+    assert Event.objects.get(pk=keyword_events[1].pk).audience_ids == [keywords[2].id]
+
+
+@pytest.mark.django_db
+def test_rebuild_keyword_id_arrays(keywords, keyword_events):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "ALTER TABLE events_event DISABLE TRIGGER "
+            "events_event_keep_keyword_ids_trigger"
+        )
+        cursor.execute(
+            "UPDATE events_event SET keyword_ids = '{}', audience_ids = '{}'"
+        )
+        cursor.execute(
+            "ALTER TABLE events_event ENABLE TRIGGER "
+            "events_event_keep_keyword_ids_trigger"
+        )
+
+    call_command("rebuild_keyword_id_arrays", "--batch-size", "2")
+
+    assert Event.objects.get(pk=keyword_events[0].pk).keyword_ids == sorted(
+        [keywords[0].id, keywords[1].id]
+    )
+    assert Event.objects.get(pk=keyword_events[1].pk).audience_ids == sorted(
+        [keywords[0].id, keywords[2].id]
+    )
@@ -7,7 +7,7 @@ from dateutil import parser
 from django.conf import settings
 from django.contrib.gis.gdal import CoordTransform, SpatialReference
 from django.contrib.gis.geos import Point
-from django.db import DEFAULT_DB_ALIAS, connections
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
 from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from django.utils.timezone import localtime
@@ -16,7 +16,14 @@ from pytest_django.asserts import assertNumQueries
 from resilient_logger.models import ResilientLogEntry
 from rest_framework import status
 
-from events.models import Event, Language, License, PublicationStatus
+from events.models import (
+    Event,
+    Keyword,
+    Language,
+    License,
+    Place,
+    PublicationStatus,
+)
 from events.tests.conftest import APIClient
 from events.tests.factories import (
     EventFactory,
@@ -283,6 +290,35 @@ def test_get_event_list_verify_text_filter(api_client, event, event2):
     get_list_and_assert_events(f"text={event.location.name}", [event])
 
 
+@pytest.mark.django_db
+def test_get_event_list_text_filter_follows_updates(api_client, event, event2):
+    event.location.street_address_sv = "Testgatan 1"
+    event.location.save()
+    Event.objects.filter(pk=event2.pk).update(provider_en="Test Provider")
+
+    get_list_and_assert_events("text=TESTGATAN", [event])
+    get_list_and_assert_events("text=provider", [event2])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "model,lookup,index_name",
+    [
+        (Event, "search_text__contains", "event_search_text_trgm_idx"),
+        (Place, "search_text__contains", "place_search_text_trgm_idx"),
+        (Keyword, "name_fi__trigram_similar", "keyword_name_fi_trgm_idx"),
+    ],
+)
+def test_text_filters_use_trigram_indexes(model, lookup, index_name):
+    connection = connections[DEFAULT_DB_ALIAS]
+    with transaction.atomic(), connection.cursor() as cursor:
+        # The test tables are too small for the planner to prefer any index
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = model.objects.filter(**{lookup: "lapset"}).explain()
+
+    assert index_name in plan
+
+
 @pytest.mark.django_db
 def test_get_event_list_verify_data_source_filter(
     api_client, data_source, event, event2
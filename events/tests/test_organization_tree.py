@@ -0,0 +1,104 @@
+import pytest
+from django_orghierarchy.models import Organization
+from freezegun import freeze_time
+
+from events.organization_tree import (
+    OrganizationNode,
+    OrganizationTree,
+    get_organization_tree,
+)
+from events.tests.factories import DataSourceFactory, OrganizationFactory
+
+
+@pytest.fixture
+def tree():
+    #  root                 other
+    #  ├── child            replacing <- replaced
+    #  │   └── grandchild
+    #  └── child2
+    return OrganizationTree(
+        [
+            OrganizationNode("root", None, 1, 1, 8, None, "normal"),
+            OrganizationNode("child", "root", 1, 2, 5, None, "normal"),
+            OrganizationNode("grandchild", "child", 1, 3, 4, None, "normal"),
+            OrganizationNode("child2", "root", 1, 6, 7, None, "affiliated"),
+            OrganizationNode("other", None, 2, 1, 2, None, "normal"),
+            OrganizationNode("replacing", None, 3, 1, 2, None, "normal"),
+            OrganizationNode("replaced", None, 4, 1, 2, "replacing", "normal"),
+        ]
+    )
+
+
+def test_get_descendant_ids(tree):
+    assert tree.get_descendant_ids("root") == [
+        "root",
+        "child",
+        "grandchild",
+        "child2",
+    ]
+    assert tree.get_descendant_ids("child", include_self=False) == ["grandchild"]
+    assert tree.get_descendant_ids("grandchild", include_self=False) == []
+    assert tree.get_descendant_ids("unknown") == []
+
+
+def test_get_ancestor_ids(tree):
+    assert tree.get_ancestor_ids("grandchild") == ["root", "child"]
+    assert tree.get_ancestor_ids("grandchild", include_self=True) == [
+        "root",
+        "child",
+        "grandchild",
+    ]
+    assert tree.get_ancestor_ids("root") == []
+    assert tree.get_ancestor_ids("unknown") == []
+
+
+def test_get_descendant_ids_of_many(tree):
+    assert set(tree.get_descendant_ids_of_many(["child", "grandchild", "other"])) == {
+        "child",
+        "grandchild",
+        "other",
+    }
+    assert set(
+        tree.get_descendant_ids_of_many(["replaced"], include_replacements=True)
+    ) == {"replaced", "replacing"}
+
+
+@pytest.mark.django_db
+def test_organization_tree_is_reloaded_on_organization_change(
+    django_assert_num_queries,
+):
+    data_source = DataSourceFactory()
+    parent = OrganizationFactory(data_source=data_source)
+
+    with django_assert_num_queries(1):
+        assert get_organization_tree().get_descendant_ids(parent.id) == [parent.id]
+    with django_assert_num_queries(0):
+        assert get_organization_tree().get_descendant_ids(parent.id) == [parent.id]
+
+    child = OrganizationFactory(data_source=data_source, parent=parent)
+
+    assert get_organization_tree().get_descendant_ids(parent.id) == [
+        parent.id,
+        child.id,
+    ]
+
+
+@pytest.mark.django_db
+def test_organization_tree_is_reloaded_after_timeout_without_shared_cache(settings):
+    settings.SHARED_CACHE_ENABLED = False
+    settings.LOCAL_SNAPSHOT_TIMEOUT = 10
+    data_source = DataSourceFactory()
+    organization = OrganizationFactory(data_source=data_source)
+    replacing = OrganizationFactory(data_source=data_source)
+
+    with freeze_time("2024-01-01 12:00:00"):
+        get_organization_tree()
+        # A change made in another process doesn't invalidate this snapshot
+        Organization.objects.filter(pk=organization.pk).update(replaced_by=replacing)
+
+        node = get_organization_tree().nodes[organization.id]
+        assert node.replaced_by_id is None
+
+    with freeze_time("2024-01-01 12:00:10"):
+        node = get_organization_tree().nodes[organization.id]
+        assert node.replaced_by_id == replacing.id
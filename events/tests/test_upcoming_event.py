@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from events.api import _filter_event_queryset, _get_upcoming_events_since
+from events.models import Event, PublicationStatus, UpcomingEvent
+from events.tests.factories import EventFactory, KeywordFactory, OfferFactory
+
+
+@pytest.fixture
+def keywords(data_source):
+    return KeywordFactory.create_batch(3, data_source=data_source)
+
+
+@pytest.fixture
+def upcoming_events(data_source, keywords):
+    now = timezone.now()
+    events = EventFactory.create_batch(
+        3,
+        data_source=data_source,
+        start_time=now + timedelta(days=1),
+        end_time=now + timedelta(days=2),
+    )
+    events[0].keywords.set(keywords[:2])
+    events[1].audience.set([keywords[0], keywords[2]])
+    events[2].keywords.set([keywords[2]])
+    OfferFactory(event=events[2], is_free=True)
+    return events
+
+
+@pytest.mark.django_db
+def test_upcoming_events_are_maintained_by_triggers(keywords, upcoming_events):
+    upcoming_event = UpcomingEvent.objects.get(event=upcoming_events[2])
+    assert upcoming_event.keyword_ids == [keywords[2].id]
+    assert upcoming_event.is_free is True
+    assert upcoming_event.location_id == upcoming_events[2].location_id
+    assert sorted(UpcomingEvent.objects.get(event=upcoming_events[1]).keyword_ids) == (
+        sorted([keywords[0].id, keywords[2].id])
+    )
+
+    upcoming_events[0].keywords.remove(keywords[0])
+    assert UpcomingEvent.objects.get(event=upcoming_events[0]).keyword_ids == [
+        keywords[1].id
+    ]
+
+    upcoming_events[1].publication_status = PublicationStatus.DRAFT
+    upcoming_events[1].save()
+    Event.objects.filter(id=upcoming_events[2].id).update(deleted=True)
+
+    assert set(UpcomingEvent.objects.values_list("event_id", flat=True)) == {
+        upcoming_events[0].id
+    }
+
+
+@pytest.mark.django_db
+def test_prune_removes_ended_events(data_source, upcoming_events):
+    ended_event = EventFactory(
+        data_source=data_source,
+        start_time=timezone.now() - timedelta(days=10),
+        end_time=timezone.now() - timedelta(days=9),
+    )
+    assert UpcomingEvent.objects.filter(event=ended_event).exists()
+
+    assert UpcomingEvent.objects.prune() == 1
+
+    assert not UpcomingEvent.objects.filter(event=ended_event).exists()
+    assert UpcomingEvent.objects.count() == len(upcoming_events)
+
+
+@pytest.mark.parametrize(
+    "params,expected",
+    [
+        ({}, False),
+        ({"start": "now"}, True),
+        ({"start": "today"}, True),
+        ({"start": "2014-01-01"}, False),
+        ({"days": "3"}, True),
+        ({"ongoing": "true"}, True),
+        ({"start": "now", "show_deleted": "true"}, False),
+    ],
+)
+def test_get_upcoming_events_since(params, expected):
+    assert (_get_upcoming_events_since(params) is not None) is expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"keyword": "{0},{1}"},
+        {"keyword_AND": "{0},{2}"},
+        {"keyword_OR_set1": "{1}", "keyword_OR_set2": "{2},{0}"},
+        {"keyword!": "{1}"},
+        {"is_free": "true"},
+        {"is_free": "false", "keyword": "{2}"},
+    ],
+)
+def test_upcoming_event_lookup_matches_event_filters(keywords, upcoming_events, params):
+    ids = {str(i): keyword.id for i, keyword in enumerate(keywords)}
+    params = {"start": "now", **{k: v.format(**ids) for k, v in params.items()}}
+    queryset = Event.objects.filter(publication_status=PublicationStatus.PUBLIC)
+
+    expected = set(_filter_event_queryset(queryset, params))
+    actual = set(
+        _filter_event_queryset(
+            queryset, params, upcoming_since=_get_upcoming_events_since(params)
+        )
+    )
+
+    assert expected
+    assert actual == expected
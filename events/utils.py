@@ -17,12 +17,17 @@ from rest_framework.exceptions import ParseError, PermissionDenied
 
 from events.auth import ApiKeyAuth
 from events.models import DataSource, Keyword, Place
-from events.sql import count_events_for_keywords, count_events_for_places
+from events.sql import (
+    update_n_events_for_keywords,
+    update_n_events_for_places,
+)
 from helevents.models import User
+from linkedevents.utils import iter_pk_chunks
 
 logger = logging.getLogger(__name__)
 
 UTC_TIMEZONE = ZoneInfo("UTC")
+RECACHE_CHUNK_SIZE = 5000
 
 
 def convert_to_camelcase(s):
@@ -73,20 +78,15 @@ def recache_n_events(keyword_ids, all=False):
     :type keyword_ids: Iterable[str]
     """
 
-    # needed so we don't empty the blasted iterator mid-operation
-    keyword_ids = tuple(set(keyword_ids))
-    with transaction.atomic():
-        if all:
-            Keyword.objects.update(n_events=0)
-        else:
-            # set the flag to false here, so zero-event keywords will get it too
-            Keyword.objects.filter(id__in=keyword_ids).update(
-                n_events=0, n_events_changed=False
-            )
-        for keyword_id, n_events in count_events_for_keywords(
-            keyword_ids, all=all
-        ).items():
-            Keyword.objects.filter(id=keyword_id).update(n_events=n_events)
+    if all:
+        # Commit each id range separately so that the whole keyword table
+        # isn't locked for the duration of the recount.
+        for chunk in iter_pk_chunks(Keyword.objects.all(), RECACHE_CHUNK_SIZE):
+            with transaction.atomic():
+                update_n_events_for_keywords(chunk)
+    else:
+        # also resets the n_events_changed flag
+        update_n_events_for_keywords(keyword_ids)
 
 
 def recache_n_events_in_locations(place_ids, all=False):
@@ -97,18 +97,15 @@ def recache_n_events_in_locations(place_ids, all=False):
     :type place_ids: Iterable[str]
     """
 
-    # needed so we don't empty the blasted iterator mid-operation
-    place_ids = tuple(set(place_ids))
-    with transaction.atomic():
-        if all:
-            Place.objects.update(n_events=0)
-        else:
-            # set the flag to false here, so zero-event places will get it too
-            Place.objects.filter(id__in=place_ids).update(
-                n_events=0, n_events_changed=False
-            )
-        for place_id, n_events in count_events_for_places(place_ids, all=all).items():
-            Place.objects.filter(id=place_id).update(n_events=n_events)
+    if all:
+        # Commit each id range separately so that the whole place table
+        # isn't locked for the duration of the recount.
+        for chunk in iter_pk_chunks(Place.objects.all(), RECACHE_CHUNK_SIZE):
+            with transaction.atomic():
+                update_n_events_for_places(chunk)
+    else:
+        # also resets the n_events_changed flag
+        update_n_events_for_places(place_ids)
 
 
 def parse_time(time_str: str, default_tz=UTC_TIMEZONE) -> (datetime, bool):
@@ -1,5 +1,4 @@
 import logging
-from functools import reduce
 
 from django.conf import settings
 from django.db import models
@@ -10,6 +9,11 @@ from helsinki_gdpr.models import SerializableMixin
 from helusers.models import AbstractUser
 
 from events.models import PublicationStatus
+from events.organization_tree import get_organization_tree
+from helevents.permission_resolver import (
+    OrganizationPermissionResolver,
+    get_organization_permission_resolver,
+)
 from registrations.models import RegistrationUserAccess
 from registrations.utils import has_allowed_substitute_user_email_domain
 
@@ -167,9 +171,11 @@ class UserModelPermissionMixin:
             else:
                 return queryset.none()
 
-        publishers = self.get_admin_organizations_and_descendants()
+        publisher_ids = self._get_admin_organization_ids_and_descendants(
+            "admin_organizations"
+        )
         # distinct is not needed here, as admin_orgs and memberships should not overlap
-        return queryset.filter(publisher__in=publishers) | queryset.filter(
+        return queryset.filter(publisher_id__in=publisher_ids) | queryset.filter(
             publication_status=PublicationStatus.DRAFT,
             publisher__in=self.organization_memberships.all(),
         )
@@ -214,22 +220,28 @@ class UserModelPermissionMixin:
         ).select_related("replaced_by")
         return self._get_admin_tree_ids(admin_queryset)
 
+    def _get_admin_organization_ids_and_descendants(
+        self, relation_name: str
+    ) -> list[str]:
+        # returns ids of admin organizations and their descendants
+        admin_rel = getattr(self, relation_name, None)
+        if not admin_rel:
+            return []
+        admin_org_ids = list(admin_rel.values_list("id", flat=True))
+        if not admin_org_ids:
+            return []
+        # regular admins have rights to all organizations below their level, and
+        # admins of replaced organizations have these rights, too!
+        return get_organization_tree().get_descendant_ids_of_many(
+            admin_org_ids, include_replacements=True
+        )
+
     def _get_admin_organizations_and_descendants(self, relation_name: str):
         # returns admin organizations and their descendants
-        admin_rel = getattr(self, relation_name, None)
-        if not admin_rel or not admin_rel.all():
+        org_ids = self._get_admin_organization_ids_and_descendants(relation_name)
+        if not org_ids:
             return Organization.objects.none()
-        # regular admins have rights to all organizations below their level
-        admin_orgs = []
-        for admin_org in admin_rel.all():
-            admin_orgs.append(admin_org.get_descendants(include_self=True))
-            if admin_org.replaced_by:
-                # admins of replaced organizations have these rights, too!
-                admin_orgs.append(
-                    admin_org.replaced_by.get_descendants(include_self=True)
-                )
-        # for multiple admin_orgs, we have to combine the querysets and filter distinct
-        return reduce(lambda a, b: a | b, admin_orgs).distinct()
+        return Organization.objects.filter(id__in=org_ids)
 
     def get_admin_organizations_and_descendants(self):
         # returns admin organizations and their descendants
@@ -321,25 +333,21 @@ class User(AbstractUser, UserModelPermissionMixin, SerializableMixin):
 
         return admin_org or registration_admin_org or financial_admin_org or regular_org
 
+    @property
+    def permission_resolver(self) -> OrganizationPermissionResolver:
+        return get_organization_permission_resolver(self)
+
     def is_admin_of(self, publisher):
-        if publisher is None:
-            return False
-        return publisher in self.get_admin_organizations_and_descendants()
+        return self.permission_resolver.is_admin_of(publisher)
 
     def is_registration_admin_of(self, publisher):
-        if publisher is None:
-            return False
-        return publisher in self.get_registration_admin_organizations_and_descendants()
+        return self.permission_resolver.is_registration_admin_of(publisher)
 
     def is_financial_admin_of(self, publisher):
-        if publisher is None:
-            return False
-        return publisher in self.get_financial_admin_organizations_and_descendants()
+        return self.permission_resolver.is_financial_admin_of(publisher)
 
     def is_regular_user_of(self, publisher):
-        if publisher is None:
-            return False
-        return self.organization_memberships.filter(id=publisher.id).exists()
+        return self.permission_resolver.is_regular_user_of(publisher)
 
     def is_registration_user_access_user_of(self, registration_user_accesses):
         """Check if current user can be found in registration user accesses"""
@@ -0,0 +1,151 @@
+from bisect import bisect_right
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.utils.functional import cached_property
+
+_request_resolvers = ContextVar("organization_permission_resolvers", default=None)
+
+
+class OrganizationIntervals:
+    """
+    A set of organization subtrees stored as MPTT (tree_id, lft, rght) intervals.
+
+    Nested intervals are merged away, so the remaining intervals of a tree are
+    disjoint and sorted, and membership can be checked with a binary search.
+    """
+
+    def __init__(self, intervals):
+        intervals_by_tree = defaultdict(list)
+        for tree_id, lft, rght in intervals:
+            intervals_by_tree[tree_id].append((lft, rght))
+
+        self._trees = {}
+        for tree_id, tree_intervals in intervals_by_tree.items():
+            lfts = []
+            rghts = []
+            for lft, rght in sorted(tree_intervals):
+                # MPTT intervals are either nested or disjoint, so an interval
+                # that ends before the previous one is contained in it.
+                if rghts and rght <= rghts[-1]:
+                    continue
+                lfts.append(lft)
+                rghts.append(rght)
+            self._trees[tree_id] = (lfts, rghts)
+
+    def __bool__(self):
+        return bool(self._trees)
+
+    def contains(self, organization) -> bool:
+        """Check if the organization belongs to any of the subtrees."""
+        tree = self._trees.get(organization.tree_id)
+        if tree is None:
+            return False
+        lfts, rghts = tree
+        index = bisect_right(lfts, organization.lft) - 1
+        return index >= 0 and organization.rght <= rghts[index]
+
+
+class OrganizationPermissionResolver:
+    """
+    Answers the organization permission checks of a user from in-memory data.
+
+    The admin, registration admin and financial admin organizations of the user
+    are loaded lazily with one query per role, and cover the descendants of the
+    organizations and of their replacements. Memberships are loaded with one
+    query as a set of organization ids.
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    @staticmethod
+    def _load_intervals(organizations) -> OrganizationIntervals:
+        intervals = []
+        for row in organizations.values_list(
+            "tree_id",
+            "lft",
+            "rght",
+            "replaced_by__tree_id",
+            "replaced_by__lft",
+            "replaced_by__rght",
+        ):
+            intervals.append(row[:3])
+            if row[3] is not None:
+                # admins of replaced organizations have these rights, too!
+                intervals.append(row[3:])
+        return OrganizationIntervals(intervals)
+
+    @cached_property
+    def admin_intervals(self) -> OrganizationIntervals:
+        return self._load_intervals(self.user.admin_organizations)
+
+    @cached_property
+    def registration_admin_intervals(self) -> OrganizationIntervals:
+        return self._load_intervals(self.user.registration_admin_organizations)
+
+    @cached_property
+    def financial_admin_intervals(self) -> OrganizationIntervals:
+        return self._load_intervals(self.user.financial_admin_organizations)
+
+    @cached_property
+    def member_organization_ids(self) -> set:
+        return set(self.user.organization_memberships.values_list("id", flat=True))
+
+    def is_admin_of(self, publisher) -> bool:
+        return publisher is not None and self.admin_intervals.contains(publisher)
+
+    def is_registration_admin_of(self, publisher) -> bool:
+        return publisher is not None and self.registration_admin_intervals.contains(
+            publisher
+        )
+
+    def is_financial_admin_of(self, publisher) -> bool:
+        return publisher is not None and self.financial_admin_intervals.contains(
+            publisher
+        )
+
+    def is_regular_user_of(self, publisher) -> bool:
+        return publisher is not None and publisher.id in self.member_organization_ids
+
+
+def get_organization_permission_resolver(user) -> OrganizationPermissionResolver:
+    """
+    Return the permission resolver of the user.
+
+    Within organization_permission_scope() the resolver, and thus the loaded
+    organizations, are shared by all checks of the same user. Outside a scope
+    a new resolver is returned on every call so the checks always see the
+    current state of the database.
+    """
+    resolvers = _request_resolvers.get()
+    if resolvers is None:
+        return OrganizationPermissionResolver(user)
+
+    key = (user._meta.label, user.pk)
+    resolver = resolvers.get(key)
+    if resolver is None:
+        resolver = resolvers[key] = OrganizationPermissionResolver(user)
+    return resolver
+
+
+@contextmanager
+def organization_permission_scope():
+    """Share the permission resolvers of users until the end of the block."""
+    if _request_resolvers.get() is not None:
+        yield
+        return
+
+    token = _request_resolvers.set({})
+    try:
+        yield
+    finally:
+        _request_resolvers.reset(token)
+
+
+def clear_organization_permission_cache():
+    """Forget the resolvers of the current scope, e.g. after a role change."""
+    resolvers = _request_resolvers.get()
+    if resolvers is not None:
+        resolvers.clear()
@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from events.tests.factories import DataSourceFactory, OrganizationFactory
+from helevents.permission_resolver import (
+    OrganizationIntervals,
+    get_organization_permission_resolver,
+    organization_permission_scope,
+)
+from helevents.tests.factories import UserFactory
+
+
+def _org(tree_id, lft, rght):
+    return SimpleNamespace(tree_id=tree_id, lft=lft, rght=rght)
+
+
+@pytest.mark.parametrize(
+    "organization,expected",
+    [
+        (_org(1, 1, 10), True),
+        (_org(1, 4, 5), True),
+        (_org(1, 11, 12), False),
+        (_org(1, 20, 21), True),
+        (_org(2, 2, 3), False),
+        (_org(3, 1, 2), False),
+    ],
+)
+def test_organization_intervals_contains(organization, expected):
+    intervals = OrganizationIntervals([(1, 1, 10), (1, 3, 6), (1, 20, 25), (2, 5, 8)])
+
+    assert intervals.contains(organization) is expected
+
+
+@pytest.fixture
+def organizations():
+    data_source = DataSourceFactory()
+    org = OrganizationFactory(data_source=data_source)
+    child_org = OrganizationFactory(data_source=data_source, parent=org)
+    other_org = OrganizationFactory(data_source=data_source)
+    replacing_org = OrganizationFactory(data_source=data_source)
+    replaced_org = OrganizationFactory(
+        data_source=data_source, replaced_by=replacing_org
+    )
+    return SimpleNamespace(
+        org=org,
+        child_org=child_org,
+        other_org=other_org,
+        replacing_org=replacing_org,
+        replaced_org=replaced_org,
+    )
+
+
+@pytest.mark.django_db
+def test_resolver_permissions(organizations):
+    user = UserFactory()
+    organizations.org.admin_users.add(user)
+    organizations.replaced_org.registration_admin_users.add(user)
+    organizations.other_org.financial_admin_users.add(user)
+    organizations.child_org.regular_users.add(user)
+
+    resolver = get_organization_permission_resolver(user)
+
+    assert resolver.is_admin_of(organizations.org)
+    assert resolver.is_admin_of(organizations.child_org)
+    assert not resolver.is_admin_of(organizations.other_org)
+    assert not resolver.is_admin_of(None)
+    assert resolver.is_registration_admin_of(organizations.replaced_org)
+    assert resolver.is_registration_admin_of(organizations.replacing_org)
+    assert not resolver.is_registration_admin_of(organizations.org)
+    assert resolver.is_financial_admin_of(organizations.other_org)
+    assert not resolver.is_financial_admin_of(organizations.child_org)
+    assert resolver.is_regular_user_of(organizations.child_org)
+    assert not resolver.is_regular_user_of(organizations.org)
+
+
+@pytest.mark.django_db
+def test_resolver_is_shared_within_scope(organizations):
+    user = UserFactory()
+    organizations.org.admin_users.add(user)
+
+    with organization_permission_scope():
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(10):
+                assert user.is_admin_of(organizations.child_org)
+                assert not user.is_regular_user_of(organizations.child_org)
+        assert len(queries) == 2
+
+        # Role changes within the scope are seen by later checks
+        organizations.org.admin_users.remove(user)
+        assert not user.is_admin_of(organizations.child_org)
+
+    assert get_organization_permission_resolver(
+        user
+    ) is not get_organization_permission_resolver(user)
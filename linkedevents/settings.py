@@ -66,8 +66,13 @@ root = environ.Path(__file__) - 2  # two levels back in hierarchy
 env = environ.Env(
     ADMINS=(list, []),
     ALLOWED_HOSTS=(list, []),
+    AUDIT_LOG_BATCH_SIZE=(int, 10),
     AUDIT_LOG_ENABLED=(bool, True),
+    AUDIT_LOG_FLUSH_INTERVAL=(float, 1),
+    AUDIT_LOG_MAX_BUFFER_SIZE=(int, 10000),
+    AUDIT_LOG_MAX_OBJECT_IDS=(int, 100),
     AUTO_ENABLED_EXTENSIONS=(list, []),
+    CHANGE_FEED_DELAY=(int, 2),
     COOKIE_PREFIX=(str, "linkedevents"),
     DATABASE_URL=(str, "postgis:///linkedevents"),
     DATABASE_PASSWORD=(str, ""),
@@ -150,6 +155,7 @@ env = environ.Env(
         str,
         "https://linkedregistrations-ui-prod.apps.platta.hel.fi",
     ),
+    LOCAL_SNAPSHOT_TIMEOUT=(int, 10),
     MEDIA_ROOT=(environ.Path(), root("media")),
     MEDIA_URL=(str, "/media/"),
     # "helsinki_adfs" = Tunnistamo auth_backends.adfs.helsinki.HelsinkiADFS
@@ -201,7 +207,9 @@ env = environ.Env(
     # expiration time
     RESERVATION_GRACE_PERIOD_SECONDS=(int, 300),
     WEB_STORE_API_KEY=(str, ""),
+    WEB_STORE_API_MAX_RETRIES=(int, 3),
     WEB_STORE_API_NAMESPACE=(str, ""),
+    WEB_STORE_API_POOL_SIZE=(int, 10),
     WEB_STORE_INTEGRATION_ENABLED=(bool, False),
     WEB_STORE_ORDER_EXPIRATION_HOURS=(int, 48),
     WEB_STORE_REFUND_DEADLINE_DAYS=(int, 7),
@@ -416,6 +424,7 @@ MIDDLEWARE = [
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "events.middleware.AuthenticationCacheDisableMiddleware",
+    "events.middleware.OrganizationPermissionScopeMiddleware",
     "audit_log.middleware.AuditLogMiddleware",
     "reversion.middleware.RevisionMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -600,6 +609,8 @@ CITYSDK_API_SETTINGS = {
     "PASSWORD": "defaultCitySDKPassword",
     "SRS_URL": f"http://www.opengis.net/def/crs/EPSG/0/{PROJECTION_SRID:d}",
     "DEFAULT_POI_CATEGORY": "53562f3238653c0a842a3bf7",
+    # Number of concurrent requests made by the exporter
+    "MAX_WORKERS": 10,
 }
 
 # Used in Lippupiste importer
@@ -715,6 +726,10 @@ else:
 # Ongoing events will be cached forever
 ONGOING_EVENTS_CACHE_TIMEOUT = None
 
+# Seconds before change log entries are shown in the change feed, so that
+# entries written concurrently become visible before the feed moves past them
+CHANGE_FEED_DELAY = env("CHANGE_FEED_DELAY")
+
 if env("REDIS_URL"):
     # django.core.cache.backends.locmem.LocMemCache will be used as cache backend
     # if redis is not defined.
@@ -752,6 +767,16 @@ if env("REDIS_URL"):
         }
     }
 
+# Whether the cache is shared by all processes
+SHARED_CACHE_ENABLED = bool(env("REDIS_URL"))
+# Without the shared cache, the process-local snapshots of e.g. the organization
+# tree are reloaded after this many seconds to see the changes of other processes
+LOCAL_SNAPSHOT_TIMEOUT = env("LOCAL_SNAPSHOT_TIMEOUT")
+
+# The conditional GET validators depend on a version shared by all processes, so
+# they are only sent with the shared cache
+CONDITIONAL_GET_ENABLED = bool(env("REDIS_URL"))
+
 # this is relevant for the fulltext search as implemented in _filter_event_queryset()
 FULLTEXT_SEARCH_LANGUAGES = {"fi": "finnish", "sv": "swedish", "en": "english"}
 
@@ -803,6 +828,15 @@ ESPOO_WAIT_BETWEEN = env("ESPOO_WAIT_BETWEEN")
 
 # Audit log
 AUDIT_LOG_ENABLED = env("AUDIT_LOG_ENABLED")
+# The audit log entries are buffered and written in batches of this size, or
+# after the flush interval in seconds
+AUDIT_LOG_BATCH_SIZE = env("AUDIT_LOG_BATCH_SIZE")
+AUDIT_LOG_FLUSH_INTERVAL = env("AUDIT_LOG_FLUSH_INTERVAL")
+# The oldest entries are dropped if more than this many couldn't be written
+AUDIT_LOG_MAX_BUFFER_SIZE = env("AUDIT_LOG_MAX_BUFFER_SIZE")
+# List reads of more objects than this are logged as the query string and the
+# number of objects instead of the objects' ids
+AUDIT_LOG_MAX_OBJECT_IDS = env("AUDIT_LOG_MAX_OBJECT_IDS")
 
 RESILIENT_LOGGER = {
     "origin": "linkedevents-api",
@@ -842,6 +876,11 @@ WEB_STORE_INTEGRATION_ENABLED = env("WEB_STORE_INTEGRATION_ENABLED")  # Temporar
 WEB_STORE_API_BASE_URL = env("WEB_STORE_API_BASE_URL")
 WEB_STORE_API_KEY = env("WEB_STORE_API_KEY")
 WEB_STORE_API_NAMESPACE = env("WEB_STORE_API_NAMESPACE")
+# Number of kept-alive connections to the web store API per process
+WEB_STORE_API_POOL_SIZE = env("WEB_STORE_API_POOL_SIZE")
+# Number of retries of idempotent web store API requests after connection
+# errors and temporary unavailability
+WEB_STORE_API_MAX_RETRIES = env("WEB_STORE_API_MAX_RETRIES")
 WEB_STORE_ORDER_EXPIRATION_HOURS = env("WEB_STORE_ORDER_EXPIRATION_HOURS")
 WEB_STORE_REFUND_DEADLINE_DAYS = env("WEB_STORE_REFUND_DEADLINE_DAYS")
 WEB_STORE_WEBHOOK_API_KEY = env("WEB_STORE_WEBHOOK_API_KEY")
@@ -19,12 +19,18 @@ for language in [lang[0] for lang in LANGUAGES]:
     connection = dummy_haystack_connection_without_warnings_for_lang(language)
     HAYSTACK_CONNECTIONS.update(connection)
 
+CHANGE_FEED_DELAY = 0
+
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
     }
 }
 
+# The tests run in one process
+SHARED_CACHE_ENABLED = True
+CONDITIONAL_GET_ENABLED = True
+
 
 # Auth
 SOCIAL_AUTH_TUNNISTAMO_OIDC_ENDPOINT = "https://test_issuer"
@@ -42,6 +48,7 @@ FIELD_ENCRYPTION_KEYS = (
 )
 
 AUDIT_LOG_ENABLED = True
+AUDIT_LOG_BATCH_SIZE = 1
 
 RESILIENT_LOGGER = {
     **RESILIENT_LOGGER,
@@ -11,7 +11,9 @@ from rest_framework.test import APIClient
 from sentry_sdk.envelope import Envelope
 from sentry_sdk.transport import Transport
 
+from events.division_index import invalidate_division_index
 from events.models import DataSource
+from events.organization_tree import invalidate_organization_tree
 
 OTHER_DATA_SOURCE_ID = "testotherdatasourceid"
 
@@ -42,6 +44,18 @@ def setup_test_media(settings):
     shutil.rmtree("test_media", ignore_errors=True)
 
 
+@pytest.fixture(autouse=True)
+def invalidate_organization_tree_snapshot():
+    """Organizations of previous tests are rolled back without signals."""
+    invalidate_organization_tree()
+
+
+@pytest.fixture(autouse=True)
+def invalidate_division_index_snapshot():
+    """Divisions and places of previous tests are rolled back without signals."""
+    invalidate_division_index()
+
+
 @pytest.fixture
 def user():
     return get_user_model().objects.create(
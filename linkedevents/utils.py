@@ -1,4 +1,8 @@
+import time
+from uuid import uuid4
+
 from django.conf import settings
+from django.core.cache import cache
 from rest_framework import serializers
 
 
@@ -38,3 +42,62 @@ def validate_serializer_field_for_duplicates(values, field, error_detail_callbac
         raise serializers.ValidationError(errors)
 
     return values
+
+
+def iter_pk_chunks(queryset, chunk_size):
+    """
+    Yields lists of primary keys of the given queryset in ascending order.
+    Uses keyset pagination, so the cost of fetching a chunk doesn't grow with
+    the position in the table and rows may be modified between chunks.
+    :param queryset: the queryset to iterate
+    :param chunk_size: maximum number of primary keys in a chunk
+    :return: an iterator of primary key lists
+    """
+    pks = queryset.order_by("pk").values_list("pk", flat=True)
+    last_pk = None
+    while True:
+        chunk_qs = pks if last_pk is None else pks.filter(pk__gt=last_pk)
+        chunk = list(chunk_qs[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1]
+
+
+def get_cache_version(key):
+    """
+    Returns the version stored under the key in the shared cache, creating a new
+    version if there is none. Process-local caches compare their version to this
+    one to find out whether another process has invalidated them.
+    :param key: the cache key of the version
+    :return: the version, or None if the cache is not available
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(key):
+    """
+    Replaces the version stored under the key in the shared cache, invalidating
+    the process-local caches of all processes.
+    :param key: the cache key of the version
+    """
+    cache.set(key, uuid4().hex, timeout=None)
+
+
+def get_snapshot_version(key):
+    """
+    Returns the version process-local snapshots compare to the version they were
+    loaded with. Without a shared cache, the invalidations of other processes
+    aren't seen, so the version also changes every LOCAL_SNAPSHOT_TIMEOUT
+    seconds.
+    :param key: the cache key of the version
+    :return: the version, or None if the cache is not available
+    """
+    version = get_cache_version(key)
+    if version is None or settings.SHARED_CACHE_ENABLED:
+        return version
+    return f"{version}:{int(time.time() // settings.LOCAL_SNAPSHOT_TIMEOUT)}"
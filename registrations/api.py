@@ -5,7 +5,7 @@ from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.db import transaction
 from django.db.models import ProtectedError
-from django.http import HttpResponse
+from django.http import FileResponse, StreamingHttpResponse
 from django.template.loader import render_to_string
 from django.utils import translation
 from django.utils.timezone import localtime
@@ -45,7 +45,10 @@ from registrations.exceptions import (
     WebStoreProductMappingValidationError,
     WebStoreRefundValidationError,
 )
-from registrations.exports import RegistrationSignUpsExportXLSX
+from registrations.exports import (
+    RegistrationSignUpsExportCSV,
+    RegistrationSignUpsExportXLSX,
+)
 from registrations.filters import (
     ActionDependingBackend,
     PriceGroupFilter,
@@ -200,6 +203,20 @@ class RegistrationViewSet(
         context["registration_admin_tree_ids"] = registration_admin_tree_ids
         return context
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ("list", "retrieve"):
+            queryset = (
+                queryset.select_related("event__publisher")
+                .prefetch_related("registration_user_accesses")
+                .with_capacity_counts()
+            )
+            if settings.WEB_STORE_INTEGRATION_ENABLED:
+                queryset = queryset.select_related(
+                    "registration_merchant", "registration_account"
+                ).prefetch_related("registration_price_groups__price_group")
+        return queryset
+
     @extend_schema(
         summary="Return a list of registrations",
         description=render_to_string("swagger/registration_list_description.html"),
@@ -493,9 +510,9 @@ class RegistrationViewSet(
         )
 
     @extend_schema(
-        summary="Export attendees as an XLSX file",
+        summary="Export attendees as an XLSX or CSV file",
         description=(
-            "Registration attendees XLSX export can be made if the user has appropriate access "  # noqa: E501
+            "Registration attendees XLSX or CSV export can be made if the user has appropriate access "  # noqa: E501
             "permissions."
         ),
         parameters=[
@@ -513,6 +530,7 @@ class RegistrationViewSet(
                 200,
                 "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             ): OpenApiTypes.BINARY,
+            (200, "text/csv"): OpenApiTypes.STR,
             **get_common_api_error_responses(),
             404: OpenApiResponse(
                 description="Registration not found.",
@@ -523,7 +541,7 @@ class RegistrationViewSet(
         methods=["get"],
         detail=True,
         permission_classes=[CanAccessRegistrationSignups],
-        url_path=r"signups/export/(?P<file_format>xlsx)",
+        url_path=r"signups/export/(?P<file_format>xlsx|csv)",
     )
     def signups_export(self, request, file_format=None, pk=None, version=None):
         serializer = self.get_serializer(data=request.query_params)
@@ -533,16 +551,25 @@ class RegistrationViewSet(
         registration = self.get_object(skip_log_ids=True)
 
         with translation.override(ui_language):
-            xlsx_export = RegistrationSignUpsExportXLSX(registration)
-            xlsx = xlsx_export.get_xlsx()
-
-        response = HttpResponse(
-            xlsx,
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={
-                "Content-Disposition": 'attachment; filename="registered_persons.xlsx"'
-            },
-        )
+            if file_format == "csv":
+                csv_export = RegistrationSignUpsExportCSV(registration)
+                response = StreamingHttpResponse(
+                    csv_export.iter_csv(),
+                    content_type="text/csv",
+                    headers={
+                        "Content-Disposition": (
+                            'attachment; filename="registered_persons.csv"'
+                        )
+                    },
+                )
+            else:
+                xlsx_export = RegistrationSignUpsExportXLSX(registration)
+                response = FileResponse(
+                    xlsx_export.get_xlsx(),
+                    as_attachment=True,
+                    filename="registered_persons.xlsx",
+                    content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                )
 
         self._add_audit_logged_object_ids(registration.signups.all().only("pk"))
 
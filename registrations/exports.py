@@ -1,4 +1,7 @@
+import csv
 import io
+import tempfile
+from datetime import date
 
 from django.utils import translation
 from django.utils.translation import gettext as _
@@ -7,14 +10,46 @@ from xlsxwriter.worksheet import Worksheet
 
 from registrations.models import Registration
 
+# Excel's maximum column width in characters
+MAX_COLUMN_WIDTH = 255
+
+# Cells starting with these are evaluated as formulas by spreadsheet applications
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _escape_csv_value(value):
+    """Quote user-entered values that a spreadsheet would run as formulas."""
+    if isinstance(value, date):
+        return value.isoformat()
+    # Keep the placeholder of empty values as it is
+    if (
+        isinstance(value, str)
+        and value != "-"
+        and value.startswith(CSV_FORMULA_PREFIXES)
+    ):
+        return f"'{value}"
+    return value
+
+
+class RegistrationSignUpsExport:
+    """
+    Base class for the exports of a registration's signups. The signups are
+    iterated in chunks together with their contact persons and protected data
+    so that the memory use doesn't depend on the number of signups.
+    """
+
+    chunk_size = 2000
 
-class RegistrationSignUpsExportXLSX:
     def __init__(self, registration: Registration) -> None:
         self.worksheet_header = "{event_name} - {registered_persons}".format(
             event_name=registration.event.name,
             registered_persons=_("Registered persons"),
         )
 
+        # The rows may be produced while streaming the response, i.e. after
+        # the view has deactivated the export's language
+        self.language = translation.get_language()
+
         self.signups = (
             registration.signups.all()
             .select_related(
@@ -33,13 +68,6 @@ class RegistrationSignUpsExportXLSX:
         )
 
         self.columns = self._get_columns()
-        self.formats = {}
-
-        self.date_formats = {
-            "fi": "dd.mm.yyyy",
-            "sv": "dd.mm.yyyy",
-            "en": "dd mmm yyyy",
-        }
 
     @staticmethod
     def _get_columns() -> list[dict]:
@@ -78,8 +106,39 @@ class RegistrationSignUpsExportXLSX:
             },
         ]
 
+    def _iter_signups_table_rows(self):
+        with translation.override(self.language):
+            for signup in self.signups.iterator(chunk_size=self.chunk_size):
+                signup_data = []
+
+                for column in self.columns:
+                    if callable(column["accessor"]):
+                        col_value = column["accessor"](signup)
+                    else:
+                        col_value = getattr(signup, column["accessor"], None)
+
+                    signup_data.append(col_value or "-")
+
+                yield signup_data
+
+
+class RegistrationSignUpsExportXLSX(RegistrationSignUpsExport):
+    def __init__(self, registration: Registration) -> None:
+        super().__init__(registration)
+
+        self.formats = {}
+
+        self.date_formats = {
+            "fi": "dd.mm.yyyy",
+            "sv": "dd.mm.yyyy",
+            "en": "dd mmm yyyy",
+        }
+
     @staticmethod
     def _add_info_texts(worksheet: Worksheet, row: int = 1) -> None:
+        # In constant memory mode, the rows' options must be set before the rows
+        # are written.
+        worksheet.set_row(row, 40)
         worksheet.write(
             row,
             0,
@@ -90,8 +149,8 @@ class RegistrationSignUpsExportXLSX:
                 "attendees have been entered into the system."
             ),
         )
-        worksheet.set_row(row, 40)
 
+        worksheet.set_row(row + 1, 20)
         worksheet.write(
             row + 1,
             0,
@@ -100,66 +159,56 @@ class RegistrationSignUpsExportXLSX:
                 "may be the information of different persons."
             ),
         )
-        worksheet.set_row(row + 1, 20)
-
-    def _get_signups_table_columns(self) -> list[dict]:
-        table_columns = [
-            {
-                "header": column["header"],
-                "format": (
-                    self.formats.get(column["format"]) if "format" in column else None
-                ),
-            }
-            for column in self.columns
-        ]
-
-        return table_columns
-
-    def _get_signups_table_data(self) -> list[list]:
-        table_data = []
 
-        for signup in self.signups:
-            signup_data = []
-
-            for column in self.columns:
-                if callable(column["accessor"]):
-                    col_value = column["accessor"](signup)
-                else:
-                    col_value = getattr(signup, column["accessor"], None)
-
-                signup_data.append(col_value or "-")
-
-            table_data.append(signup_data)
-
-        return table_data
-
-    def _add_signups_table(self, worksheet: Worksheet, row: int = 4) -> None:
-        table_columns = self._get_signups_table_columns()
-        table_data = self._get_signups_table_data()
-
-        worksheet.add_table(
-            row,
-            0,
-            row + len(table_data),
-            len(self.columns) - 1,
-            {
-                "columns": table_columns,
-                "data": table_data,
-            },
-        )
-
-    def get_xlsx(self) -> bytes:
-        output = io.BytesIO()
-
-        with Workbook(output, {"in_memory": True}) as workbook:
+    def _get_date_format(self) -> str:
+        return self.date_formats.get(self.language, self.date_formats["fi"])
+
+    def _get_cell_width(self, value) -> int:
+        if isinstance(value, date):
+            return len(self._get_date_format())
+        return max(len(line) for line in str(value).split("\n"))
+
+    def _add_signups_table(self, worksheet: Worksheet, row: int = 4) -> list[int]:
+        """
+        Write the signups table row by row and return the widths of the
+        table's columns.
+        """
+        column_widths = []
+
+        for col, column in enumerate(self.columns):
+            worksheet.write(row, col, column["header"], self.formats["bold"])
+            column_widths.append(self._get_cell_width(column["header"]))
+
+        last_row = row
+        for last_row, signup_data in enumerate(
+            self._iter_signups_table_rows(), start=row + 1
+        ):
+            for col, (column, value) in enumerate(zip(self.columns, signup_data)):
+                worksheet.write(
+                    last_row, col, value, self.formats.get(column.get("format"))
+                )
+                column_widths[col] = max(
+                    column_widths[col], self._get_cell_width(value)
+                )
+
+        worksheet.autofilter(row, 0, last_row, len(self.columns) - 1)
+
+        return column_widths
+
+    def get_xlsx(self):
+        """
+        Return the export as a temporary file positioned at its beginning. The
+        worksheet is written in constant memory mode, i.e. each row is flushed
+        to disk once the next one is started, so the rows must be written in
+        order.
+        """
+        output = tempfile.TemporaryFile()
+
+        with Workbook(output, {"constant_memory": True}) as workbook:
             # Add formatting options.
             self.formats["bold"] = workbook.add_format({"bold": True})
             self.formats["date_format"] = workbook.add_format(
-                {
-                    "num_format": self.date_formats.get(
-                        translation.get_language(), self.date_formats["fi"]
-                    ),
-                }
+                {"num_format": self._get_date_format()}
             )
 
             # Add a worksheet.
@@ -168,14 +217,39 @@ class RegistrationSignUpsExportXLSX:
             # Add the worksheet's title to the beginning of the worksheet.
             worksheet.write(0, 0, self.worksheet_header, self.formats["bold"])
 
+            # Add info texts about data protection and contact information.
+            self._add_info_texts(worksheet, 2)
+
             # Add a table containing the signups' data.
-            self._add_signups_table(worksheet, 6)
+            column_widths = self._add_signups_table(worksheet, 6)
 
-            # Automatically try to adjust signup table column widths to make values
-            # visible in the columns.
-            worksheet.autofit()
+            # Adjust signup table column widths to make values visible in the
+            # columns. Autofit isn't available in constant memory mode, so the
+            # widths are computed while writing the rows.
+            column_widths[0] = max(
+                column_widths[0], self._get_cell_width(self.worksheet_header)
+            )
+            for col, width in enumerate(column_widths):
+                worksheet.set_column(col, col, min(width + 1, MAX_COLUMN_WIDTH))
 
-            # Add info texts about data protection and contact information.
-            self._add_info_texts(worksheet, 2)
+        output.seek(0)
+
+        return output
+
+
+class RegistrationSignUpsExportCSV(RegistrationSignUpsExport):
+    def iter_csv(self):
+        """Yield the export's CSV lines, starting with a header line."""
+        buffer = io.StringIO()
+        # Let spreadsheet applications detect the encoding
+        buffer.write("\ufeff")
+        writer = csv.writer(buffer)
+        writer.writerow([column["header"] for column in self.columns])
+
+        for signup_data in self._iter_signups_table_rows():
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow([_escape_csv_value(value) for value in signup_data])
 
-        return output.getvalue()
+        yield buffer.getvalue()
@@ -6,16 +6,34 @@ from django.db import transaction
 from django.db.models.functions import Greatest
 from django.utils.timezone import localtime
 
-from registrations.models import SignUp, SignUpGroup
+from registrations.models import (
+    SignUp,
+    SignUpContactPerson,
+    SignUpGroup,
+    SignUpGroupProtectedData,
+    SignUpProtectedData,
+    anonymize_replacement,
+)
+
+BATCH_SIZE = 1000
 
 
 class Command(BaseCommand):
     help = (
         "Anonymize signups and signup groups of the registration with past "
         "enrolment times. The threshold of anonymization can be specified as "
-        "days in the ANONYMIZATION_THRESHOLD_DAYS environment variable."
+        "days in the ANONYMIZATION_THRESHOLD_DAYS environment variable. The "
+        "objects are anonymized in batches that are committed one at a time."
     )
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Number of signups or signup groups anonymized per transaction",
+        )
+
     def _build_compare_time_annotation(self):
         return {
             "compare_time": Greatest(
@@ -24,42 +42,110 @@ class Command(BaseCommand):
             ),
         }
 
+    def _iter_past_id_batches(self, model, threshold_time, batch_size):
+        """Yield the ids of the objects to anonymize in batches in id order."""
+        queryset = (
+            model.objects.annotate(**self._build_compare_time_annotation())
+            .filter(
+                compare_time__lt=threshold_time,
+                anonymization_time__isnull=True,
+            )
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+        last_id = 0
+        while ids := list(queryset.filter(pk__gt=last_id)[:batch_size]):
+            yield ids
+            last_id = ids[-1]
+
+    @staticmethod
+    def _lock_not_anonymized(queryset):
+        return list(
+            queryset.select_for_update()
+            .filter(anonymization_time__isnull=True)
+            .values_list("pk", flat=True)
+        )
+
+    @staticmethod
+    def _anonymize_contact_persons(**filters):
+        SignUpContactPerson.all_objects.filter(**filters).update(
+            email=anonymize_replacement,
+            phone_number=anonymize_replacement,
+            first_name=anonymize_replacement,
+            last_name=anonymize_replacement,
+            membership_number=anonymize_replacement,
+        )
+
+    def _anonymize_signups(self, ids, anonymization_time):
+        """The same as calling SignUp.anonymize() for each of the signups."""
+        self._anonymize_contact_persons(signup_id__in=ids)
+        SignUpProtectedData.all_objects.filter(signup_id__in=ids).update(
+            extra_info=None
+        )
+        SignUp.objects.filter(pk__in=ids).update(
+            first_name=anonymize_replacement,
+            last_name=anonymize_replacement,
+            street_address=anonymize_replacement,
+            anonymization_time=anonymization_time,
+            created_by=None,
+            last_modified_by=None,
+            last_modified_time=anonymization_time,
+        )
+
+    def _anonymize_signup_groups(self, ids, anonymization_time):
+        """The same as calling SignUpGroup.anonymize() for each of the groups."""
+        self._anonymize_contact_persons(signup_group_id__in=ids)
+        SignUpGroupProtectedData.all_objects.filter(signup_group_id__in=ids).update(
+            extra_info=None
+        )
+        signup_ids = self._lock_not_anonymized(
+            SignUp.objects.filter(signup_group_id__in=ids)
+        )
+        self._anonymize_signups(signup_ids, anonymization_time)
+        SignUpGroup.objects.filter(pk__in=ids).update(
+            anonymization_time=anonymization_time,
+            created_by=None,
+            last_modified_by=None,
+            last_modified_time=anonymization_time,
+        )
+
+    def _anonymize_in_batches(self, model, anonymize, threshold_time, batch_size, name):
+        count = 0
+
+        for batch in self._iter_past_id_batches(model, threshold_time, batch_size):
+            with transaction.atomic():
+                # Skip the objects anonymized after the batch was selected
+                ids = self._lock_not_anonymized(model.objects.filter(pk__in=batch))
+                anonymize(ids, localtime())
+
+            count += len(ids)
+            self.stdout.write(f"{count} {name} anonymized so far")
+
+        return count
+
     def handle(self, *args, **options):
         threshold_time = localtime() - timedelta(
             days=settings.ANONYMIZATION_THRESHOLD_DAYS
         )
+        batch_size = options["batch_size"]
 
         # Anonymize all the signup groups and the related signups
         self.stdout.write(
             "Start anonymizing past signup groups and the related signups"
         )
-        signup_groups = (
-            SignUpGroup.objects.prefetch_related("signups")
-            .annotate(**self._build_compare_time_annotation())
-            .select_for_update()
-            .filter(
-                compare_time__lt=threshold_time,
-                anonymization_time__isnull=True,
-            )
+        count = self._anonymize_in_batches(
+            SignUpGroup,
+            self._anonymize_signup_groups,
+            threshold_time,
+            batch_size,
+            "signup groups",
         )
-
-        with transaction.atomic():
-            for signup_group in signup_groups:
-                signup_group.anonymize()
-        self.stdout.write(f"{len(signup_groups)} signup groups anonymized")
+        self.stdout.write(f"{count} signup groups anonymized")
 
         # Anonymize all signups without a group
         self.stdout.write("Start anonymizing past signups")
-        signups = (
-            SignUp.objects.annotate(**self._build_compare_time_annotation())
-            .select_for_update()
-            .filter(
-                compare_time__lt=threshold_time,
-                anonymization_time__isnull=True,
-            )
+        count = self._anonymize_in_batches(
+            SignUp, self._anonymize_signups, threshold_time, batch_size, "signups"
         )
-
-        with transaction.atomic():
-            for signup in signups:
-                signup.anonymize()
-        self.stdout.write(f"{len(signups)} signups anonymized")
+        self.stdout.write(f"{count} signups anonymized")
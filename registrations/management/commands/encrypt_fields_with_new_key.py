@@ -1,30 +1,264 @@
-from django.core.management import BaseCommand
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import batched
+from math import ceil
+from multiprocessing import get_context
+
+from django.apps import apps
+from django.core.management import BaseCommand, CommandError
 from django.db import transaction
+from django.db.models import BinaryField, Value
+from django.db.models.functions import Cast
 
 from registrations.models import SignUpGroupProtectedData, SignUpProtectedData
 
+CHUNK_SIZE = 1000
+
+# The file that the progress of an interrupted run is read from and written to
+CHECKPOINT_FILE = os.path.join(
+    tempfile.gettempdir(), "encrypt_fields_with_new_key.json"
+)
+
+ENCRYPTED_FIELDS = {
+    SignUpGroupProtectedData: ["extra_info"],
+    SignUpProtectedData: ["extra_info", "date_of_birth"],
+}
+
+
+def _get_fields(model_label, field_names):
+    model = apps.get_model(model_label)
+    return [model._meta.get_field(field_name) for field_name in field_names]
+
+
+def _is_encrypted_with_primary_key(field, value):
+    primary_key_field = copy.copy(field)
+    primary_key_field.keys = field.keys[:1]
+    try:
+        primary_key_field.decrypt(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _reencrypt_rows(model_label, field_names, rows):
+    """
+    Return the rows whose values aren't all encrypted with the primary key, with
+    their values encrypted with it.
+    """
+    fields = _get_fields(model_label, field_names)
+    reencrypted_rows = []
+
+    for pk, *values in rows:
+        new_values = [
+            value
+            if value is None or _is_encrypted_with_primary_key(field, value)
+            else field.encrypt(field.decrypt(value))
+            for field, value in zip(fields, values)
+        ]
+        if new_values != values:
+            reencrypted_rows.append((pk, *new_values))
+
+    return reencrypted_rows
+
+
+def _count_rows_not_encrypted_with_primary_key(model_label, field_names, rows):
+    fields = _get_fields(model_label, field_names)
+
+    return sum(
+        any(
+            value is not None and not _is_encrypted_with_primary_key(field, value)
+            for field, value in zip(fields, values)
+        )
+        for pk, *values in rows
+    )
+
 
 class Command(BaseCommand):
     help = (
         "Encrypts existing encrypted data with a new encryption key. Please remember to prepend "  # noqa: E501
         "the new key to the secrets value of the FIELD_ENCRYPTION_KEYS setting before running "  # noqa: E501
-        "this command."
+        "this command. The rows are re-encrypted in chunks that are committed one at a time, "  # noqa: E501
+        "and an interrupted run continues from the last committed chunk saved in the "
+        "checkpoint file."
     )
 
-    def handle(self, *args, **options):
-        signup_group_protected_data = (
-            SignUpGroupProtectedData.objects.select_for_update().all()
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CHUNK_SIZE,
+            help="Number of rows re-encrypted per transaction",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of processes encrypting the data",
+        )
+        parser.add_argument(
+            "--checkpoint-file",
+            default=CHECKPOINT_FILE,
+            help="File where the progress is saved for continuing an interrupted run",
         )
-        signup_protected_data = SignUpProtectedData.objects.select_for_update().all()
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore the checkpoint of an interrupted run",
+        )
+
+    @staticmethod
+    def _get_checkpoint_key(model):
+        primary_key = model._meta.get_field(ENCRYPTED_FIELDS[model][0]).keys[0]
+        key_hash = hashlib.sha256(primary_key.encode()).hexdigest()[:16]
+        return f"encrypt_fields_with_new_key:{key_hash}:{model._meta.label_lower}"
 
-        group_update_fields = ["extra_info"]
-        signup_update_fields = ["extra_info", "date_of_birth"]
+    def _read_checkpoints(self):
+        try:
+            with open(self.checkpoint_file) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write_checkpoint(self, checkpoint_key, last_pk):
+        """Save the last re-encrypted id, or remove the checkpoint if it's None."""
+        checkpoints = self._read_checkpoints()
+        if last_pk is None:
+            checkpoints.pop(checkpoint_key, None)
+        else:
+            checkpoints[checkpoint_key] = last_pk
+
+        # Replace the file at once so that an interrupted write can't corrupt it
+        temp_file = f"{self.checkpoint_file}.tmp"
+        with open(temp_file, "w") as f:
+            json.dump(checkpoints, f)
+        os.replace(temp_file, self.checkpoint_file)
+
+    @staticmethod
+    def _get_raw_values_queryset(model):
+        """Return the rows' primary keys and encrypted values without decrypting."""
+        field_names = ENCRYPTED_FIELDS[model]
+        return (
+            model.all_objects.annotate(
+                **{
+                    f"raw_{field_name}": Cast(field_name, BinaryField())
+                    for field_name in field_names
+                }
+            )
+            .order_by("pk")
+            .values_list("pk", *(f"raw_{field_name}" for field_name in field_names))
+        )
+
+    @staticmethod
+    def _to_bytes(rows):
+        return [
+            (pk, *(None if value is None else bytes(value) for value in values))
+            for pk, *values in rows
+        ]
+
+    def _map(self, executor, func, model, rows):
+        """Call func for batches of the rows in the worker processes."""
+        func = partial(func, model._meta.label, ENCRYPTED_FIELDS[model])
+        if executor is None:
+            return [func(rows)]
+
+        return executor.map(func, batched(rows, ceil(len(rows) / self.workers)))
+
+    def _reencrypt_model(self, executor, model, restart):
+        field_names = ENCRYPTED_FIELDS[model]
+        checkpoint_key = self._get_checkpoint_key(model)
+        last_pk = 0 if restart else self._read_checkpoints().get(checkpoint_key, 0)
+        if last_pk:
+            self.stdout.write(f"{model._meta.label}: continuing after id {last_pk}")
+
+        queryset = self._get_raw_values_queryset(model)
+        checked = reencrypted = 0
+        start_time = time.monotonic()
+
+        while True:
+            with transaction.atomic():
+                rows = self._to_bytes(
+                    queryset.select_for_update().filter(pk__gt=last_pk)[
+                        : self.chunk_size
+                    ]
+                )
+                if not rows:
+                    break
+
+                objs = [
+                    model(
+                        pk=pk,
+                        **{
+                            field_name: Value(value, output_field=BinaryField())
+                            for field_name, value in zip(field_names, values)
+                        },
+                    )
+                    for batch in self._map(executor, _reencrypt_rows, model, rows)
+                    for pk, *values in batch
+                ]
+                model.all_objects.bulk_update(objs, field_names)
+
+            last_pk = rows[-1][0]
+            self._write_checkpoint(checkpoint_key, last_pk)
+
+            checked += len(rows)
+            reencrypted += len(objs)
+            rate = checked / (time.monotonic() - start_time)
+            self.stdout.write(
+                f"{model._meta.label}: {checked} rows checked, {reencrypted} "
+                f"re-encrypted ({rate:.0f} rows/s)"
+            )
+
+        self._write_checkpoint(checkpoint_key, None)
+
+    def _verify_model(self, executor, model):
+        queryset = self._get_raw_values_queryset(model)
+        last_pk = 0
+        count = 0
+
+        while rows := self._to_bytes(
+            queryset.filter(pk__gt=last_pk)[: self.chunk_size]
+        ):
+            count += sum(
+                self._map(
+                    executor, _count_rows_not_encrypted_with_primary_key, model, rows
+                )
+            )
+            last_pk = rows[-1][0]
+
+        return count
+
+    def handle(self, *args, **options):
+        self.chunk_size = options["chunk_size"]
+        self.workers = options["workers"] or 1
+        self.checkpoint_file = options["checkpoint_file"]
+
+        # The workers are forked so that they share the configured models and
+        # encryption keys. They don't use the database connection.
+        executor = (
+            ProcessPoolExecutor(self.workers, mp_context=get_context("fork"))
+            if self.workers > 1
+            else None
+        )
 
-        with transaction.atomic():
-            for group_data in signup_group_protected_data:
-                # Simply saving will cause the encrypted data to be fetched
-                # and then saved with the new encryption key.
-                group_data.save(update_fields=group_update_fields)
+        try:
+            for model in ENCRYPTED_FIELDS:
+                self._reencrypt_model(executor, model, options["restart"])
 
-            for signup_data in signup_protected_data:
-                signup_data.save(update_fields=signup_update_fields)
+            for model in ENCRYPTED_FIELDS:
+                if count := self._verify_model(executor, model):
+                    raise CommandError(
+                        f"{model._meta.label}: {count} rows aren't encrypted with "
+                        f"the new key"
+                    )
+                self.stdout.write(
+                    f"{model._meta.label}: all rows are encrypted with the new key"
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown()
@@ -28,6 +28,17 @@ class Command(BaseCommand):
         "payment exists in the Talpa web store for them."
     )
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help=(
+                "Number of concurrent requests to the Talpa API, defaults to "
+                "WEB_STORE_API_POOL_SIZE"
+            ),
+        )
+
     @staticmethod
     def _handle_payment_paid(payment):
         payment.status = SignUpPayment.PaymentStatus.PAID
@@ -40,26 +51,10 @@ class Command(BaseCommand):
         WebStorePaymentWebhookViewSet.cancel_signup(payment.signup_or_signup_group)
 
     @staticmethod
-    def _handle_payment_expired(payment, order_api_client):
+    def _handle_payment_expired(payment):
         payment.status = SignUpPayment.PaymentStatus.EXPIRED
         payment.save(update_fields=["status"])
 
-        user = getattr(payment, "created_by", None)
-
-        try:
-            # Talpa recommends to cancel the order in this case.
-            order_api_client.cancel_order(
-                payment.external_order_id, user_uuid=str(getattr(user, "uuid", ""))
-            )
-        except RequestException as exc:
-            status_code = getattr(exc.response, "status_code", None)
-
-            logger.error(
-                f"mark_payments_expired: an error occurred while cancelling order "
-                f"in the Talpa API (payment ID: {payment.pk}, order ID: "
-                f"{payment.external_order_id}, response.status_code: {status_code})"
-            )
-
         signup_or_signup_group = payment.signup_or_signup_group
 
         if getattr(signup_or_signup_group, "is_attending", None) or getattr(
@@ -73,6 +68,41 @@ class Command(BaseCommand):
 
         signup_or_signup_group.soft_delete()
 
+    @staticmethod
+    def _log_order_cancellation_error(payment, exc):
+        status_code = getattr(exc.response, "status_code", None)
+
+        logger.error(
+            f"mark_payments_expired: an error occurred while cancelling order "
+            f"in the Talpa API (payment ID: {payment.pk}, order ID: "
+            f"{payment.external_order_id}, response.status_code: {status_code})"
+        )
+
+    @staticmethod
+    def _get_payment_json(payment, result):
+        """
+        Return the payment's data in the Talpa API, an empty dict if there is no
+        payment or None if the request failed.
+        """
+        if not isinstance(result, RequestException):
+            return result
+
+        status_code = getattr(result.response, "status_code", None)
+
+        if status_code and status_code == status.HTTP_404_NOT_FOUND:
+            # No payment found from Talpa => continue payment expiry
+            # processing.
+            return {}
+
+        # Request failed => log error and skip processing for this
+        # payment.
+        logger.error(
+            f"mark_payments_expired: an error occurred while fetching payment "
+            f"from the Talpa API (payment ID: {payment.pk}, order ID: "
+            f"{payment.external_order_id}, response.status_code: {status_code})"
+        )
+        return None
+
     def handle(self, *args, **options):
         payment_api_client = WebStorePaymentAPIClient()
         order_api_client = WebStoreOrderAPIClient()
@@ -80,41 +110,50 @@ class Command(BaseCommand):
         local_tz = ZoneInfo(settings.TIME_ZONE)
         utc_tz = ZoneInfo("UTC")
 
-        expired_payments = SignUpPayment.objects.select_for_update().filter(
-            status=SignUpPayment.PaymentStatus.CREATED,
-            expires_at__lt=datetime_now,
+        expired_payments_filter = {
+            "status": SignUpPayment.PaymentStatus.CREATED,
+            "expires_at__lt": datetime_now,
+        }
+        expired_payments = list(
+            SignUpPayment.objects.filter(**expired_payments_filter).only(
+                "pk", "external_order_id"
+            )
+        )
+
+        # The Talpa API is queried concurrently and without holding locks on the
+        # payments, so that webhook requests aren't blocked.
+        results = payment_api_client.get_payments(
+            [payment.external_order_id for payment in expired_payments],
+            max_workers=options["workers"],
         )
 
-        with transaction.atomic():
-            for payment in expired_payments:
-                try:
-                    resp_json = payment_api_client.get_payment(
-                        payment.external_order_id
-                    )
-                except RequestException as exc:
-                    status_code = getattr(exc.response, "status_code", None)
-
-                    if status_code and status_code == status.HTTP_404_NOT_FOUND:
-                        # No payment found from Talpa => continue payment expiry
-                        # processing.
-                        resp_json = {}
-                    else:
-                        # Request failed => log error and skip processing for this
-                        # payment.
-                        logger.error(
-                            f"mark_payments_expired: an error occurred while fetching payment "  # noqa: E501
-                            f"from the Talpa API (payment ID: {payment.pk}, order ID: "
-                            f"{payment.external_order_id}, response.status_code: {status_code})"  # noqa: E501
-                        )
-                        continue
+        cancelled_order_payments = []
+        for expired_payment in expired_payments:
+            resp_json = self._get_payment_json(
+                expired_payment, results[expired_payment.external_order_id]
+            )
+            if resp_json is None:
+                continue
+
+            with transaction.atomic():
+                # A locked payment is being processed e.g. by the payment
+                # webhook => skip it and check again on the next run.
+                payment = (
+                    SignUpPayment.objects.select_related("created_by")
+                    .select_for_update(skip_locked=True, of=("self",))
+                    .filter(pk=expired_payment.pk, **expired_payments_filter)
+                    .first()
+                )
+                if payment is None:
+                    continue
 
                 if resp_json.get("status") == WebStorePaymentStatus.PAID.value:
                     # Payment exists and is paid => mark our payment as paid and notify contact  # noqa: E501
                     # person.
                     self._handle_payment_paid(payment)
                 elif resp_json.get("status") == WebStorePaymentStatus.CANCELLED.value:
-                    # Payment exists and is cancelled => delete our payment and related
-                    # signup.
+                    # Payment exists and is cancelled => delete our payment and
+                    # related signup.
                     self._handle_payment_cancelled(payment)
                 elif (
                     resp_json.get("status") == WebStorePaymentStatus.CREATED.value
@@ -130,6 +169,20 @@ class Command(BaseCommand):
                     # payment => check again later.
                     pass
                 else:
-                    # Payment is expired => Mark our payment as expired and notify
-                    # contact person.
-                    self._handle_payment_expired(payment, order_api_client)
+                    # Payment is expired => Mark our payment as expired and
+                    # notify contact person.
+                    self._handle_payment_expired(payment)
+                    cancelled_order_payments.append(payment)
+
+        # Talpa recommends to cancel the order in this case.
+        results = order_api_client.cancel_orders(
+            {
+                payment.external_order_id: str(getattr(payment.created_by, "uuid", ""))
+                for payment in cancelled_order_payments
+            },
+            max_workers=options["workers"],
+        )
+        for payment in cancelled_order_payments:
+            result = results[payment.external_order_id]
+            if isinstance(result, RequestException):
+                self._log_order_cancellation_error(payment, result)
@@ -12,13 +12,17 @@ from django.core.mail import EmailMultiAlternatives, send_mail
 from django.core.validators import MinValueValidator
 from django.db import models, transaction
 from django.db.models import (
+    Count,
     DateTimeField,
     ExpressionWrapper,
     F,
+    OuterRef,
     Q,
+    Subquery,
     Sum,
     UniqueConstraint,
 )
+from django.db.models.functions import Coalesce
 from django.forms.fields import MultipleChoiceField
 from django.template.loader import render_to_string
 from django.utils import translation
@@ -430,7 +434,63 @@ class PriceGroup(CreatedModifiedBaseModel):
         return self.description
 
 
+def _filter_active_seat_reservations(reservations):
+    return (
+        # Calculate expiration time for each reservation
+        reservations.annotate(
+            expires_at=ExpressionWrapper(
+                F("timestamp")
+                + timedelta(minutes=1) * code_validity_duration(F("seats")),
+                output_field=DateTimeField(),
+            )
+        )
+        # Filter to get all not expired reservations
+        .filter(expires_at__gte=localtime())
+    )
+
+
+class RegistrationQuerySet(models.QuerySet):
+    def with_capacity_counts(self):
+        """
+        Annotate the attendee and waiting list counts and the amount of reserved
+        seats that the capacity calculations of Registration need, so that they
+        are not queried separately for each registration.
+        """
+        reserved_seats = (
+            _filter_active_seat_reservations(
+                SeatReservationCode.objects.filter(registration=OuterRef("pk"))
+            )
+            .values("registration")
+            .annotate(seats_sum=Sum("seats", output_field=models.IntegerField()))
+            .values("seats_sum")
+        )
+        active_signups = Q(signups__deleted=False)
+
+        # The annotations have the same names as the cached properties of
+        # Registration, which are then never evaluated
+        return self.annotate(
+            current_attendee_count=Count(
+                "signups",
+                filter=active_signups
+                & Q(
+                    signups__attendee_status__in=(
+                        SignUp.AttendeeStatus.ATTENDING,
+                        SignUp.AttendeeStatus.AWAITING_PAYMENT,
+                    )
+                ),
+            ),
+            current_waiting_list_count=Count(
+                "signups",
+                filter=active_signups
+                & Q(signups__attendee_status=SignUp.AttendeeStatus.WAITING_LIST),
+            ),
+            reserved_seats_amount=Coalesce(Subquery(reserved_seats), 0),
+        )
+
+
 class Registration(CreatedModifiedBaseModel):
+    objects = RegistrationQuerySet.as_manager()
+
     event = models.OneToOneField(
         Event,
         on_delete=models.CASCADE,
@@ -551,16 +611,7 @@ class Registration(CreatedModifiedBaseModel):
     @cached_property
     def reserved_seats_amount(self):
         return (
-            # Calculate expiration time for each reservation
-            self.reservations.annotate(
-                expires_at=ExpressionWrapper(
-                    F("timestamp")
-                    + timedelta(minutes=1) * code_validity_duration(F("seats")),
-                    output_field=DateTimeField(),
-                )
-            )
-            # Filter to get all not expired reservations
-            .filter(expires_at__gte=localtime())
+            _filter_active_seat_reservations(self.reservations.all())
             # Sum  seats of not expired reservation
             .aggregate(seats_sum=Sum("seats", output_field=models.IntegerField()))[
                 "seats_sum"
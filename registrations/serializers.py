@@ -1120,11 +1120,11 @@ class RegistrationSerializer(LinkedEventsSerializer, CreatedModifiedBaseSerializ
 
     @extend_schema_field(OpenApiTypes.STR)
     def get_data_source(self, obj):
-        return obj.data_source.id
+        return obj.event.data_source_id
 
     @extend_schema_field(OpenApiTypes.STR)
     def get_publisher(self, obj):
-        return obj.publisher.id
+        return obj.event.publisher_id
 
     @extend_schema_field(
         {
@@ -5,10 +5,14 @@ from django.core.management import call_command
 from django.utils.timezone import localtime
 
 from events.tests.factories import EventFactory
+from registrations.models import anonymize_replacement
 from registrations.tests.factories import (
     RegistrationFactory,
+    SignUpContactPersonFactory,
     SignUpFactory,
     SignUpGroupFactory,
+    SignUpGroupProtectedDataFactory,
+    SignUpProtectedDataFactory,
 )
 
 
@@ -102,3 +106,49 @@ def test_anonymize_if_enrolment_end_time_and_end_time_are_over_30_days_in_past()
     assert signup_group.anonymization_time is not None
     assert signup_in_group.anonymization_time is not None
     assert signup.anonymization_time is not None
+
+
+@pytest.mark.django_db
+def test_anonymize_past_signups_in_batches(user):
+    registration = RegistrationFactory(
+        event=EventFactory(end_time=localtime() - timedelta(days=31))
+    )
+    signup_group = SignUpGroupFactory(registration=registration, created_by=user)
+    SignUpGroupProtectedDataFactory(
+        registration=registration, signup_group=signup_group, extra_info="Info"
+    )
+    group_contact_person = SignUpContactPersonFactory(
+        signup_group=signup_group, email="group@test.com"
+    )
+    signups = SignUpFactory.create_batch(
+        2, registration=registration, signup_group=signup_group
+    )
+    signups += SignUpFactory.create_batch(
+        3, registration=registration, first_name="Name", created_by=user
+    )
+    contact_person = SignUpContactPersonFactory(
+        signup=signups[2], email="signup@test.com", phone_number="0441234567"
+    )
+    protected_data = SignUpProtectedDataFactory(
+        registration=registration, signup=signups[3], extra_info="Info"
+    )
+
+    call_command("anonymize_past_signups", batch_size=2)
+
+    signup_group.refresh_from_db()
+    assert signup_group.anonymization_time is not None
+    assert signup_group.created_by is None
+    assert signup_group.protected_data.extra_info is None
+    group_contact_person.refresh_from_db()
+    assert group_contact_person.email == anonymize_replacement
+    for signup in signups:
+        signup.refresh_from_db()
+        assert signup.anonymization_time is not None
+        assert signup.first_name == anonymize_replacement
+        assert signup.street_address == anonymize_replacement
+        assert signup.created_by is None
+    contact_person.refresh_from_db()
+    assert contact_person.email == anonymize_replacement
+    assert contact_person.phone_number == anonymize_replacement
+    protected_data.refresh_from_db()
+    assert protected_data.extra_info is None
@@ -1,17 +1,34 @@
+import json
+
 import pytest
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
 
+from registrations.management.commands import encrypt_fields_with_new_key
+from registrations.management.commands.encrypt_fields_with_new_key import (
+    Command,
+    _is_encrypted_with_primary_key,
+)
 from registrations.models import SignUpGroupProtectedData, SignUpProtectedData
 from registrations.tests.factories import (
     SignUpFactory,
     SignUpGroupFactory,
     SignUpGroupProtectedDataFactory,
+    SignUpProtectedDataFactory,
 )
 
 _ENCRYPTION_KEY = "c87a6669a1ded2834f1dfd0830d86ef6cdd20372ac83e8c7c23feffe87e6a051"
 _ENCRYPTION_KEY2 = "f1a79d4b60a947b988beaf1eae871289fb03f2b9fd443d67107a7d05d05f831e"
 
 
+@pytest.fixture(autouse=True)
+def checkpoint_file(tmp_path, monkeypatch):
+    checkpoint_file = tmp_path / "checkpoint.json"
+    monkeypatch.setattr(
+        encrypt_fields_with_new_key, "CHECKPOINT_FILE", str(checkpoint_file)
+    )
+    return checkpoint_file
+
+
 @pytest.mark.django_db
 def test_encrypt_fields_with_new_key(settings):
     old_keys = (_ENCRYPTION_KEY,)
@@ -78,3 +95,74 @@ def test_encrypt_fields_with_new_key(settings):
 
     # Test that fields have been encrypted with the new key
     assert_encrypted_with_keys(new_keys)
+
+
+def _rotate_keys(settings, keys):
+    settings.FIELD_ENCRYPTION_KEYS = keys
+    for field in (
+        SignUpGroupProtectedData._meta.get_field("extra_info"),
+        SignUpProtectedData._meta.get_field("extra_info"),
+        SignUpProtectedData._meta.get_field("date_of_birth"),
+    ):
+        field.__dict__.pop("keys", None)
+
+
+def _get_raw_extra_infos():
+    return dict(
+        Command._get_raw_values_queryset(SignUpProtectedData).values_list(
+            "pk", "raw_extra_info"
+        )
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("workers", [1, 2])
+def test_encrypt_fields_with_new_key_in_chunks(settings, workers):
+    _rotate_keys(settings, [_ENCRYPTION_KEY])
+    protected_data = SignUpProtectedDataFactory.create_batch(
+        3, extra_info="Extra info", date_of_birth="2023-01-01"
+    )
+    deleted_protected_data = SignUpProtectedDataFactory(extra_info="Deleted")
+    deleted_protected_data.soft_delete()
+
+    _rotate_keys(settings, [_ENCRYPTION_KEY2, _ENCRYPTION_KEY])
+    call_command("encrypt_fields_with_new_key", chunk_size=2, workers=workers)
+
+    field = SignUpProtectedData._meta.get_field("extra_info")
+    for value in _get_raw_extra_infos().values():
+        assert _is_encrypted_with_primary_key(field, bytes(value))
+    for obj in protected_data:
+        obj = SignUpProtectedData.objects.get(pk=obj.pk)
+        assert obj.extra_info == "Extra info"
+        assert str(obj.date_of_birth) == "2023-01-01"
+    deleted_protected_data = SignUpProtectedData.all_objects.get(
+        pk=deleted_protected_data.pk
+    )
+    assert deleted_protected_data.extra_info == "Deleted"
+
+
+@pytest.mark.django_db
+def test_encrypt_fields_with_new_key_continues_from_checkpoint(
+    settings, checkpoint_file
+):
+    _rotate_keys(settings, [_ENCRYPTION_KEY])
+    first, second = SignUpProtectedDataFactory.create_batch(2, extra_info="Info")
+
+    _rotate_keys(settings, [_ENCRYPTION_KEY2, _ENCRYPTION_KEY])
+    checkpoint_key = Command._get_checkpoint_key(SignUpProtectedData)
+    checkpoint_file.write_text(json.dumps({checkpoint_key: first.pk}))
+
+    with pytest.raises(CommandError, match="1 rows aren't encrypted"):
+        call_command("encrypt_fields_with_new_key", workers=1)
+
+    raw_extra_infos = _get_raw_extra_infos()
+    field = SignUpProtectedData._meta.get_field("extra_info")
+    assert not _is_encrypted_with_primary_key(field, bytes(raw_extra_infos[first.pk]))
+    assert _is_encrypted_with_primary_key(field, bytes(raw_extra_infos[second.pk]))
+
+    call_command("encrypt_fields_with_new_key", workers=1, restart=True)
+
+    assert _is_encrypted_with_primary_key(
+        field, bytes(_get_raw_extra_infos()[first.pk])
+    )
+    assert json.loads(checkpoint_file.read_text()) == {}
@@ -752,3 +752,43 @@ def test_mark_payments_expired_web_store_api_exception(api_status_code):
     assert payment.signup.deleted is False
 
     assert len(mail.outbox) == 0
+
+
+@pytest.mark.django_db
+def test_mark_payments_expired_skips_payments_with_failed_api_requests():
+    fourteen_days_ago = localtime() - timedelta(days=14)
+    registration = RegistrationFactory(event__name=_EVENT_NAME)
+
+    failed_payment = SignUpPaymentFactory(
+        status=SignUpPayment.PaymentStatus.CREATED,
+        expires_at=fourteen_days_ago,
+        external_order_id="1234",
+        signup__registration=registration,
+    )
+    paid_payment = SignUpPaymentFactory(
+        status=SignUpPayment.PaymentStatus.CREATED,
+        expires_at=fourteen_days_ago,
+        external_order_id="4321",
+        signup__registration=registration,
+    )
+
+    api_payment_data = DEFAULT_GET_PAYMENT_DATA.copy()
+    api_payment_data["status"] = WebStorePaymentStatus.PAID.value
+    with requests_mock.Mocker() as req_mock:
+        req_mock.get(
+            f"{settings.WEB_STORE_API_BASE_URL}payment/admin/{failed_payment.external_order_id}",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+        req_mock.get(
+            f"{settings.WEB_STORE_API_BASE_URL}payment/admin/{paid_payment.external_order_id}",
+            json=api_payment_data,
+        )
+
+        call_command("mark_payments_expired", workers=2)
+
+        assert req_mock.call_count == 2
+
+    failed_payment.refresh_from_db()
+    assert failed_payment.status == SignUpPayment.PaymentStatus.CREATED
+    paid_payment.refresh_from_db()
+    assert paid_payment.status == SignUpPayment.PaymentStatus.PAID
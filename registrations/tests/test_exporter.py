@@ -1,6 +1,13 @@
+import csv
+import io
+import zipfile
+
 import pytest
 
-from registrations.exports import RegistrationSignUpsExportXLSX
+from registrations.exports import (
+    RegistrationSignUpsExportCSV,
+    RegistrationSignUpsExportXLSX,
+)
 from registrations.models import SignUp
 from registrations.tests.factories import SignUpContactPersonFactory, SignUpFactory
 
@@ -47,7 +54,7 @@ def signup_registration(registration):
 def test_signup_order(signup_registration):
     registration = signup_registration
     exporter = RegistrationSignUpsExportXLSX(registration)
-    table_data = exporter._get_signups_table_data()
+    table_data = list(exporter._iter_signups_table_rows())
 
     assert table_data[0][0] == "Doe John"
     assert table_data[1][0] == "Smith Jane"
@@ -58,6 +65,53 @@ def test_signup_order(signup_registration):
 def test_attendee_name_format(signup_registration):
     registration = signup_registration
     exporter = RegistrationSignUpsExportXLSX(registration)
-    table_data = exporter._get_signups_table_data()
+    table_data = list(exporter._iter_signups_table_rows())
 
     assert table_data[0][0] == "Doe John"
+
+
+@pytest.mark.django_db
+def test_xlsx_is_written_in_row_order(signup_registration):
+    exporter = RegistrationSignUpsExportXLSX(signup_registration)
+
+    with zipfile.ZipFile(exporter.get_xlsx()) as xlsx:
+        worksheet = xlsx.read("xl/worksheets/sheet1.xml").decode()
+
+    assert '<autoFilter ref="A7:F10"/>' in worksheet
+    assert (
+        worksheet.index("Doe John")
+        < worksheet.index("Smith Jane")
+        < worksheet.index("Listed Wait")
+    )
+
+
+@pytest.mark.django_db
+def test_csv_lines(signup_registration):
+    exporter = RegistrationSignUpsExportCSV(signup_registration)
+
+    lines = "".join(exporter.iter_csv()).splitlines()
+
+    assert lines[0].startswith("\ufeff")
+    assert len(lines) == 4
+    assert lines[1].split(",")[0] == "Doe John"
+    assert lines[3].split(",")[:3] == ["Listed Wait", "-", "3254454"]
+
+
+@pytest.mark.django_db
+def test_csv_formulas_are_escaped(registration):
+    SignUpFactory(
+        registration=registration,
+        first_name='=HYPERLINK("https://example.com","Click")',
+        last_name=None,
+        phone_number="+3580123456",
+    )
+    exporter = RegistrationSignUpsExportCSV(registration)
+
+    rows = list(csv.reader(io.StringIO("".join(exporter.iter_csv()))))
+
+    assert rows[1][:3] == [
+        '\'=HYPERLINK("https://example.com","Click")',
+        # The placeholder of the missing date of birth isn't escaped
+        "-",
+        "'+3580123456",
+    ]
@@ -6,7 +6,9 @@ from unittest.mock import PropertyMock, patch
 import freezegun
 import pytest
 from django.conf import settings
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import make_aware
 from resilient_logger.models import ResilientLogEntry
 from rest_framework import status
@@ -18,7 +20,12 @@ from events.tests.test_event_get import get_list_and_assert_events
 from events.tests.utils import assert_fields_exist
 from events.tests.utils import versioned_reverse as reverse
 from helevents.tests.factories import UserFactory
-from registrations.models import PriceGroup, RegistrationPriceGroup, SignUp
+from registrations.models import (
+    PriceGroup,
+    Registration,
+    RegistrationPriceGroup,
+    SignUp,
+)
 from registrations.tests.factories import (
     PriceGroupFactory,
     RegistrationFactory,
@@ -567,6 +574,55 @@ def test_current_attendee_and_waitlist_count(user_api_client):
     assert response.data["current_waiting_list_count"] == 1
 
 
+def create_registration_with_signups():
+    registration = RegistrationFactory(
+        maximum_attendee_capacity=5, waiting_list_capacity=5
+    )
+    SignUpFactory(registration=registration)
+    SignUpFactory(
+        registration=registration, attendee_status=SignUp.AttendeeStatus.WAITING_LIST
+    )
+    SignUpFactory(registration=registration, deleted=True)
+    SeatReservationCodeFactory(registration=registration, seats=2)
+    return registration
+
+
+@pytest.mark.django_db
+def test_capacity_annotations_match_registration_properties():
+    registration = create_registration_with_signups()
+    SeatReservationCodeFactory(registration=registration, seats=6)
+
+    annotated = Registration.objects.with_capacity_counts().get(pk=registration.pk)
+
+    assert annotated.current_attendee_count == registration.current_attendee_count == 1
+    assert (
+        annotated.current_waiting_list_count
+        == registration.current_waiting_list_count
+        == 1
+    )
+    assert annotated.reserved_seats_amount == registration.reserved_seats_amount == 8
+    assert annotated.calculate_remaining_attendee_capacity() == 0
+    assert annotated.calculate_remaining_waiting_list_capacity() == 0
+
+
+@pytest.mark.django_db
+def test_registration_list_query_count_does_not_grow_with_registrations(
+    user_api_client,
+):
+    create_registration_with_signups()
+    with CaptureQueriesContext(connection) as single_registration_queries:
+        response = get_list(user_api_client)
+    assert response.data["data"][0]["current_attendee_count"] == 1
+
+    for __ in range(3):
+        create_registration_with_signups()
+    with CaptureQueriesContext(connection) as many_registrations_queries:
+        response = get_list(user_api_client)
+
+    assert len(response.data["data"]) == 4
+    assert len(many_registrations_queries) == len(single_registration_queries)
+
+
 @pytest.mark.django_db
 def test_registration_list(
     user_api_client, registration, registration2, registration3, registration4
@@ -43,14 +43,18 @@ def _get_signups_export(
     return response
 
 
-def _assert_correct_content(response):
-    assert response.headers["Content-Type"] == (
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+_CONTENT_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+}
+
+
+def _assert_correct_content(response, file_format="xlsx"):
+    assert response.headers["Content-Type"] == _CONTENT_TYPES[file_format]
     assert response.headers["Content-Disposition"] == (
-        'attachment; filename="registered_persons.xlsx"'
+        f'attachment; filename="registered_persons.{file_format}"'
     )
-    assert len(response.content) > 0
+    assert len(b"".join(response.streaming_content)) > 0
 
 
 def _assert_get_signups_export(
@@ -64,7 +68,7 @@ def _assert_get_signups_export(
     )
 
     assert response.status_code == status.HTTP_200_OK
-    _assert_correct_content(response)
+    _assert_correct_content(response, file_format)
 
     return response
 
@@ -377,6 +381,7 @@ def test_signups_export_allowed_for_apikey_with_registration_permission(
     "file_format,allowed",
     [
         ("xlsx", True),
+        ("csv", True),
         ("docx", False),
         ("pdf", False),
         ("txt", False),
@@ -403,7 +408,7 @@ def test_signups_export_file_formats(registration, api_client, file_format, allo
 
     if allowed:
         assert response.status_code == status.HTTP_200_OK
-        _assert_correct_content(response)
+        _assert_correct_content(response, file_format)
     else:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
@@ -487,3 +492,22 @@ def test_signup_ids_are_audit_logged_on_signups_export(
             "pk", flat=True
         )
     )
+
+
+@pytest.mark.django_db
+def test_all_signup_ids_are_audit_logged_on_large_signups_export(
+    api_client, registration, settings
+):
+    settings.AUDIT_LOG_MAX_OBJECT_IDS = 2
+    SignUpFactory.create_batch(3, registration=registration)
+
+    user = create_user_by_role("registration_admin", registration.publisher)
+    api_client.force_authenticate(user)
+
+    _get_signups_export(api_client, registration.id, file_format="xlsx")
+
+    audit_log_entry = ResilientLogEntry.objects.first()
+    assert Counter(audit_log_entry.context["target"]["object_ids"]) == Counter(
+        registration.signups.values_list("pk", flat=True)
+    )
+    assert "lists" not in audit_log_entry.context["target"]
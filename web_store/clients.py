@@ -1,10 +1,53 @@
+import logging
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from http.cookiejar import DefaultCookiePolicy
 from typing import Any
+from urllib.parse import urlsplit
 
 import requests
 from django.conf import settings
+from requests import RequestException
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from web_store.exceptions import WebStoreImproperlyConfiguredError
 
+logger = logging.getLogger(__name__)
+
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (502, 503, 504)
+
+
+@cache
+def get_session() -> requests.Session:
+    """
+    Return the process-wide session for the web store API requests. The session
+    keeps the connections alive and retries the requests that failed to connect,
+    and the idempotent requests that failed because of temporary unavailability,
+    with an exponential backoff.
+    """
+    retry = Retry(
+        total=settings.WEB_STORE_API_MAX_RETRIES,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        # Return the last response so that the callers can inspect its status
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_maxsize=settings.WEB_STORE_API_POOL_SIZE, max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # The session is shared by the requests made on behalf of all users
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    return session
+
 
 class WebStoreAPIBaseClient:
     TIMEOUT = 30  # seconds
@@ -57,8 +100,40 @@ class WebStoreAPIBaseClient:
         headers: dict | None = None,
     ) -> dict[str, Any] | list[dict[str, Any]]:
         request_kwargs = self._get_request_kwargs(method, params, headers)
-        response = getattr(requests, method)(url, **request_kwargs)
+
+        start = time.perf_counter()
+        try:
+            response = get_session().request(method, url, **request_kwargs)
+        finally:
+            logger.debug(
+                "web_store: %s %s took %.0f ms",
+                method.upper(),
+                urlsplit(url).path,
+                (time.perf_counter() - start) * 1000,
+            )
 
         response.raise_for_status()
 
         return response.json()
+
+    @staticmethod
+    def _make_concurrent_requests(
+        func: Callable, args: Iterable, max_workers: int | None = None
+    ) -> list:
+        """
+        Call func with each of the args concurrently and return the results in
+        the same order, with the exceptions of the failed requests in place of
+        their results. By default, there are as many concurrent requests as
+        there are connections in the session's pool.
+        """
+
+        def make_request(arg):
+            try:
+                return func(arg)
+            except RequestException as exc:
+                return exc
+
+        with ThreadPoolExecutor(
+            max_workers or settings.WEB_STORE_API_POOL_SIZE
+        ) as executor:
+            return list(executor.map(make_request, args))
@@ -1,3 +1,5 @@
+from requests import RequestException
+
 from web_store.clients import WebStoreAPIBaseClient
 
 
@@ -25,6 +27,12 @@ class WebStoreOrderAPIClient(WebStoreAPIBaseClient):
             },
         )
 
+    def get_orders(
+        self, order_ids: list[str], max_workers: int | None = None
+    ) -> dict[str, dict | RequestException]:
+        results = self._make_concurrent_requests(self.get_order, order_ids, max_workers)
+        return dict(zip(order_ids, results))
+
     def cancel_order(self, order_id: str, user_uuid: str) -> dict:
         return self._make_request(
             f"{self.order_api_base_url}{order_id}/cancel",
@@ -32,6 +40,18 @@ class WebStoreOrderAPIClient(WebStoreAPIBaseClient):
             headers={"user": user_uuid},
         )
 
+    def cancel_orders(
+        self, user_uuids_by_order_id: dict[str, str], max_workers: int | None = None
+    ) -> dict[str, dict | RequestException]:
+        results = self._make_concurrent_requests(
+            lambda order_id: self.cancel_order(
+                order_id, user_uuids_by_order_id[order_id]
+            ),
+            user_uuids_by_order_id,
+            max_workers,
+        )
+        return dict(zip(user_uuids_by_order_id, results))
+
     def create_instant_refunds(self, data: list[dict]) -> dict:
         return self._make_request(
             f"{self.order_api_base_url}refund/instant",
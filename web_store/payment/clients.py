@@ -1,3 +1,5 @@
+from requests import RequestException
+
 from web_store.clients import WebStoreAPIBaseClient
 
 
@@ -18,9 +20,25 @@ class WebStorePaymentAPIClient(WebStoreAPIBaseClient):
             headers=self.headers,
         )
 
+    def get_payments(
+        self, order_ids: list[str], max_workers: int | None = None
+    ) -> dict[str, dict | RequestException]:
+        results = self._make_concurrent_requests(
+            self.get_payment, order_ids, max_workers
+        )
+        return dict(zip(order_ids, results))
+
     def get_refund_payments(self, refund_id: str) -> list[dict]:
         return self._make_request(
             f"{self.payment_api_base_url}admin/refunds/{refund_id}/payment",
             "get",
             headers=self.headers,
         )
+
+    def get_refunds_payments(
+        self, refund_ids: list[str], max_workers: int | None = None
+    ) -> dict[str, list[dict] | RequestException]:
+        results = self._make_concurrent_requests(
+            self.get_refund_payments, refund_ids, max_workers
+        )
+        return dict(zip(refund_ids, results))
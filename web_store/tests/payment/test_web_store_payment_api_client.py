@@ -165,3 +165,26 @@ def test_get_refund_payments_exception(status_code):
         client.get_refund_payments(refund_id=DEFAULT_REFUND_ID)
 
         assert req_mock.call_count == 1
+
+
+def test_get_payments():
+    client = WebStorePaymentAPIClient()
+    failed_order_id = "1234"
+
+    with requests_mock.Mocker() as req_mock:
+        req_mock.get(
+            f"{client.payment_api_base_url}admin/{DEFAULT_ORDER_ID}",
+            json=DEFAULT_GET_PAYMENT_DATA,
+        )
+        req_mock.get(
+            f"{client.payment_api_base_url}admin/{failed_order_id}",
+            status_code=status.HTTP_404_NOT_FOUND,
+        )
+
+        results = client.get_payments([DEFAULT_ORDER_ID, failed_order_id])
+
+        assert req_mock.call_count == 2
+
+    assert results[DEFAULT_ORDER_ID] == DEFAULT_GET_PAYMENT_DATA
+    assert isinstance(results[failed_order_id], RequestException)
+    assert results[failed_order_id].response.status_code == status.HTTP_404_NOT_FOUND
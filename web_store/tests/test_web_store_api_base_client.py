@@ -5,7 +5,7 @@ import requests_mock
 from requests.exceptions import RequestException
 from rest_framework import status
 
-from web_store.clients import WebStoreAPIBaseClient
+from web_store.clients import RETRY_STATUSES, WebStoreAPIBaseClient, get_session
 from web_store.exceptions import WebStoreImproperlyConfiguredError
 
 DEFAULT_API_URL = "https://test_api/v1/"
@@ -158,3 +158,19 @@ def test_make_failed_request(http_method, status_code):
         client._make_request(DEFAULT_API_URL, http_method)
 
         assert req_mock.call_count == 1
+
+
+def test_requests_use_pooled_session_with_retries(settings):
+    settings.WEB_STORE_API_POOL_SIZE = 5
+    settings.WEB_STORE_API_MAX_RETRIES = 2
+    get_session.cache_clear()
+
+    session = get_session()
+
+    assert get_session() is session
+    adapter = session.get_adapter(DEFAULT_API_URL)
+    assert adapter._pool_maxsize == 5
+    assert adapter.max_retries.total == 2
+    assert adapter.max_retries.status_forcelist == RETRY_STATUSES
+    assert "POST" not in adapter.max_retries.allowed_methods
+    get_session.cache_clear()